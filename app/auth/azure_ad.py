@@ -7,8 +7,12 @@ from fastapi.security import HTTPBearer
 from decouple import config
 from datetime import datetime, timezone
 import asyncio
+import time
 from functools import lru_cache
 
+from app.auth.identities import client_identity, verified_tokens
+from app.utils.metrics import auth_verification_duration
+
 logger = logging.getLogger(__name__)
 
 AZURE_CLIENT_ID = config('AZURE_CLIENT_ID')
@@ -132,11 +136,27 @@ class AzureADAuth:
 azure_auth = AzureADAuth()
 security = HTTPBearer()
 
-async def get_current_user(request: Request) -> Optional[Dict[str, Any]]:
-    """Extract and verify the current user from the request"""
+def connection_authorization(context: Dict[str, Any]) -> Optional[str]:
+    """Authorization value sent in a websocket `connection_init` payload
+
+    Browsers can't set headers on websocket handshakes, so GraphQL clients
+    pass the token as a connection parameter instead.
+    """
+    params = context.get("connection_params")
+    if not isinstance(params, dict):
+        return None
+    authorization = params.get("Authorization") or params.get("authorization")
+    return authorization if isinstance(authorization, str) else None
+
+async def get_current_user(request: Request, authorization: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Extract and verify the current user from the request
+
+    `authorization` is used when the request carries no Authorization header,
+    e.g. the token from a websocket connection_init payload.
+    """
     try:
         # Extract token from Authorization header
-        authorization = request.headers.get("Authorization")
+        authorization = request.headers.get("Authorization") or authorization
         if not authorization:
             logger.warning("No Authorization header found")
             raise HTTPException(
@@ -153,8 +173,16 @@ async def get_current_user(request: Request) -> Optional[Dict[str, Any]]:
         
         token = authorization.split(" ")[1]
         
-        payload = await azure_auth.verify_token(token)
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            payload = await azure_auth.verify_token(token)
+            outcome = "ok"
+        finally:
+            auth_verification_duration.observe(time.perf_counter() - started, outcome)
         logger.info(f"Token verified successfully for app: {payload.get('appid')}")
+        # Lets admission control attribute later requests with this token to the client
+        verified_tokens.remember(token, client_identity(payload), payload.get("exp"))
         
         user_info = {
             "id": payload.get("oid") or payload.get("sub"),  
@@ -181,6 +209,24 @@ async def get_current_user(request: Request) -> Optional[Dict[str, Any]]:
             detail="Authentication failed"
         )
 
+async def get_context_user(context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Authenticate the request behind a GraphQL context once
+
+    Concurrent callers (fields, batched operations) share one verification.
+    """
+    user = context.get("current_user")
+    if user:
+        return user
+    
+    task = context.get("_auth_task")
+    if task is None:
+        task = asyncio.ensure_future(get_current_user(context["request"], connection_authorization(context)))
+        context["_auth_task"] = task
+    
+    user = await task
+    context["current_user"] = user
+    return user
+
 async def get_current_user_dependency(request: Request) -> Dict[str, Any]:
     """FastAPI dependency for getting current user"""
     user = await get_current_user(request)
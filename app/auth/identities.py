@@ -0,0 +1,66 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from decouple import config
+
+# Verified token -> client identity entries kept for admission control
+VERIFIED_TOKEN_CACHE_SIZE = config('VERIFIED_TOKEN_CACHE_SIZE', default=10000, cast=int)
+# Upper bound on how long an entry is trusted when the token has no usable exp
+VERIFIED_TOKEN_MAX_AGE = 3600.0
+
+
+def client_identity(claims: Dict[str, Any]) -> Optional[str]:
+    """Rate limiting key of a token: its object id, or the calling app for app-only tokens"""
+    if claims.get("oid"):
+        return f"oid:{claims['oid']}"
+    if claims.get("appid"):
+        return f"appid:{claims['appid']}"
+    return None
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class VerifiedTokens:
+    """Identities of bearer tokens whose signature was already verified
+
+    Lets middleware that runs before authentication attribute a request to
+    a client without trusting unverified claims: only tokens seen by
+    `get_current_user` are recognized, until they expire.
+    """
+
+    def __init__(self, max_entries: int = VERIFIED_TOKEN_CACHE_SIZE, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def remember(self, token: str, identity: Optional[str], expires_at: Optional[float] = None):
+        if not identity:
+            return
+        now = self.clock()
+        expires_at = min(expires_at or now + VERIFIED_TOKEN_MAX_AGE, now + VERIFIED_TOKEN_MAX_AGE)
+        key = _token_key(token)
+        self._entries[key] = (identity, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, token: str) -> Optional[str]:
+        key = _token_key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        identity, expires_at = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        return identity
+
+
+# Global cache filled by get_current_user
+verified_tokens = VerifiedTokens()
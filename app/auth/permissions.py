@@ -1,7 +1,7 @@
 import strawberry
 from strawberry.permission import BasePermission
 from strawberry.types import Info
-from app.auth.azure_ad import get_current_user
+from app.auth.azure_ad import get_context_user
 from typing import Any
 import logging
 
@@ -11,9 +11,9 @@ class IsAuthenticated(BasePermission):
     message = "User is not authenticated"
     
     async def has_permission(self, source: Any, info: Info, **kwargs) -> bool:
-        request = info.context["request"]
         try:
-            user = await get_current_user(request)
+            # Verified once per request and shared by every field and batched operation
+            user = await get_context_user(info.context)
             if user:
                 # Log different info based on token type
                 if user.get("token_type") == "client_credentials":
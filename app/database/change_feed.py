@@ -0,0 +1,168 @@
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+from decouple import config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Change feed configuration
+CHANGE_FEED_POLL_INTERVAL = config('CHANGE_FEED_POLL_INTERVAL', default=1.0, cast=float)
+CHANGE_FEED_MAX_ITEM_COUNT = config('CHANGE_FEED_MAX_ITEM_COUNT', default=100, cast=int)
+SUBSCRIPTION_QUEUE_SIZE = config('SUBSCRIPTION_QUEUE_SIZE', default=100, cast=int)
+
+# Seconds to wait before restarting a failed change source
+READER_RESTART_DELAY = 5.0
+
+
+class SlowConsumerError(Exception):
+    """Raised in a subscription that fell too far behind the change feed"""
+
+
+class CosmosChangeFeedSource:
+    """Polls a container's change feed, starting from the current point in time"""
+
+    def __init__(
+        self,
+        container,
+        poll_interval: float = CHANGE_FEED_POLL_INTERVAL,
+        max_item_count: int = CHANGE_FEED_MAX_ITEM_COUNT
+    ):
+        self.container = container
+        self.poll_interval = poll_interval
+        self.max_item_count = max_item_count
+        self.continuation: Optional[str] = None
+
+    def _read_changes(self) -> List[Dict[str, Any]]:
+        """Read the changes since the last continuation (blocking, runs on a worker thread)"""
+        etags = []
+        items = list(self.container.query_items_change_feed(
+            is_start_from_beginning=False,
+            continuation=self.continuation,
+            max_item_count=self.max_item_count,
+            response_hook=lambda headers, _: etags.append(headers.get("etag"))
+        ))
+        if etags and etags[-1]:
+            self.continuation = etags[-1]
+        return items
+
+    async def changes(self) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            items = await asyncio.to_thread(self._read_changes)
+            for item in items:
+                yield item
+            if not items:
+                await asyncio.sleep(self.poll_interval)
+
+
+class LocalChangeSource:
+    """In-process change source, used in tests and local development"""
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def publish(self, item: Dict[str, Any]):
+        self._queue.put_nowait(item)
+
+    async def changes(self) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            yield await self._queue.get()
+
+
+class _Subscriber:
+    __slots__ = ("predicate", "queue")
+
+    def __init__(self, predicate: Optional[Callable[[Dict[str, Any]], bool]], queue_size: int):
+        self.predicate = predicate
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+
+# Queued in place of pending changes when a subscriber is dropped
+_DROPPED = object()
+
+
+class ChangeFeedHub:
+    """Fans one change source reader out to every subscriber in the process
+
+    The reader starts with the first subscriber. Each subscriber has a bounded
+    queue; a subscriber whose queue is full is dropped with SlowConsumerError
+    instead of holding up the others or buffering without limit.
+    """
+
+    def __init__(self, source=None, queue_size: int = SUBSCRIPTION_QUEUE_SIZE):
+        self.source = source
+        self.queue_size = queue_size
+        self.dropped_subscribers = 0
+        self._subscribers: Set[_Subscriber] = set()
+        self._reader: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def subscribe(
+        self,
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield changed items accepted by `predicate` until the caller stops"""
+        subscriber = _Subscriber(predicate, self.queue_size)
+        self._subscribers.add(subscriber)
+        self._ensure_reader()
+        try:
+            while True:
+                item = await subscriber.queue.get()
+                if item is _DROPPED:
+                    raise SlowConsumerError("Subscription fell behind the change feed and was closed")
+                yield item
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, item: Dict[str, Any]):
+        for subscriber in list(self._subscribers):
+            if subscriber.predicate is not None and not subscriber.predicate(item):
+                continue
+            try:
+                subscriber.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: _Subscriber):
+        self._subscribers.discard(subscriber)
+        self.dropped_subscribers += 1
+        logger.warning(f"Dropping slow subscriber with {subscriber.queue.qsize()} pending changes")
+
+        queue = subscriber.queue
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(_DROPPED)
+
+    def _ensure_reader(self):
+        if self._reader is not None and not self._reader.done():
+            return
+        if self.source is None:
+            raise RuntimeError("No change source configured for subscriptions")
+        self._reader = asyncio.ensure_future(self._read())
+
+    async def _read(self):
+        while True:
+            try:
+                async for item in self.source.changes():
+                    self.publish(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Change feed reader failed, restarting: {e}")
+            await asyncio.sleep(READER_RESTART_DELAY)
+
+    async def stop(self):
+        """Stop the reader, e.g. on shutdown"""
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+
+
+# Global hub for project changes, the source is configured at startup
+project_changes = ChangeFeedHub()
@@ -0,0 +1,237 @@
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from decouple import config
+import logging
+
+from azure.core.exceptions import ServiceRequestError, ServiceResponseError
+from azure.cosmos.exceptions import CosmosClientTimeoutError, CosmosHttpResponseError
+
+from app.utils.deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+# Circuit breaker configuration, one breaker per container
+CIRCUIT_BREAKER_ENABLED = config('CIRCUIT_BREAKER_ENABLED', default=True, cast=bool)
+# Open once at least CIRCUIT_MIN_CALLS calls in the window failed at this rate
+CIRCUIT_FAILURE_RATE = config('CIRCUIT_FAILURE_RATE', default=0.5, cast=float)
+CIRCUIT_MIN_CALLS = config('CIRCUIT_MIN_CALLS', default=10, cast=int)
+CIRCUIT_WINDOW = config('CIRCUIT_WINDOW', default=30.0, cast=float)
+# Seconds an open circuit fails fast before letting probe calls through
+CIRCUIT_OPEN_DURATION = config('CIRCUIT_OPEN_DURATION', default=15.0, cast=float)
+CIRCUIT_HALF_OPEN_PROBES = config('CIRCUIT_HALF_OPEN_PROBES', default=1, cast=int)
+
+# Last known good values served while Cosmos is unavailable
+STALE_CACHE_MAX_ENTRIES = config('STALE_CACHE_MAX_ENTRIES', default=10000, cast=int)
+STALE_PAGE_CACHE_MAX_ENTRIES = config('STALE_PAGE_CACHE_MAX_ENTRIES', default=500, cast=int)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Statuses that mean Cosmos is struggling rather than that the request was wrong
+UNAVAILABLE_STATUSES = {408, 429, 449}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Cosmos while a container's circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Cosmos DB {name} circuit is open, retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def is_outage(error: BaseException) -> bool:
+    """Whether an error counts against the circuit (timeouts, throttling, 5xx, connection failures)"""
+    if isinstance(error, CosmosHttpResponseError):
+        return error.status_code is None or error.status_code >= 500 or error.status_code in UNAVAILABLE_STATUSES
+    return isinstance(error, (
+        CircuitOpenError, CosmosClientTimeoutError, ServiceRequestError, ServiceResponseError, TimeoutError, ConnectionError
+    ))
+
+
+class CircuitBreaker:
+    """Fails calls fast once the recent failure rate crosses a threshold
+
+    After CIRCUIT_OPEN_DURATION the circuit goes half-open and lets a few probe
+    calls through: one success closes it, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = CIRCUIT_FAILURE_RATE,
+        min_calls: int = CIRCUIT_MIN_CALLS,
+        window: float = CIRCUIT_WINDOW,
+        open_duration: float = CIRCUIT_OPEN_DURATION,
+        half_open_probes: int = CIRCUIT_HALF_OPEN_PROBES,
+        enabled: bool = CIRCUIT_BREAKER_ENABLED,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_duration = open_duration
+        self.half_open_probes = half_open_probes
+        self.enabled = enabled
+        self.clock = clock
+        self.rejected = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()  # (time, failed)
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self.clock() >= self._opened_at + self.open_duration:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self):
+        """Claim permission for one call, raising CircuitOpenError when it must fail fast"""
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_probes):
+            self.rejected += 1
+            retry_after = max(self._opened_at + self.open_duration - self.clock(), 0.0)
+            raise CircuitOpenError(self.name, retry_after)
+        if state == HALF_OPEN:
+            self._probes += 1
+
+    def release(self, probe: bool = False):
+        """Give back a call's permission without recording an outcome"""
+        if probe:
+            self._probes -= 1
+
+    def record(self, failed: bool, probe: bool = False):
+        self.release(probe)
+        if self._state == HALF_OPEN:
+            if failed:
+                self._open()
+            else:
+                self._state = CLOSED
+                self._outcomes.clear()
+                logger.info(f"Cosmos DB {self.name} circuit closed")
+            return
+        if self._state == OPEN:
+            return
+
+        now = self.clock()
+        self._outcomes.append((now, failed))
+        while self._outcomes and self._outcomes[0][0] <= now - self.window:
+            self._outcomes.popleft()
+        failures = sum(1 for _, outcome in self._outcomes if outcome)
+        if len(self._outcomes) >= self.min_calls and failures >= self.failure_rate * len(self._outcomes):
+            self._open()
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        if not self.enabled:
+            return await func(*args, **kwargs)
+
+        self.allow()
+        probe = self._state == HALF_OPEN
+        try:
+            result = await func(*args, **kwargs)
+        except DeadlineExceeded as e:
+            # Cut off while Cosmos was still working counts as a timeout; out of
+            # time before the call started says nothing about Cosmos
+            if e.running:
+                self.record(True, probe)
+            else:
+                self.release(probe)
+            raise
+        except Exception as e:
+            self.record(is_outage(e), probe)
+            raise
+        except BaseException:
+            # Cancelled, the call says nothing about Cosmos
+            self.release(probe)
+            raise
+        self.record(False, probe)
+        return result
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = self.clock()
+        self._outcomes.clear()
+        logger.warning(f"Cosmos DB {self.name} circuit opened for {self.open_duration}s")
+
+
+class CircuitBreakers:
+    """Breakers by container id, created on first use"""
+
+    def __init__(self, **options):
+        self.options = options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name, **self.options)
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        return {name: breaker.state for name, breaker in self._breakers.items()}
+
+
+class StaleCache:
+    """LRU of the last value read for each key, kept to answer reads during outages"""
+
+    def __init__(self, max_entries: int = STALE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any) -> Optional[Any]:
+        return self._entries.get(key)
+
+    def remember(self, value: Any, *keys: Any):
+        """Store a value under each of the given keys (e.g. id and project_id)"""
+        for key in keys:
+            if key:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def forget(self, *keys: Any):
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+class StaleReads:
+    """Per-operation flag set when any read was answered from a stale cache"""
+
+    __slots__ = ("served",)
+
+    def __init__(self):
+        self.served = False
+
+
+stale_reads: ContextVar[Optional[StaleReads]] = ContextVar("stale_reads", default=None)
+
+
+def mark_stale():
+    marker = stale_reads.get()
+    if marker is not None:
+        marker.served = True
+
+
+def serve_stale(cache: StaleCache, keys: Iterable[Any], error: BaseException) -> Optional[List[Any]]:
+    """Cached values for keys when `error` is an outage, None when none of them is known"""
+    if not is_outage(error):
+        return None
+    values = [cache.get(key) for key in keys]
+    if all(value is None for value in values):
+        return None
+    mark_stale()
+    return values
+
+
+# Global breakers, keyed by container id
+container_breakers = CircuitBreakers()
@@ -1,17 +1,50 @@
 import os
 import uuid
+import asyncio
 import urllib3
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 from azure.cosmos import CosmosClient, PartitionKey
-from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from azure.cosmos.exceptions import CosmosClientTimeoutError, CosmosResourceExistsError, CosmosResourceNotFoundError
 from decouple import config
 import logging
 
-from app.models.project import Project as ProjectModel, ProjectCreate, ProjectUpdate
+from app.models.project import Project as ProjectModel, ProjectCreate, ProjectUpdate, ProjectRecord
 from app.models.user import User as UserModel
-from app.schema.types import ProjectConnection, ProjectEdge, PaginationInfo, ProjectFilter, ProjectStatus, ProjectPriority
-from app.utils.pagination import encode_cursor, decode_cursor
+from app.schema.types import (
+    ProjectConnection, ProjectEdge, PaginationInfo, ProjectFilter, ProjectStatus, ProjectPriority,
+    ProjectChange, ProjectChangeEdge, ProjectChangeConnection, ProjectDimension, ProjectFacet, FacetValue,
+    DimensionValue, BudgetPercentile, ProjectStatsGroup, ProjectOrder
+)
+from app.utils.pagination import (
+    encode_cursor, decode_cursor, encode_keyset_cursor, decode_keyset_cursor, encode_sort_cursor, decode_sort_cursor
+)
+from app.database.sync import build_changes_query, merge_changes, make_tombstone, requires_full_resync
+from app.models.project import parse_datetime
+from app.database.converters import convert_item_to_project, convert_item_to_project_record, convert_item_to_user
+from app.database.replica import project_replica
+from app.database.facets import build_facet_query, count_facets, top_counts
+from app.database.stats import DEFAULT_PERCENTILES, build_stats_query, compute_project_stats
+from app.database.snapshot import project_snapshot
+from app.database.ordering import (
+    Order, build_default_order_clause, build_order_clause, build_seek_clause, normalize_order, order_signature,
+    priority_rank, sort_key
+)
+from app.database.owners import make_owner_summary
+from app.database.lookups import ItemLocation, NegativeCache, PartitionKeyCache, dedupe_ids, plan_lookups
+from app.database.circuit_breaker import (
+    STALE_PAGE_CACHE_MAX_ENTRIES, StaleCache, container_breakers, serve_stale
+)
+from app.database.hedging import hedged_reads
+from app.database.throttling import (
+    READ, WRITE, cosmos_throttle, sdk_connection_policy
+)
+from app.database.indexing import (
+    PROJECTS_CONTAINER, TOMBSTONES_CONTAINER, USERS_CONTAINER, ContainerSpec, migrate_indexing_policies
+)
+from app.utils.single_flight import SingleFlight
+from app.utils.deadline import DeadlineExceeded, call_with_timeout, current_deadline, within_deadline
+from app.utils.metrics import data_function, measure_cosmos_call, record_request_charge
 
 urllib3.disable_warnings()
 
@@ -31,10 +64,19 @@ class CosmosDBClient:
         #     credential="C2y6yDjf5/R+ob0N8A7Cgv30VRDJIWEHLM+4QDU5DE2nQ9nDuVTqobD4b8mGGyPMbIZnqyMsEcaGQy67XIw/Jw==",
         #     connection_verify=False
         # )
-        self.client = CosmosClient(url=COSMOS_URL, credential=COSMOS_KEY, connection_verify=False)
+        # 429 retries are mostly left to cosmos_throttle, which backs off per budget under a deadline
+        self.client = CosmosClient(
+            url=COSMOS_URL,
+            credential=COSMOS_KEY,
+            connection_verify=False,
+            connection_policy=sdk_connection_policy(),
+            # Adds the request charge of every response to the SDK call being measured
+            raw_response_hook=record_request_charge
+        )
         self.database = None
         self.projects_container = None
         self.users_container = None
+        self.tombstones_container = None
     
     async def initialize(self):
         """Initialize database and containers"""
@@ -44,18 +86,22 @@ class CosmosDBClient:
                 id=COSMOS_DATABASE_NAME
             )
             
-            # Create containers if they don't exist
-            self.projects_container = self.database.create_container_if_not_exists(
-                id="projects",
-                partition_key=PartitionKey(path="/owner_id"),
-                offer_throughput=400
-            )
+            # Create containers if they don't exist, with their declared indexing policies
+            self.projects_container = self._create_container(PROJECTS_CONTAINER)
+            self.tombstones_container = self._create_container(TOMBSTONES_CONTAINER)
+            self.users_container = self._create_container(USERS_CONTAINER)
             
-            self.users_container = self.database.create_container_if_not_exists(
-                id="users",
-                partition_key=PartitionKey(path="/id"),
-                offer_throughput=400
-            )
+            # Existing containers keep their old policy until the migration is applied
+            try:
+                plan = migrate_indexing_policies(self.database)
+                for container_id, changes in plan.items():
+                    if changes:
+                        logger.warning(
+                            f"Indexing policy of container '{container_id}' differs from the declared one "
+                            f"({len(changes)} changes), run `python -m app.database.migrate --apply`"
+                        )
+            except Exception as e:
+                logger.warning(f"Could not compare indexing policies: {e}")
             
             logger.info("Cosmos DB initialized successfully")
             
@@ -63,12 +109,42 @@ class CosmosDBClient:
             logger.error(f"Failed to initialize Cosmos DB: {e}")
             raise
 
+    def _create_container(self, spec: ContainerSpec):
+        options = {}
+        if spec.default_ttl is not None:
+            options["default_ttl"] = spec.default_ttl
+        if spec.offer_throughput is not None:
+            options["offer_throughput"] = spec.offer_throughput
+        return self.database.create_container_if_not_exists(
+            id=spec.id,
+            partition_key=PartitionKey(path=spec.partition_key),
+            indexing_policy=spec.indexing_policy,
+            **options
+        )
+
 # Global database instance
 db_client = CosmosDBClient()
 
+# Concurrent point lookups for the same id share one Cosmos round trip
+project_lookups = SingleFlight()
+user_lookups = SingleFlight()
+
+# Partition keys of projects seen on reads and writes, so lookups by id can be point reads
+project_partitions = PartitionKeyCache()
+
+# Ids recently looked up and not found, so stale links don't repeat the queries
+missing_projects = NegativeCache()
+missing_users = NegativeCache()
+
+# Last known good reads, served with a stale flag while Cosmos is unavailable
+last_good_projects = StaleCache()
+last_good_users = StaleCache()
+last_good_pages = StaleCache(max_entries=STALE_PAGE_CACHE_MAX_ENTRIES)
+
 async def init_database():
     """Initialize database connection"""
     await db_client.initialize()
+    await backfill_priority_ranks()
     
     # Log available databases if in debug mode
     if config('DEBUG', default=False, cast=bool):
@@ -78,6 +154,56 @@ async def init_database():
         except Exception as e:
             logger.debug(f"Could not list databases: {e}")
 
+async def run_in_thread(func, *args, **kwargs):
+    """Run a blocking call without blocking the event loop, giving up at the request deadline"""
+    return await within_deadline(asyncio.to_thread, func, *args, **kwargs)
+
+async def run_cosmos(kind: str, func, *args, **kwargs):
+    """Run a blocking SDK call under the throttle, bounded by the request deadline and measured"""
+    try:
+        return await within_deadline(
+            cosmos_throttle.call, kind, call_with_timeout, measure_cosmos_call, func, *args, **kwargs
+        )
+    except CosmosClientTimeoutError as e:
+        # The SDK hit the timeout we gave it before wait_for fired
+        deadline = current_deadline.get()
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceeded(deadline.timeout, running=True) from e
+        raise
+
+async def run_read(container, func, *args, **kwargs):
+    """Run a Cosmos read under the container's circuit breaker and the read budget"""
+    breaker = container_breakers.get(container.id)
+    return await breaker.call(run_cosmos, READ, func, *args, **kwargs)
+
+async def run_write(func, *args, **kwargs):
+    """Run a Cosmos write under the write budget, so bulk writes can't starve reads"""
+    return await run_cosmos(WRITE, func, *args, **kwargs)
+
+async def query_items(container, query: str, **kwargs) -> List[Any]:
+    """Run a query on a worker thread and return all result items"""
+    return await run_read(container, lambda **options: list(container.query_items(query=query, **kwargs, **options)))
+
+async def read_item_or_none(container, item_id: str, partition_key: str) -> Optional[Dict[str, Any]]:
+    """Point read, None if the item doesn't exist"""
+    try:
+        return await run_read(container, container.read_item, item=item_id, partition_key=partition_key)
+    except CosmosResourceNotFoundError:
+        return None
+
+async def batch_read_items(
+    container,
+    point_reads: Dict[str, ItemLocation],
+    query: Optional[str] = None,
+    parameters: Optional[List[Dict[str, Any]]] = None
+) -> tuple[Dict[str, Optional[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Run point reads and an optional query together; returns (point read results by lookup id, query items)"""
+    lookups = [read_item_or_none(container, item_id, partition_key) for item_id, partition_key in point_reads.values()]
+    if query:
+        lookups.append(query_items(container, query=query, parameters=parameters, enable_cross_partition_query=True))
+    results = await asyncio.gather(*lookups)
+    return dict(zip(point_reads, results)), (results[-1] if query else [])
+
 def build_filter_query(filter: Optional[ProjectFilter]) -> tuple[str, List[Dict[str, Any]]]:
     """Build SQL query and parameters from filter"""
     where_clauses = []
@@ -118,76 +244,130 @@ def build_filter_query(filter: Optional[ProjectFilter]) -> tuple[str, List[Dict[
     where_clause = " AND ".join(where_clauses) if where_clauses else ""
     return where_clause, parameters
 
-def convert_item_to_project(item: Dict[str, Any]) -> ProjectModel:
-    """Convert Cosmos DB item to Project model"""
-    # Convert datetime strings to datetime objects if needed
-    if isinstance(item.get('created_at'), str):
-        item['created_at'] = datetime.fromisoformat(item['created_at'].replace('Z', '+00:00'))
-    if isinstance(item.get('updated_at'), str):
-        item['updated_at'] = datetime.fromisoformat(item['updated_at'].replace('Z', '+00:00'))
+# Project CRUD Operations
+async def query_project_page(filter: Optional[ProjectFilter], skip: int, limit: int) -> tuple[List[Dict[str, Any]], int]:
+    """Query one page of project items and the total match count from Cosmos DB"""
+    # Build filter query
+    where_clause, parameters = build_filter_query(filter)
+    
+    # Base query
+    base_query = "SELECT * FROM c"
+    if where_clause:
+        base_query += f" WHERE {where_clause}"
+    
+    # Add ordering, served by the (filters..., created_at) composite indexes
+    base_query += f" ORDER BY {build_default_order_clause(filter)}"
+    
+    # Get total count for pagination info
+    count_query = "SELECT VALUE COUNT(1) FROM c"
+    if where_clause:
+        count_query += f" WHERE {where_clause}"
+    
+    # Get items with pagination
+    query = f"{base_query} OFFSET {skip} LIMIT {limit}"
+    
+    # The count and the page don't depend on each other, run them together
+    count_items, items = await asyncio.gather(
+        query_items(
+            db_client.projects_container,
+            query=count_query,
+            parameters=parameters,
+            enable_cross_partition_query=True
+        ),
+        query_items(
+            db_client.projects_container,
+            query=query,
+            parameters=parameters,
+            enable_cross_partition_query=True
+        )
+    )
+    total_count = count_items[0] if count_items else 0
+    return items, total_count
+
+async def query_ordered_page(
+    filter: Optional[ProjectFilter],
+    order: Order,
+    after: Optional[List[Any]],
+    limit: int
+) -> tuple[List[Dict[str, Any]], int]:
+    """Seek one page of project items past a sort key, served by the composite indexes"""
+    where_clause, parameters = build_filter_query(filter)
+    seek_clause, seek_parameters = build_seek_clause(order, after)
     
-    # Convert string status and priority to enums if they exist
-    if 'status' in item and isinstance(item['status'], str):
-        item['status'] = item['status'].upper()
-    if 'priority' in item and isinstance(item['priority'], str):
-        item['priority'] = item['priority'].upper()
+    conditions = [f"({clause})" for clause in (where_clause, seek_clause) if clause]
+    query = "SELECT * FROM c"
+    if conditions:
+        query += f" WHERE {' AND '.join(conditions)}"
+    query += f" ORDER BY {build_order_clause(order)} OFFSET 0 LIMIT {limit}"
     
-    return ProjectModel(**item)
-
-def convert_item_to_user(item: Dict[str, Any]) -> UserModel:
-    """Convert Cosmos DB item to User model"""
-    # Convert datetime strings to datetime objects if needed
-    if isinstance(item.get('created_at'), str):
-        item['created_at'] = datetime.fromisoformat(item['created_at'].replace('Z', '+00:00'))
-    if isinstance(item.get('updated_at'), str):
-        item['updated_at'] = datetime.fromisoformat(item['updated_at'].replace('Z', '+00:00'))
+    count_query = "SELECT VALUE COUNT(1) FROM c"
+    if where_clause:
+        count_query += f" WHERE {where_clause}"
     
-    return UserModel(**item)
+    count_items, items = await asyncio.gather(
+        query_items(
+            db_client.projects_container,
+            query=count_query,
+            parameters=parameters,
+            enable_cross_partition_query=True
+        ),
+        query_items(
+            db_client.projects_container,
+            query=query,
+            parameters=parameters + seek_parameters,
+            enable_cross_partition_query=True
+        )
+    )
+    total_count = count_items[0] if count_items else 0
+    return items, total_count
 
-# Project CRUD Operations
+@data_function
+async def load_project_items() -> List[Dict[str, Any]]:
+    """Read every project item, used to warm the local replica"""
+    return await query_items(
+        db_client.projects_container,
+        query="SELECT * FROM c",
+        enable_cross_partition_query=True
+    )
+
+@data_function
 async def get_projects(
     first: int = 10, 
     after: Optional[str] = None,
-    filter: Optional[ProjectFilter] = None
+    filter: Optional[ProjectFilter] = None,
+    order_by: Optional[List[ProjectOrder]] = None
+) -> ProjectConnection:
+    """Get paginated projects with filtering, the last good page while Cosmos is unavailable"""
+    page_key = repr((first, after, filter, order_by))
+    try:
+        if order_by:
+            connection = await get_ordered_projects(first, after, filter, order_by)
+        else:
+            connection = await _get_projects_page(first, after, filter)
+    except Exception as e:
+        stale = serve_stale(last_good_pages, [page_key], e)
+        if stale is None:
+            raise
+        return stale[0]
+    last_good_pages.remember(connection, page_key)
+    return connection
+
+async def _get_projects_page(
+    first: int,
+    after: Optional[str],
+    filter: Optional[ProjectFilter]
 ) -> ProjectConnection:
-    """Get paginated projects with filtering"""
     try:
-        # Build filter query
-        where_clause, parameters = build_filter_query(filter)
-        
-        # Base query
-        base_query = "SELECT * FROM c"
-        if where_clause:
-            base_query += f" WHERE {where_clause}"
-        
-        # Add ordering
-        base_query += " ORDER BY c.created_at DESC"
-        
         # Handle pagination cursor
         skip = 0
         if after:
             skip = decode_cursor(after)
         
-        # Get total count for pagination info
-        count_query = "SELECT VALUE COUNT(1) FROM c"
-        if where_clause:
-            count_query += f" WHERE {where_clause}"
-        
-        count_items = list(db_client.projects_container.query_items(
-            query=count_query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        total_count = count_items[0] if count_items else 0
-        
-        # Get items with pagination
-        query = f"{base_query} OFFSET {skip} LIMIT {first + 1}"
-        
-        items = list(db_client.projects_container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
+        # Serve from the in-process replica when it is enabled and warm
+        if project_replica.ready:
+            items, total_count = project_replica.query(filter, skip, first + 1)
+        else:
+            items, total_count = await query_project_page(filter, skip, first + 1)
         
         # Check if there are more items
         has_next_page = len(items) > first
@@ -197,7 +377,7 @@ async def get_projects(
         # Convert to Project objects and create edges
         edges = []
         for i, item in enumerate(items):
-            project = convert_item_to_project(item)
+            project = convert_item_to_project_record(item)
             cursor = encode_cursor(skip + i)
             edges.append(ProjectEdge(node=project, cursor=cursor))
         
@@ -210,44 +390,349 @@ async def get_projects(
             total_count=total_count
         )
         
-        return ProjectConnection(edges=edges, page_info=page_info)
+        return ProjectConnection(edges=edges, page_info=page_info, filter=filter)
         
     except Exception as e:
         logger.error(f"Error getting projects: {e}")
         raise
 
-async def get_project_by_id(project_id: str) -> Optional[ProjectModel]:
+@data_function
+async def get_ordered_projects(
+    first: int,
+    after: Optional[str],
+    filter: Optional[ProjectFilter],
+    order_by: List[ProjectOrder]
+) -> ProjectConnection:
+    """Get projects in a client-chosen order, paged by sort-key cursors"""
+    try:
+        order = normalize_order(order_by)
+        signature = order_signature(order)
+        after_key = decode_sort_cursor(after, signature)
+        
+        if project_replica.ready:
+            items, total_count = project_replica.query_ordered(filter, order, after_key, first + 1)
+        else:
+            items, total_count = await query_ordered_page(filter, order, after_key, first + 1)
+        
+        has_next_page = len(items) > first
+        if has_next_page:
+            items = items[:-1]
+        
+        edges = [
+            ProjectEdge(node=convert_item_to_project_record(item), cursor=encode_sort_cursor(signature, sort_key(item, order)))
+            for item in items
+        ]
+        
+        page_info = PaginationInfo(
+            has_next_page=has_next_page,
+            has_previous_page=after_key is not None,
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+            total_count=total_count
+        )
+        
+        return ProjectConnection(edges=edges, page_info=page_info, filter=filter)
+        
+    except Exception as e:
+        logger.error(f"Error getting ordered projects: {e}")
+        raise
+
+@data_function
+async def get_project_facets(
+    filter: Optional[ProjectFilter],
+    dimensions: List[ProjectDimension],
+    top: int = 10
+) -> List[ProjectFacet]:
+    """Get grouped project counts for each requested dimension"""
+    try:
+        fields = list(dict.fromkeys(dimension.value for dimension in dimensions))
+        
+        if project_replica.ready:
+            counts = project_replica.facet_counts(filter, fields)
+        elif fields:
+            # One projection of the filtered projects, counted here for every dimension
+            where_clause, parameters = build_filter_query(filter)
+            items = await query_items(
+                db_client.projects_container,
+                query=build_facet_query(fields, where_clause),
+                parameters=parameters,
+                enable_cross_partition_query=True
+            )
+            counts = count_facets(items, fields)
+        else:
+            counts = {}
+        
+        return [
+            ProjectFacet(
+                dimension=dimension,
+                values=[FacetValue(value=value, count=count) for value, count in top_counts(counts[dimension.value], top)]
+            )
+            for dimension in dimensions
+        ]
+        
+    except Exception as e:
+        logger.error(f"Error getting project facets: {e}")
+        raise
+
+@data_function
+async def get_project_stats(
+    filter: Optional[ProjectFilter],
+    group_by: List[ProjectDimension],
+    percentiles: List[float] = DEFAULT_PERCENTILES
+) -> List[ProjectStatsGroup]:
+    """Get project counts and budget statistics per group"""
+    try:
+        fields = [dimension.value for dimension in group_by]
+        
+        if project_replica.ready:
+            items = project_replica.matching(filter)
+            stats = await run_in_thread(compute_project_stats, items, fields, percentiles)
+        elif project_snapshot.ready:
+            # Analytics offload: the columnar snapshot lags writes by up to its refresh interval
+            stats = await run_in_thread(project_snapshot.stats, filter, fields, percentiles)
+        else:
+            # Percentiles can't be pushed down, fetch only the columns they need
+            where_clause, parameters = build_filter_query(filter)
+            items = await query_items(
+                db_client.projects_container,
+                query=build_stats_query(fields, where_clause),
+                parameters=parameters,
+                enable_cross_partition_query=True
+            )
+            stats = await run_in_thread(compute_project_stats, items, fields, percentiles)
+        return [
+            ProjectStatsGroup(
+                key=[DimensionValue(dimension=dimension, value=value) for dimension, value in zip(group_by, group.key)],
+                count=group.count,
+                budget_count=group.budget_count,
+                sum=group.sum,
+                mean=group.mean,
+                min=group.min,
+                max=group.max,
+                percentiles=[BudgetPercentile(percentile=p, value=value) for p, value in group.percentiles]
+            )
+            for group in stats
+        ]
+        
+    except Exception as e:
+        logger.error(f"Error getting project stats: {e}")
+        raise
+
+@data_function
+async def get_project_changes(
+    since: datetime,
+    first: int = 100,
+    after: Optional[str] = None
+) -> ProjectChangeConnection:
+    """Get projects created, updated or deleted after `since`, oldest change first"""
+    try:
+        query, parameters = build_changes_query(since, decode_keyset_cursor(after), first + 1)
+        
+        upserts, tombstones = await asyncio.gather(
+            query_items(
+                db_client.projects_container,
+                query=query,
+                parameters=parameters,
+                enable_cross_partition_query=True
+            ),
+            query_items(
+                db_client.tombstones_container,
+                query=query,
+                parameters=parameters,
+                enable_cross_partition_query=True
+            )
+        )
+        
+        changes, has_next_page = merge_changes(upserts, tombstones, first)
+        
+        edges = []
+        for item, deleted in changes:
+            change = ProjectChange(
+                id=item["id"],
+                project_id=item.get("project_id", ""),
+                deleted=deleted,
+                updated_at=parse_datetime(item["updated_at"]),
+                project=None if deleted else convert_item_to_project_record(item)
+            )
+            edges.append(ProjectChangeEdge(node=change, cursor=encode_keyset_cursor(item["updated_at"], item["id"])))
+        
+        return ProjectChangeConnection(
+            edges=edges,
+            has_next_page=has_next_page,
+            end_cursor=edges[-1].cursor if edges else after,
+            full_resync_required=requires_full_resync(since)
+        )
+        
+    except Exception as e:
+        logger.error(f"Error getting project changes: {e}")
+        raise
+
+@data_function
+async def read_project_changes_page(
+    after: Optional[tuple[str, str]],
+    limit: int,
+    deleted: bool = False
+) -> List[Dict[str, Any]]:
+    """Read one page of raw project (or tombstone) items ordered by (updated_at, id)"""
+    container = db_client.tombstones_container if deleted else db_client.projects_container
+    query, parameters = build_changes_query(datetime.min.replace(tzinfo=timezone.utc), after, limit)
+    return await query_items(
+        container,
+        query=query,
+        parameters=parameters,
+        enable_cross_partition_query=True
+    )
+
+@data_function
+async def backfill_priority_ranks():
+    """Store priority_rank on projects written before it existed, so priority sorts include them"""
+    try:
+        items = await query_items(
+            db_client.projects_container,
+            query="SELECT * FROM c WHERE NOT IS_DEFINED(c.priority_rank)",
+            enable_cross_partition_query=True
+        )
+        for item in items:
+            item["priority_rank"] = priority_rank(item.get("priority"))
+            await run_write(db_client.projects_container.replace_item, item=item["id"], body=item)
+        if items:
+            logger.info(f"Backfilled priority_rank on {len(items)} projects")
+    except Exception as e:
+        logger.warning(f"Could not backfill priority ranks: {e}")
+
+@data_function
+async def read_owned_projects(owner_id: str) -> List[Dict[str, Any]]:
+    """Read the id and embedded owner summary of every project of one owner (single partition)"""
+    return await query_items(
+        db_client.projects_container,
+        query="SELECT c.id, c.owner_summary FROM c WHERE c.owner_id = @owner_id",
+        parameters=[{"name": "@owner_id", "value": owner_id}],
+        partition_key=owner_id
+    )
+
+@data_function
+async def write_owner_summary(item_id: str, owner_id: str, summary: Dict[str, Any]):
+    """Patch the embedded owner summary; updated_at is left alone as the project itself didn't change"""
+    await run_write(
+        db_client.projects_container.patch_item,
+        item=item_id,
+        partition_key=owner_id,
+        patch_operations=[{"op": "set", "path": "/owner_summary", "value": summary}]
+    )
+
+@data_function
+async def get_project_by_id(project_id: str) -> Optional[ProjectRecord]:
     """Get project by ID (supports both Cosmos ID and custom project_id)"""
+    if project_id in missing_projects:
+        return None
     try:
-        # First try to find by Cosmos DB id
+        return await project_lookups.do(project_id, lambda: _fetch_project_by_id(project_id))
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting project {project_id}: {e}")
+        stale = serve_stale(last_good_projects, [project_id], e)
+        return stale[0] if stale else None
+
+async def _fetch_project_by_id(project_id: str) -> Optional[ProjectRecord]:
+    version = missing_projects.version
+    items = []
+    
+    # Point read when an earlier lookup told us where the project lives
+    location = project_partitions.get(project_id)
+    if location is not None:
+        item = await hedged_reads.run("project_point_read", read_item_or_none, db_client.projects_container, *location)
+        if item is not None:
+            items = [item]
+        else:
+            project_partitions.forget(project_id)
+    
+    # Otherwise try to find by Cosmos DB id
+    if not items:
         query = "SELECT * FROM c WHERE c.id = @id"
         parameters = [{"name": "@id", "value": project_id}]
         
-        items = list(db_client.projects_container.query_items(
+        items = await hedged_reads.run(
+            "project_query",
+            query_items,
+            db_client.projects_container,
             query=query,
             parameters=parameters,
             enable_cross_partition_query=True
-        ))
+        )
+    
+    # If not found, try to find by custom project_id
+    if not items:
+        query = "SELECT * FROM c WHERE c.project_id = @project_id"
+        parameters = [{"name": "@project_id", "value": project_id}]
         
-        # If not found, try to find by custom project_id
-        if not items:
-            query = "SELECT * FROM c WHERE c.project_id = @project_id"
-            parameters = [{"name": "@project_id", "value": project_id}]
-            
-            items = list(db_client.projects_container.query_items(
-                query=query,
-                parameters=parameters,
-                enable_cross_partition_query=True
-            ))
+        items = await hedged_reads.run(
+            "project_query",
+            query_items,
+            db_client.projects_container,
+            query=query,
+            parameters=parameters,
+            enable_cross_partition_query=True
+        )
+    
+    if items:
+        project_partitions.remember(items[0], "owner_id", ("project_id",))
+        project = convert_item_to_project_record(items[0])
+        last_good_projects.remember(project, project.id, project.project_id)
+        return project
+    missing_projects.add(project_id, version=version)
+    return None
+
+@data_function
+async def get_projects_by_ids(ids: List[str]) -> List[Optional[ProjectRecord]]:
+    """Get projects by Cosmos ID or project_id, results follow the order of ids
+
+    Ids whose partition key is known are point reads, the rest share one query.
+    """
+    try:
+        version = missing_projects.version
+        unique_ids = [project_id for project_id in dedupe_ids(ids) if project_id not in missing_projects]
+        point_reads, remaining = plan_lookups(unique_ids, project_partitions.get)
         
-        if items:
-            return convert_item_to_project(items[0])
-        return None
+        query = None
+        if remaining:
+            query = "SELECT * FROM c WHERE ARRAY_CONTAINS(@ids, c.id) OR ARRAY_CONTAINS(@ids, c.project_id)"
+        found, queried = await batch_read_items(
+            db_client.projects_container,
+            point_reads,
+            query,
+            [{"name": "@ids", "value": remaining}]
+        )
+        
+        for lookup_id, item in found.items():
+            if item is None:
+                project_partitions.forget(lookup_id)
+        for item in queried:
+            project_partitions.remember(item, "owner_id", ("project_id",))
+        
+        # Like get_project_by_id, a Cosmos ID match wins over a project_id match
+        by_project_id = {item.get("project_id"): item for item in queried}
+        by_id = {item["id"]: item for item in queried}
+        for lookup_id in remaining:
+            found[lookup_id] = by_id.get(lookup_id) or by_project_id.get(lookup_id)
+        
+        missing_projects.add(*(lookup_id for lookup_id, item in found.items() if item is None), version=version)
+        projects = {
+            lookup_id: convert_item_to_project_record(item)
+            for lookup_id, item in found.items() if item
+        }
+        for project in projects.values():
+            last_good_projects.remember(project, project.id, project.project_id)
+        return [projects.get(project_id) for project_id in ids]
         
     except Exception as e:
-        logger.error(f"Error getting project {project_id}: {e}")
-        return None
+        logger.error(f"Error getting projects {ids}: {e}")
+        stale = serve_stale(last_good_projects, ids, e)
+        if stale is None:
+            raise
+        return stale
 
+@data_function
 async def create_project(project_data: ProjectCreate) -> ProjectModel:
     """Create a new project"""
     try:
@@ -256,24 +741,32 @@ async def create_project(project_data: ProjectCreate) -> ProjectModel:
             query = "SELECT * FROM c WHERE c.project_id = @project_id"
             parameters = [{"name": "@project_id", "value": project_data.project_id}]
             
-            items = list(db_client.projects_container.query_items(
+            items = await query_items(
+                db_client.projects_container,
                 query=query,
                 parameters=parameters,
                 enable_cross_partition_query=True
-            ))
+            )
             
             if items:
                 raise ValueError(f"Project with project_id '{project_data.project_id}' already exists")
         
         project_dict = project_data.model_dump()
+        owner = await get_user_by_id(project_data.owner_id)
+        if owner:
+            project_dict["owner_summary"] = make_owner_summary(owner)
         project_dict.update({
             "id": str(uuid.uuid4()),  # Cosmos DB ID
             "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "priority_rank": priority_rank(project_data.priority)  # sortable priority for orderBy
         })
         
         # Create in Cosmos DB
-        created_item = db_client.projects_container.create_item(body=project_dict)
+        created_item = await run_write(db_client.projects_container.create_item, body=project_dict)
+        project_replica.upsert(created_item)
+        project_partitions.remember(created_item, "owner_id", ("project_id",))
+        missing_projects.discard(created_item["id"], created_item.get("project_id"))
         
         return convert_item_to_project(created_item)
         
@@ -284,6 +777,7 @@ async def create_project(project_data: ProjectCreate) -> ProjectModel:
         logger.error(f"Error creating project: {e}")
         raise
 
+@data_function
 async def update_project(project_id: str, project_data: ProjectUpdate) -> Optional[ProjectModel]:
     """Update an existing project"""
     try:
@@ -292,11 +786,13 @@ async def update_project(project_id: str, project_data: ProjectUpdate) -> Option
         if not existing_project:
             return None
         
-        # Get current item from database using the Cosmos DB document ID
-        current_item = db_client.projects_container.read_item(
-            item=existing_project.id, 
-            partition_key=existing_project.owner_id
+        # Get current item from database using the Cosmos DB document ID, and refresh the owner copy
+        current_item, owner = await asyncio.gather(
+            read_item_or_none(db_client.projects_container, existing_project.id, existing_project.owner_id),
+            get_user_by_id(existing_project.owner_id)
         )
+        if current_item is None:
+            return None
         
         # Update only provided fields
         update_data = project_data.model_dump(exclude_unset=True)
@@ -304,12 +800,18 @@ async def update_project(project_id: str, project_data: ProjectUpdate) -> Option
         
         # Merge updates
         current_item.update(update_data)
+        current_item["priority_rank"] = priority_rank(current_item.get("priority"))
+        if owner:
+            current_item["owner_summary"] = make_owner_summary(owner)
         
         # Update in Cosmos DB
-        updated_item = db_client.projects_container.replace_item(
+        updated_item = await run_write(
+            db_client.projects_container.replace_item,
             item=existing_project.id,
             body=current_item
         )
+        project_replica.upsert(updated_item)
+        last_good_projects.forget(existing_project.id, existing_project.project_id)
         
         return convert_item_to_project(updated_item)
         
@@ -319,6 +821,7 @@ async def update_project(project_id: str, project_data: ProjectUpdate) -> Option
         logger.error(f"Error updating project {project_id}: {e}")
         raise
 
+@data_function
 async def delete_project(project_id: str) -> bool:
     """Delete a project by project_id"""
     try:
@@ -328,61 +831,125 @@ async def delete_project(project_id: str) -> bool:
             return False
         
         # Delete using the Cosmos DB document ID and partition key
-        db_client.projects_container.delete_item(
+        await run_write(
+            db_client.projects_container.delete_item,
             item=existing.id,
             partition_key=existing.owner_id
         )
+        project_replica.remove(existing.id)
+        project_partitions.forget(existing.id, existing.project_id)
+        last_good_projects.forget(existing.id, existing.project_id)
+        missing_projects.add(existing.id, existing.project_id)
         logger.info(f"Successfully deleted project {project_id} (id: {existing.id})")
+        
+        # Let delta-sync clients learn about the deletion
+        try:
+            await run_write(
+                db_client.tombstones_container.upsert_item,
+                body=make_tombstone(existing.project_id, existing.id, existing.owner_id)
+            )
+        except Exception as e:
+            logger.error(f"Failed to record tombstone for project {project_id}: {e}")
+        
         return True
         
     except CosmosResourceNotFoundError:
         logger.warning(f"Project {project_id} not found in Cosmos DB")
         return False
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         logger.error(f"Error deleting project {project_id}: {e}")
         return False
 
 # User operations
+@data_function
 async def get_users() -> List[UserModel]:
     """Get all users"""
     try:
         query = "SELECT * FROM c ORDER BY c.created_at DESC"
         
-        items = list(db_client.users_container.query_items(
+        items = await query_items(
+            db_client.users_container,
             query=query,
             enable_cross_partition_query=True
-        ))
+        )
         
         users = []
         for item in items:
             users.append(convert_item_to_user(item))
         
+        last_good_pages.remember(users, "users")
         return users
         
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         logger.error(f"Error getting users: {e}")
-        return []
+        stale = serve_stale(last_good_pages, ["users"], e)
+        return stale[0] if stale else []
 
+@data_function
 async def get_user_by_id(user_id: str) -> Optional[UserModel]:
     """Get user by ID"""
+    if user_id in missing_users:
+        return None
     try:
-        query = "SELECT * FROM c WHERE c.id = @id"
-        parameters = [{"name": "@id", "value": user_id}]
+        return await user_lookups.do(user_id, lambda: _fetch_user_by_id(user_id))
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting user {user_id}: {e}")
+        stale = serve_stale(last_good_users, [user_id], e)
+        return stale[0] if stale else None
+
+async def _fetch_user_by_id(user_id: str) -> Optional[UserModel]:
+    version = missing_users.version
+    # Users are partitioned by id, so this is a point read
+    item = await hedged_reads.run("user_point_read", read_item_or_none, db_client.users_container, user_id, user_id)
+    
+    if item:
+        user = convert_item_to_user(item)
+        last_good_users.remember(user, user.id)
+        return user
+    missing_users.add(user_id, version=version)
+    return None
+
+@data_function
+async def get_users_by_ids(user_ids: List[str]) -> List[Optional[UserModel]]:
+    """Get users by ID, results follow the order of user_ids
+
+    Users are partitioned by id, so small batches are parallel point reads
+    and larger ones a single query.
+    """
+    try:
+        version = missing_users.version
+        unique_ids = [user_id for user_id in dedupe_ids(user_ids) if user_id not in missing_users]
+        point_reads, remaining = plan_lookups(unique_ids, lambda user_id: (user_id, user_id))
         
-        items = list(db_client.users_container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
+        query = "SELECT * FROM c WHERE ARRAY_CONTAINS(@ids, c.id)" if remaining else None
+        found, queried = await batch_read_items(
+            db_client.users_container,
+            point_reads,
+            query,
+            [{"name": "@ids", "value": remaining}]
+        )
+        found.update((user_id, None) for user_id in remaining)
+        found.update((item["id"], item) for item in queried)
+        missing_users.add(*(user_id for user_id, item in found.items() if item is None), version=version)
         
-        if items:
-            return convert_item_to_user(items[0])
-        return None
+        users = {user_id: convert_item_to_user(item) for user_id, item in found.items() if item}
+        for user in users.values():
+            last_good_users.remember(user, user.id)
+        return [users.get(user_id) for user_id in user_ids]
         
+    except DeadlineExceeded:
+        raise
     except Exception as e:
-        logger.error(f"Error getting user {user_id}: {e}")
-        return None
+        logger.error(f"Error getting users {user_ids}: {e}")
+        return serve_stale(last_good_users, user_ids, e) or [None for _ in user_ids]
 
+@data_function
 async def create_user_if_not_exists(user_data: dict) -> UserModel:
     """Create user if doesn't exist"""
     try:
@@ -402,7 +969,16 @@ async def create_user_if_not_exists(user_data: dict) -> UserModel:
             "updated_at": datetime.now(timezone.utc).isoformat()
         }
         
-        created_item = db_client.users_container.create_item(body=user_dict)
+        try:
+            created_item = await run_write(db_client.users_container.create_item, body=user_dict)
+        except CosmosResourceExistsError:
+            # Created elsewhere while this instance still had the id cached as missing
+            missing_users.discard(user_data["id"])
+            existing = await get_user_by_id(user_data["id"])
+            if existing:
+                return existing
+            raise
+        missing_users.discard(created_item["id"])
         
         return convert_item_to_user(created_item)
         
@@ -411,14 +987,16 @@ async def create_user_if_not_exists(user_data: dict) -> UserModel:
         raise
 
 # Utility functions for testing
+@data_function
 async def seed_test_data():
     """Seed test data"""
     try:
         # Check if we need test data
-        projects_count_items = list(db_client.projects_container.query_items(
+        projects_count_items = await query_items(
+            db_client.projects_container,
             query="SELECT VALUE COUNT(1) FROM c",
             enable_cross_partition_query=True
-        ))
+        )
         projects_count = projects_count_items[0] if projects_count_items else 0
         
         if projects_count < 5:
@@ -483,6 +1061,7 @@ async def seed_test_data():
         logger.warning(f"Could not seed test data: {e}")
 
 # Health check function
+@data_function
 async def check_database_health() -> dict:
     """Check database connectivity and health"""
     try:
@@ -500,16 +1079,18 @@ async def check_database_health() -> dict:
         users_count = 0
         
         if containers_exist:
-            projects_count_items = list(db_client.projects_container.query_items(
+            projects_count_items = await query_items(
+                db_client.projects_container,
                 query="SELECT VALUE COUNT(1) FROM c",
                 enable_cross_partition_query=True
-            ))
+            )
             projects_count = projects_count_items[0] if projects_count_items else 0
             
-            users_count_items = list(db_client.users_container.query_items(
+            users_count_items = await query_items(
+                db_client.users_container,
                 query="SELECT VALUE COUNT(1) FROM c",
                 enable_cross_partition_query=True
-            ))
+            )
             users_count = users_count_items[0] if users_count_items else 0
         
         return {
@@ -518,6 +1099,7 @@ async def check_database_health() -> dict:
             "containers_ready": containers_exist,
             "projects_count": projects_count,
             "users_count": users_count,
+            "circuits": container_breakers.states(),
         }
         
     except Exception as e:
@@ -526,4 +1108,5 @@ async def check_database_health() -> dict:
             "status": "unhealthy",
             "database_connected": False,
             "error": str(e),
+            "circuits": container_breakers.states(),
         }
\ No newline at end of file
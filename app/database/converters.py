@@ -0,0 +1,35 @@
+from typing import Dict, Any
+from datetime import datetime
+
+from app.models.project import Project as ProjectModel, ProjectRecord
+from app.models.user import User as UserModel
+
+def convert_item_to_project(item: Dict[str, Any]) -> ProjectModel:
+    """Convert Cosmos DB item to Project model"""
+    # Convert datetime strings to datetime objects if needed
+    if isinstance(item.get('created_at'), str):
+        item['created_at'] = datetime.fromisoformat(item['created_at'].replace('Z', '+00:00'))
+    if isinstance(item.get('updated_at'), str):
+        item['updated_at'] = datetime.fromisoformat(item['updated_at'].replace('Z', '+00:00'))
+    
+    # Convert string status and priority to enums if they exist
+    if 'status' in item and isinstance(item['status'], str):
+        item['status'] = item['status'].upper()
+    if 'priority' in item and isinstance(item['priority'], str):
+        item['priority'] = item['priority'].upper()
+    
+    return ProjectModel(**item)
+
+def convert_item_to_user(item: Dict[str, Any]) -> UserModel:
+    """Convert Cosmos DB item to User model"""
+    # Convert datetime strings to datetime objects if needed
+    if isinstance(item.get('created_at'), str):
+        item['created_at'] = datetime.fromisoformat(item['created_at'].replace('Z', '+00:00'))
+    if isinstance(item.get('updated_at'), str):
+        item['updated_at'] = datetime.fromisoformat(item['updated_at'].replace('Z', '+00:00'))
+    
+    return UserModel(**item)
+
+def convert_item_to_project_record(item: Dict[str, Any]) -> ProjectRecord:
+    """Convert a trusted Cosmos DB item to a read-only project without validation"""
+    return ProjectRecord(item)
@@ -0,0 +1,35 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Tags is multi-valued, its facet counts each project once per distinct tag
+MULTI_VALUED_FIELDS = ("tags",)
+
+
+def build_facet_query(fields: List[str], where_clause: str) -> str:
+    """Projection of the faceted fields of every filtered project
+
+    The SDK's cross-partition query pipeline doesn't support GROUP BY, so the
+    projects are counted by `count_facets` instead of in the query.
+    """
+    query = f"SELECT {', '.join(f'c.{field}' for field in fields)} FROM c"
+    if where_clause:
+        query += f" WHERE {where_clause}"
+    return query
+
+
+def count_facets(items: Iterable[Dict[str, Any]], fields: List[str]) -> Dict[str, Dict[Any, int]]:
+    """Count projects per value of each field, as the replica's indexes do"""
+    counts: Dict[str, Dict[Any, int]] = {field: {} for field in fields}
+    for item in items:
+        for field in fields:
+            field_counts = counts[field]
+            values = set(item.get(field) or ()) if field in MULTI_VALUED_FIELDS else (item.get(field),)
+            for value in values:
+                field_counts[value] = field_counts.get(value, 0) + 1
+    return counts
+
+
+def top_counts(counts: Dict[Optional[str], int], top: int) -> List[Tuple[str, int]]:
+    """Largest counts first, ties by value; missing values are dropped"""
+    buckets = [(value, count) for value, count in counts.items() if value is not None and count > 0]
+    buckets.sort(key=lambda bucket: (-bucket[1], bucket[0]))
+    return buckets[:top]
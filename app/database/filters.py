@@ -0,0 +1,42 @@
+from typing import Any, Dict, Optional
+
+
+def project_matches_filter(item: Dict[str, Any], filter: Optional[Any]) -> bool:
+    """Check a raw project item against a ProjectFilter in memory
+
+    Mirrors the SQL built by `build_filter_query`, so pushed changes match what
+    a `projects` query with the same filter would return.
+    """
+    if not filter:
+        return True
+
+    if filter.status and item.get("status") != filter.status.value:
+        return False
+
+    if filter.priority and item.get("priority") != filter.priority.value:
+        return False
+
+    if filter.owner_id and item.get("owner_id") != filter.owner_id:
+        return False
+
+    if filter.tags:
+        # Any of the requested tags
+        tags = item.get("tags") or []
+        if not any(tag in tags for tag in filter.tags):
+            return False
+
+    if filter.search and not matches_search(item, filter.search):
+        return False
+
+    return True
+
+
+def matches_search(item: Dict[str, Any], search: str) -> bool:
+    """Case-insensitive substring match on name or description, like CONTAINS(LOWER(...))"""
+    search = search.lower()
+    name = item.get("name")
+    description = item.get("description")
+    return (
+        (isinstance(name, str) and search in name.lower())
+        or (isinstance(description, str) and search in description.lower())
+    )
@@ -0,0 +1,165 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+from decouple import config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Hedged read configuration
+HEDGED_READS_ENABLED = config('HEDGED_READS_ENABLED', default=False, cast=bool)
+# A second request is sent once a read is slower than this percentile of recent reads
+HEDGE_PERCENTILE = config('HEDGE_PERCENTILE', default=0.95, cast=float)
+HEDGE_MIN_DELAY = config('HEDGE_MIN_DELAY', default=0.005, cast=float)
+# At most this fraction of reads is hedged, so RU use grows by at most as much
+HEDGE_MAX_RATE = config('HEDGE_MAX_RATE', default=0.05, cast=float)
+# Latency samples kept per operation, and how many are needed before hedging starts
+HEDGE_SAMPLE_SIZE = config('HEDGE_SAMPLE_SIZE', default=500, cast=int)
+HEDGE_MIN_SAMPLES = config('HEDGE_MIN_SAMPLES', default=50, cast=int)
+
+# Unused hedge allowance saved up for bursts of slow reads
+HEDGE_BURST = 10.0
+# Samples between recomputations of the delay
+RECOMPUTE_EVERY = 20
+
+
+class LatencyTracker:
+    """Recent latencies of one operation and the hedge delay derived from them"""
+
+    def __init__(
+        self,
+        percentile: float = HEDGE_PERCENTILE,
+        sample_size: int = HEDGE_SAMPLE_SIZE,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        min_delay: float = HEDGE_MIN_DELAY
+    ):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._samples: Deque[float] = deque(maxlen=sample_size)
+        self._since_recompute = 0
+        self._delay: Optional[float] = None
+
+    def record(self, latency: float):
+        self._samples.append(latency)
+        self._since_recompute += 1
+        if self._since_recompute >= RECOMPUTE_EVERY or self._delay is None:
+            self._recompute()
+
+    @property
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, None until enough samples were seen"""
+        return self._delay
+
+    def _recompute(self):
+        self._since_recompute = 0
+        if len(self._samples) < self.min_samples:
+            self._delay = None
+            return
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        self._delay = max(self.min_delay, ordered[index])
+
+
+class HedgeStats:
+    __slots__ = ("reads", "hedged", "hedge_wins", "over_budget")
+
+    def __init__(self):
+        self.reads = 0
+        self.hedged = 0  # second requests sent
+        self.hedge_wins = 0  # second requests that answered first
+        self.over_budget = 0  # slow reads not hedged because of HEDGE_MAX_RATE
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class HedgedReads:
+    """Sends a second copy of an idempotent read when the first is slower than usual
+
+    Whichever copy answers first is used; the other is left to finish so
+    its latency still counts towards the delay. Each read earns HEDGE_MAX_RATE
+    of a hedge, which caps the extra request units.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = HEDGED_READS_ENABLED,
+        max_rate: float = HEDGE_MAX_RATE,
+        tracker_factory: Callable[[], LatencyTracker] = LatencyTracker,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.enabled = enabled
+        self.max_rate = max_rate
+        self.tracker_factory = tracker_factory
+        self.clock = clock
+        self.trackers: Dict[str, LatencyTracker] = {}
+        self.stats: Dict[str, HedgeStats] = {}
+        self._budget = 0.0
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        return {operation: stats.as_dict() for operation, stats in self.stats.items()}
+
+    async def run(self, operation: str, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        if not self.enabled:
+            return await func(*args, **kwargs)
+
+        tracker = self.trackers.get(operation)
+        if tracker is None:
+            tracker = self.trackers[operation] = self.tracker_factory()
+            self.stats[operation] = HedgeStats()
+        stats = self.stats[operation]
+        stats.reads += 1
+        self._budget = min(HEDGE_BURST, self._budget + self.max_rate)
+
+        delay = tracker.delay
+        primary = self._start(tracker, func, *args, **kwargs)
+        if delay is None:
+            return await primary
+
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+            if self._budget < 1:
+                stats.over_budget += 1
+                return await primary
+
+            self._budget -= 1
+            stats.hedged += 1
+            hedge = self._start(tracker, func, *args, **kwargs)
+            pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            stats.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        except asyncio.CancelledError:
+            for task in pending:
+                task.cancel()
+            raise
+
+    def _start(self, tracker: LatencyTracker, func, *args, **kwargs) -> asyncio.Task:
+        started = self.clock()
+        task = asyncio.ensure_future(func(*args, **kwargs))
+
+        def finished(task: asyncio.Task):
+            if task.cancelled():
+                return
+            # Retrieved here so a losing copy that failed isn't reported as unhandled
+            if task.exception() is None:
+                tracker.record(self.clock() - started)
+
+        task.add_done_callback(finished)
+        return task
+
+
+# Global hedger for single-item reads
+hedged_reads = HedgedReads()
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+import logging
+
+from app.database.ordering import filtered_sort_indexes, order_composite_indexes
+from app.database.sync import TOMBSTONE_TTL_DAYS, UPDATED_AT_COMPOSITE_INDEX
+
+logger = logging.getLogger(__name__)
+
+# Cosmos adds this exclusion to every policy on its own
+SYSTEM_EXCLUDED_PATHS = {'/"_etag"/?'}
+
+
+@dataclass
+class ContainerSpec:
+    """Declared shape of a container; the indexing policy is kept in sync by the migration"""
+    id: str
+    partition_key: str
+    indexing_policy: Dict[str, Any]
+    default_ttl: Optional[int] = None
+    offer_throughput: Optional[int] = None
+
+
+def _paths(*paths: str) -> List[Dict[str, str]]:
+    return [{"path": path} for path in paths]
+
+
+def _unique(indexes: List[List[Dict[str, str]]]) -> List[List[Dict[str, str]]]:
+    unique = []
+    for index in indexes:
+        if index not in unique:
+            unique.append(index)
+    return unique
+
+
+# Only queried paths are indexed, free text such as description is not;
+# CONTAINS over it still works as a filter on the already narrowed candidates
+PROJECTS_CONTAINER = ContainerSpec(
+    id="projects",
+    partition_key="/owner_id",
+    indexing_policy={
+        "indexingMode": "consistent",
+        "includedPaths": _paths(
+            "/project_id/?", "/name/?", "/status/?", "/priority/?", "/priority_rank/?", "/owner_id/?",
+            "/tags/[]/?", "/budget/?", "/created_at/?", "/updated_at/?"
+        ),
+        "excludedPaths": _paths("/*"),
+        "compositeIndexes": _unique([
+            UPDATED_AT_COMPOSITE_INDEX,  # delta sync
+            *filtered_sort_indexes(),  # filtered default listing
+            *order_composite_indexes(),  # orderBy
+        ]),
+    },
+    offer_throughput=400
+)
+
+# Deleted projects, kept for delta sync until their TTL expires
+TOMBSTONES_CONTAINER = ContainerSpec(
+    id="project_tombstones",
+    partition_key="/id",
+    indexing_policy={
+        "indexingMode": "consistent",
+        "includedPaths": _paths("/updated_at/?"),
+        "excludedPaths": _paths("/*"),
+        "compositeIndexes": [UPDATED_AT_COMPOSITE_INDEX],
+    },
+    default_ttl=TOMBSTONE_TTL_DAYS * 24 * 60 * 60
+)
+
+USERS_CONTAINER = ContainerSpec(
+    id="users",
+    partition_key="/id",
+    indexing_policy={
+        "indexingMode": "consistent",
+        "includedPaths": _paths("/created_at/?"),
+        "excludedPaths": _paths("/*"),
+    },
+    offer_throughput=400
+)
+
+CONTAINERS = [PROJECTS_CONTAINER, TOMBSTONES_CONTAINER, USERS_CONTAINER]
+
+
+def _normalize(policy: Dict[str, Any]) -> Tuple[str, Set[str], Set[str], Set[Tuple[Tuple[str, str], ...]]]:
+    """Comparable form of a policy, ignoring defaults Cosmos fills in"""
+    return (
+        (policy.get("indexingMode") or "consistent").lower(),
+        {entry["path"] for entry in policy.get("includedPaths", [])},
+        {entry["path"] for entry in policy.get("excludedPaths", [])} - SYSTEM_EXCLUDED_PATHS,
+        {
+            tuple((entry["path"], entry.get("order", "ascending").lower()) for entry in index)
+            for index in policy.get("compositeIndexes", [])
+        },
+    )
+
+
+def diff_policy(current: Dict[str, Any], desired: Dict[str, Any]) -> List[str]:
+    """Human readable changes turning the current policy into the desired one, empty if in sync"""
+    current_mode, current_included, current_excluded, current_composites = _normalize(current)
+    mode, included, excluded, composites = _normalize(desired)
+
+    def format_index(index):
+        return "(" + ", ".join(f"{path} {order}" for path, order in index) + ")"
+
+    changes = []
+    if current_mode != mode:
+        changes.append(f"~ indexingMode {current_mode} -> {mode}")
+    changes += [f"+ included {path}" for path in sorted(included - current_included)]
+    changes += [f"- included {path}" for path in sorted(current_included - included)]
+    changes += [f"+ excluded {path}" for path in sorted(excluded - current_excluded)]
+    changes += [f"- excluded {path}" for path in sorted(current_excluded - excluded)]
+    changes += [f"+ composite {format_index(index)}" for index in sorted(composites - current_composites)]
+    changes += [f"- composite {format_index(index)}" for index in sorted(current_composites - composites)]
+    return changes
+
+
+def migrate_indexing_policies(database, containers: List[ContainerSpec] = CONTAINERS, apply: bool = False) -> Dict[str, List[str]]:
+    """Diff the declared policies against the containers and, with `apply`, replace the ones that drifted
+
+    Cosmos re-indexes in the background after a replace; queries keep working meanwhile.
+    """
+    plan = {}
+    for spec in containers:
+        properties = database.get_container_client(spec.id).read()
+        changes = diff_policy(properties.get("indexingPolicy", {}), spec.indexing_policy)
+        plan[spec.id] = changes
+        if not changes or not apply:
+            continue
+
+        # Replace resets every property it isn't given, so carry over the partition key and TTL
+        database.replace_container(
+            spec.id,
+            partition_key=properties["partitionKey"],
+            indexing_policy=spec.indexing_policy,
+            default_ttl=spec.default_ttl if spec.default_ttl is not None else properties.get("defaultTtl")
+        )
+        logger.info(f"Applied indexing policy to container '{spec.id}' ({len(changes)} changes)")
+    return plan
@@ -0,0 +1,145 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from decouple import config
+
+# Batch lookup configuration
+BATCH_LOOKUP_MAX_IDS = config('BATCH_LOOKUP_MAX_IDS', default=100, cast=int)
+# Up to this many ids with a known partition key are point reads, the rest share one query
+POINT_READ_BATCH_LIMIT = config('POINT_READ_BATCH_LIMIT', default=25, cast=int)
+PARTITION_KEY_CACHE_SIZE = config('PARTITION_KEY_CACHE_SIZE', default=10000, cast=int)
+
+# Negative lookup cache: ids recently found missing are answered without a query
+NEGATIVE_CACHE_TTL = config('NEGATIVE_CACHE_TTL', default=30.0, cast=float)
+NEGATIVE_CACHE_MAX_ENTRIES = config('NEGATIVE_CACHE_MAX_ENTRIES', default=10000, cast=int)
+
+# (document id, partition key) of a stored item
+ItemLocation = Tuple[str, str]
+
+
+def dedupe_ids(ids: Iterable[str]) -> List[str]:
+    """Unique ids in first-seen order"""
+    return list(dict.fromkeys(ids))
+
+
+def check_batch_size(ids: List[str], limit: int = BATCH_LOOKUP_MAX_IDS):
+    if len(ids) > limit:
+        raise ValueError(f"At most {limit} ids can be looked up at once, got {len(ids)}")
+
+
+class PartitionKeyCache:
+    """LRU map from a lookup id to where the item lives, so lookups by id can be point reads
+
+    Projects are partitioned by owner, so an id alone needs a cross-partition
+    query. Ids seen on earlier reads and writes skip it.
+    """
+
+    def __init__(self, max_entries: int = PARTITION_KEY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, ItemLocation]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, lookup_id: str) -> Optional[ItemLocation]:
+        location = self._entries.get(lookup_id)
+        if location is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(lookup_id)
+        return location
+
+    def remember(self, item: Dict[str, Any], partition_field: str, aliases: Iterable[str] = ()):
+        """Record an item under its id and any alternate ids (e.g. project_id)"""
+        location = (item["id"], item[partition_field])
+        for lookup_id in (item["id"], *(item.get(alias) for alias in aliases)):
+            if lookup_id:
+                self._entries[lookup_id] = location
+                self._entries.move_to_end(lookup_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def forget(self, *lookup_ids: Optional[str]):
+        for lookup_id in lookup_ids:
+            if lookup_id:
+                self._entries.pop(lookup_id, None)
+
+
+class NegativeCache:
+    """Remembers ids that were not found, for a short TTL
+
+    Local creates drop their ids right away; items created by other
+    instances become visible once the entry expires.
+    """
+
+    def __init__(
+        self,
+        ttl: float = NEGATIVE_CACHE_TTL,
+        max_entries: int = NEGATIVE_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        # Bumped by every discard, so a lookup that raced a create doesn't record a stale miss
+        self.version = 0
+        self._expires: "OrderedDict[str, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def __contains__(self, lookup_id: str) -> bool:
+        expires = self._expires.get(lookup_id)
+        if expires is None:
+            self.misses += 1
+            return False
+        if expires <= self.clock():
+            del self._expires[lookup_id]
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def add(self, *lookup_ids: Optional[str], version: Optional[int] = None):
+        """Record misses; with `version`, only if nothing was discarded since it was read"""
+        if self.ttl <= 0 or (version is not None and version != self.version):
+            return
+        expires = self.clock() + self.ttl
+        for lookup_id in lookup_ids:
+            if lookup_id:
+                # Re-inserted at the end, so the oldest entries are evicted first
+                self._expires.pop(lookup_id, None)
+                self._expires[lookup_id] = expires
+        while len(self._expires) > self.max_entries:
+            self._expires.popitem(last=False)
+
+    def discard(self, *lookup_ids: Optional[str]):
+        self.version += 1
+        for lookup_id in lookup_ids:
+            if lookup_id:
+                self._expires.pop(lookup_id, None)
+
+    def clear(self):
+        self._expires.clear()
+
+
+def plan_lookups(
+    ids: List[str],
+    locate,
+    point_read_limit: int = POINT_READ_BATCH_LIMIT
+) -> Tuple[Dict[str, ItemLocation], List[str]]:
+    """Split ids into point reads for known locations and the rest for one query"""
+    point_reads: Dict[str, ItemLocation] = {}
+    remaining: List[str] = []
+    for lookup_id in ids:
+        location = locate(lookup_id) if len(point_reads) < point_read_limit else None
+        if location is not None:
+            point_reads[lookup_id] = location
+        else:
+            remaining.append(lookup_id)
+    return point_reads, remaining
@@ -0,0 +1,36 @@
+"""Bring the indexing policies of existing containers in line with app/database/indexing.py
+
+    python -m app.database.migrate            # show the changes
+    python -m app.database.migrate --apply    # replace the policies that drifted
+"""
+
+import argparse
+import asyncio
+
+import app.schema  # noqa: F401, the connection module needs the schema types loaded first
+from app.database.connection import db_client
+from app.database.indexing import migrate_indexing_policies
+
+
+async def main(apply: bool):
+    await db_client.initialize()
+    plan = migrate_indexing_policies(db_client.database, apply=apply)
+
+    for container_id, changes in plan.items():
+        if not changes:
+            print(f"{container_id}: up to date")
+            continue
+        print(f"{container_id}: {len(changes)} changes{' applied' if apply else ''}")
+        for change in changes:
+            print(f"  {change}")
+
+    if not apply and any(plan.values()):
+        print("Run again with --apply to replace these policies; Cosmos re-indexes in the background")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diff and apply the declared Cosmos DB indexing policies")
+    parser.add_argument("--apply", action="store_true", help="Replace the policies of containers that drifted")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.apply))
@@ -0,0 +1,164 @@
+from bisect import bisect_right
+from functools import cmp_to_key
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Priorities sort by rank rather than by name, so the rank is stored on every project
+PRIORITY_RANKS = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
+
+# Document fields that `orderBy` can sort on
+ORDER_FIELDS = ("name", "budget", "priority_rank", "created_at", "updated_at")
+
+# Longest `orderBy`; every ordering it accepts has a composite index
+MAX_ORDER_FIELDS = 2
+
+# Two-field orderings `orderBy` accepts, in either direction per field. Each
+# costs two composite indexes and every composite index adds to the RU charge
+# of each write, so pairs are only added when the API needs them
+ORDER_PAIRS = (
+    ("priority_rank", "created_at"),
+    ("priority_rank", "updated_at"),
+    ("priority_rank", "budget"),
+    ("budget", "name"),
+)
+
+# Equality filters of build_filter_query that lead the default `created_at DESC` sort
+EQUALITY_FILTER_FIELDS = ("status", "priority", "owner_id")
+
+# (document field, descending) pairs, always ending with the id tie-breaker
+Order = List[Tuple[str, bool]]
+
+
+def priority_rank(priority: Any) -> Optional[int]:
+    value = getattr(priority, "value", priority)
+    return PRIORITY_RANKS.get(value.upper()) if isinstance(value, str) else None
+
+
+def normalize_order(order_by: Sequence[Any]) -> Order:
+    """Turn ProjectOrder inputs into sort keys; id follows the last direction"""
+    if len(order_by) > MAX_ORDER_FIELDS:
+        raise ValueError(f"orderBy accepts at most {MAX_ORDER_FIELDS} fields")
+
+    order = [(entry.field.value, entry.direction.value == "DESC") for entry in order_by]
+    fields = [name for name, _ in order]
+    if len(set(fields)) != len(fields):
+        raise ValueError("orderBy fields must be distinct")
+    if len(fields) == 2 and tuple(fields) not in ORDER_PAIRS:
+        raise ValueError(f"orderBy {fields[0]} then {fields[1]} is not supported")
+    return order + [("id", order[-1][1])]
+
+
+def order_signature(order: Order) -> str:
+    return ",".join(f"{name}:{'desc' if descending else 'asc'}" for name, descending in order)
+
+
+def build_order_clause(order: Order) -> str:
+    return ", ".join(f"c.{name} {'DESC' if descending else 'ASC'}" for name, descending in order)
+
+
+def order_composite_indexes() -> List[List[Dict[str, str]]]:
+    """Composite indexes serving every accepted `orderBy`; each also serves its full inversion"""
+    def path(name: str, descending: bool = False) -> Dict[str, str]:
+        return {"path": f"/{name}", "order": "descending" if descending else "ascending"}
+
+    indexes = [[path(name), path("id")] for name in ORDER_FIELDS]
+    for first, second in ORDER_PAIRS:
+        for descending in (False, True):
+            indexes.append([path(first), path(second, descending), path("id", descending)])
+    return indexes
+
+
+def build_default_order_clause(filter: Optional[Any]) -> str:
+    """`created_at DESC`, led by the equality-filtered fields so a composite index serves it
+
+    The leading fields hold a single value within the results, so the order is unchanged.
+    """
+    fields = [name for name in EQUALITY_FILTER_FIELDS if filter is not None and getattr(filter, name)]
+    return ", ".join([f"c.{name} DESC" for name in fields] + ["c.created_at DESC"])
+
+
+def filtered_sort_indexes() -> List[List[Dict[str, str]]]:
+    """Composite indexes for build_default_order_clause, one per combination of equality filters"""
+    indexes = []
+    for mask in range(1, 1 << len(EQUALITY_FILTER_FIELDS)):
+        fields = [name for bit, name in enumerate(EQUALITY_FILTER_FIELDS) if mask >> bit & 1]
+        indexes.append([{"path": f"/{name}", "order": "ascending"} for name in (*fields, "created_at")])
+    return indexes
+
+
+def _after(path: str, parameter: str, value: Any, descending: bool) -> str:
+    """Condition for values strictly after `value` in Cosmos type order (null before numbers)"""
+    if value is None:
+        return "false" if descending else f"NOT IS_NULL({path})"
+    if descending:
+        return f"({path} < {parameter} OR IS_NULL({path}))"
+    return f"{path} > {parameter}"
+
+
+def _equal(path: str, parameter: str, value: Any) -> str:
+    return f"IS_NULL({path})" if value is None else f"{path} = {parameter}"
+
+
+def build_seek_clause(order: Order, key: Optional[List[Any]]) -> Tuple[str, List[Dict[str, Any]]]:
+    """WHERE clause selecting the rows after a sort key, for keyset pagination"""
+    if key is None:
+        return "", []
+
+    parameters = []
+    alternatives = []
+    equalities: List[str] = []
+    for index, ((name, descending), value) in enumerate(zip(order, key)):
+        path = f"c.{name}"
+        parameter = f"@after{index}"
+        if value is not None:
+            parameters.append({"name": parameter, "value": value})
+        alternatives.append(" AND ".join([*equalities, _after(path, parameter, value, descending)]))
+        equalities.append(_equal(path, parameter, value))
+
+    return " OR ".join(f"({alternative})" for alternative in alternatives), parameters
+
+
+def sort_value(item: Dict[str, Any], name: str) -> Any:
+    if name == "priority_rank" and item.get(name) is None:
+        # Items loaded before their rank was backfilled
+        return priority_rank(item.get("priority"))
+    return item.get(name)
+
+
+def sort_key(item: Dict[str, Any], order: Order) -> List[Any]:
+    return [sort_value(item, name) for name, _ in order]
+
+
+def _identity(item: Any) -> Any:
+    return item
+
+
+def _value_key(value: Any) -> Tuple[int, Any]:
+    # Cosmos orders null before numbers before strings
+    if value is None:
+        return 0, 0
+    return (1 if isinstance(value, (int, float)) else 2), value
+
+
+def compare_keys(left: List[Any], right: List[Any], order: Order) -> int:
+    for left_value, right_value, (_, descending) in zip(left, right, order):
+        left_key, right_key = _value_key(left_value), _value_key(right_value)
+        if left_key != right_key:
+            result = 1 if left_key > right_key else -1
+            return -result if descending else result
+    return 0
+
+
+def sort_items(items: Iterable[Any], order: Order, lookup: Callable[[Any], Dict[str, Any]] = _identity) -> List[Any]:
+    """Sort like the Cosmos ORDER BY, one stable pass per field from the last"""
+    items = list(items)
+    for name, descending in reversed(order):
+        items.sort(key=lambda item: _value_key(sort_value(lookup(item), name)), reverse=descending)
+    return items
+
+
+def seek(items: List[Any], order: Order, key: Optional[List[Any]], lookup: Callable[[Any], Dict[str, Any]] = _identity) -> int:
+    """Index of the first sorted item after `key`"""
+    if key is None:
+        return 0
+    wrap = cmp_to_key(lambda left, right: compare_keys(left, right, order))
+    return bisect_right(items, wrap(key), key=lambda item: wrap(sort_key(lookup(item), order)))
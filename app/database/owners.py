@@ -0,0 +1,121 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from decouple import config
+import logging
+
+from strawberry.types.nodes import SelectedField
+
+from app.database.change_feed import READER_RESTART_DELAY
+
+logger = logging.getLogger(__name__)
+
+# Owner summary fan-out configuration
+# Off by default: the job polls the users change feed on every instance. Without
+# it embedded summaries are not kept current, so Project.owner doesn't read them
+OWNER_FANOUT_ENABLED = config('OWNER_FANOUT_ENABLED', default=False, cast=bool)
+# Seconds between polls of the users change feed; embedded summaries lag user edits by up to this
+OWNER_FANOUT_POLL_INTERVAL = config('OWNER_FANOUT_POLL_INTERVAL', default=30.0, cast=float)
+
+# User fields copied into each project document as `owner_summary`
+OWNER_SUMMARY_FIELDS = ("full_name", "email", "role")
+
+# GraphQL User fields the embedded summary can answer
+SUMMARY_SELECTION = {"__typename", "id", "fullName", "email", "role"}
+
+
+def make_owner_summary(user: Any) -> Dict[str, Any]:
+    """Compact copy of a user, from a stored item or a User model"""
+    get = user.get if isinstance(user, dict) else lambda name: getattr(user, name, None)
+    summary = {name: get(name) for name in OWNER_SUMMARY_FIELDS}
+    summary["role"] = getattr(summary["role"], "value", summary["role"])
+    return summary
+
+
+def _selected_names(selections: Iterable[Any]) -> Iterable[str]:
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            yield selection.name
+        else:
+            # Fragment spreads and inline fragments
+            yield from _selected_names(selection.selections)
+
+
+def owner_summary_fits(selected_fields: List[Any]) -> bool:
+    """Whether the selection on `owner` only asks for fields the summary holds"""
+    return all(
+        set(_selected_names(field.selections)) <= SUMMARY_SELECTION
+        for field in selected_fields
+    )
+
+
+class OwnerSummary:
+    """User served from the summary embedded in a project document"""
+
+    __slots__ = ("id", "full_name", "email", "role")
+
+    def __init__(self, owner_id: str, summary: Dict[str, Any]):
+        self.id = owner_id
+        self.full_name = summary.get("full_name")
+        self.email = summary.get("email")
+        self.role = summary.get("role")
+
+
+# Reads (id, owner_summary) of every project owned by a user
+ReadOwned = Callable[[str], Awaitable[List[Dict[str, Any]]]]
+# Writes the summary into one project: (item id, owner id, summary)
+WriteSummary = Callable[[str, str, Dict[str, Any]], Awaitable[Any]]
+
+
+class OwnerSummaryFanout:
+    """Follows the users change feed and rewrites the summaries embedded in their projects
+
+    Projects are partitioned by owner, so each changed user costs one
+    single-partition query plus one patch per project whose copy differs.
+    """
+
+    def __init__(self):
+        self.updated_projects = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def apply(self, user: Dict[str, Any], read_owned: ReadOwned, write_summary: WriteSummary) -> List[str]:
+        """Bring the projects of one user up to date, returning the ids that were rewritten"""
+        summary = make_owner_summary(user)
+        stale = [item["id"] for item in await read_owned(user["id"]) if item.get("owner_summary") != summary]
+        for item_id in stale:
+            await write_summary(item_id, user["id"], summary)
+        self.updated_projects += len(stale)
+        return stale
+
+    async def start(
+        self,
+        source,
+        read_owned: ReadOwned,
+        write_summary: WriteSummary,
+        on_update: Optional[Callable[[str, List[str]], Any]] = None
+    ):
+        self._task = asyncio.ensure_future(self._run(source, read_owned, write_summary, on_update))
+
+    async def _run(self, source, read_owned, write_summary, on_update):
+        while True:
+            try:
+                async for user in source.changes():
+                    updated = await self.apply(user, read_owned, write_summary)
+                    if updated:
+                        logger.info(f"Updated owner summary of user {user['id']} in {len(updated)} projects")
+                        if on_update is not None:
+                            on_update(user["id"], updated)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Owner summary fan-out failed, restarting: {e}")
+                await asyncio.sleep(READER_RESTART_DELAY)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Global fan-out job, started when OWNER_FANOUT_ENABLED
+owner_fanout = OwnerSummaryFanout()
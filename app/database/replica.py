@@ -0,0 +1,396 @@
+import asyncio
+from bisect import bisect_right
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from decouple import config
+import logging
+
+from app.database.change_feed import READER_RESTART_DELAY, SlowConsumerError
+from app.database.filters import matches_search, project_matches_filter
+from app.database.ordering import Order, order_signature, seek, sort_items, sort_key
+
+logger = logging.getLogger(__name__)
+
+# Local replica configuration
+PROJECT_REPLICA_ENABLED = config('PROJECT_REPLICA_ENABLED', default=False, cast=bool)
+# Full reload interval in seconds, catches deletions made by other instances (0 disables)
+PROJECT_REPLICA_REFRESH_INTERVAL = config('PROJECT_REPLICA_REFRESH_INTERVAL', default=300, cast=int)
+
+# Fields with a bitmap index, tags is multi-valued
+INDEXED_FIELDS = ("status", "priority", "owner_id")
+
+# Filtered `orderBy` pages sort the matches instead of walking the whole order below 1 in this many
+SPARSE_MATCH_RATIO = 8
+
+
+def iter_bits(bitmap: int):
+    """Yield the positions of the set bits, highest first"""
+    while bitmap:
+        position = bitmap.bit_length() - 1
+        yield position
+        bitmap ^= 1 << position
+
+
+def skip_bits(bitmap: int, count: int) -> int:
+    """Clear the `count` highest set bits"""
+    if count <= 0:
+        return bitmap
+    if count >= bitmap.bit_count():
+        return 0
+
+    # Largest shift that still leaves `count` set bits
+    low, high = 0, bitmap.bit_length()
+    while low < high:
+        middle = (low + high + 1) // 2
+        if (bitmap >> middle).bit_count() >= count:
+            low = middle
+        else:
+            high = middle - 1
+    return bitmap & ((1 << low) - 1)
+
+
+def insert_bit(bitmap: int, position: int) -> int:
+    """Open a zero bit at `position`, moving the bits at and above it up by one"""
+    low = bitmap & ((1 << position) - 1)
+    return (bitmap ^ low) << 1 | low
+
+
+def row_key(item: Dict[str, Any]) -> Tuple[str, str]:
+    return item.get("created_at") or "", item["id"]
+
+
+def indexed_values(item: Dict[str, Any]):
+    """(field, value) pairs the item sets a bit for"""
+    for field in INDEXED_FIELDS:
+        yield field, item.get(field)
+    for tag in set(item.get("tags") or ()):
+        yield "tags", tag
+
+
+class _BitmapBuilder:
+    """Collects bit positions per key into bytearrays, then converts them to ints"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.buffers: Dict[Any, bytearray] = {}
+
+    def add(self, key: Any, position: int):
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = bytearray((self.size + 7) // 8)
+        buffer[position >> 3] |= 1 << (position & 7)
+
+    def build(self) -> Dict[Any, int]:
+        return {key: int.from_bytes(buffer, "little") for key, buffer in self.buffers.items()}
+
+
+class ProjectReplica:
+    """In-process copy of the projects container with bitmap filter indexes
+
+    Bit positions follow the `created_at` order, oldest lowest, so a filter is
+    an AND/OR of bitmaps and a page of the `created_at DESC` projects query is
+    a slice of its highest set bits. Writes update the bits of the one item in
+    place: a new project is usually the newest and takes the next position, a
+    removed one leaves a hole that the next full index build drops.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: int = PROJECT_REPLICA_REFRESH_INTERVAL,
+        restart_delay: float = READER_RESTART_DELAY
+    ):
+        self.refresh_interval = refresh_interval
+        self.restart_delay = restart_delay
+        self.ready = False
+        self._items: Dict[str, Dict[str, Any]] = {}
+        # updated_at of deleted items, so late change feed events don't resurrect them
+        self._deleted: Dict[str, str] = {}
+        # Item at each bit position, None for holes; holes keep their key so _keys stays sorted
+        self._rows: List[Optional[Dict[str, Any]]] = []
+        self._keys: List[Tuple[str, str]] = []
+        self._positions: Dict[str, int] = {}
+        self._holes = 0
+        self._all = 0
+        self._bitmaps: Dict[str, Dict[Any, int]] = {}
+        # Items sorted by each requested `orderBy`, kept sorted through writes
+        self._orders: Dict[str, Tuple[Order, List[Dict[str, Any]]]] = {}
+        self._reload_ops: Optional[List[Tuple[str, Any]]] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def load(self, items: List[Dict[str, Any]]):
+        """Replace the contents with a full read of the container"""
+        self._items = {item["id"]: dict(item) for item in items}
+        self._deleted = {}
+        self._build_index()
+        self.ready = True
+
+    def upsert(self, item: Dict[str, Any]):
+        if self._reload_ops is not None:
+            self._reload_ops.append(("upsert", dict(item)))
+        if not self.ready:
+            return
+
+        item_id = item["id"]
+        updated_at = item.get("updated_at") or ""
+        current = self._items.get(item_id)
+        if current is not None and (current.get("updated_at") or "") > updated_at:
+            return
+        if item_id in self._deleted and updated_at <= self._deleted[item_id]:
+            return
+
+        item = dict(item)
+        self._items[item_id] = item
+        self._deleted.pop(item_id, None)
+        if current is not None and row_key(current) == row_key(item):
+            position = self._positions[item_id]
+            self._unindex(current, position)
+            self._index(item, position)
+            self._rows[position] = item
+        else:
+            if current is not None:
+                self._drop_row(current)
+            self._add_row(item)
+        self._reorder(current, item)
+
+    def remove(self, item_id: str):
+        if self._reload_ops is not None:
+            self._reload_ops.append(("remove", item_id))
+        if not self.ready:
+            return
+
+        item = self._items.pop(item_id, None)
+        if item is not None:
+            self._deleted[item_id] = item.get("updated_at") or ""
+            self._drop_row(item)
+            self._reorder(item, None)
+            if self._holes > len(self._items):
+                self._build_index()
+
+    def query(self, filter: Optional[Any], skip: int, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Return (page of items, total matches) in `created_at DESC` order"""
+        bitmap = self._match_bitmap(filter)
+
+        page = []
+        for position in iter_bits(skip_bits(bitmap, skip)):
+            if len(page) == limit:
+                break
+            page.append(self._rows[position])
+        return page, bitmap.bit_count()
+
+    def query_ordered(
+        self,
+        filter: Optional[Any],
+        order: Order,
+        after: Optional[List[Any]],
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return (page of items after the sort key, total matches) in the given order"""
+        signature = order_signature(order)
+        if signature not in self._orders:
+            self._orders[signature] = (order, sort_items(self._items.values(), order))
+        items = self._orders[signature][1]
+
+        bitmap = self._match_bitmap(filter)
+        total = bitmap.bit_count()
+        if bitmap == self._all:
+            start = seek(items, order, after)
+            return items[start:start + limit], total
+
+        if total * SPARSE_MATCH_RATIO < len(items):
+            # Few matches: sorting just those beats walking past the rest
+            matches = sort_items((self._rows[position] for position in iter_bits(bitmap)), order)
+            start = seek(matches, order, after)
+            return matches[start:start + limit], total
+
+        page = []
+        for item in islice(items, seek(items, order, after), None):
+            if len(page) == limit:
+                break
+            if project_matches_filter(item, filter):
+                page.append(item)
+        return page, total
+
+    def matching(self, filter: Optional[Any]) -> List[Dict[str, Any]]:
+        """Every item matching the filter, in `created_at DESC` order"""
+        return [self._rows[position] for position in iter_bits(self._match_bitmap(filter))]
+
+    def facet_counts(self, filter: Optional[Any], fields: List[str]) -> Dict[str, Dict[Any, int]]:
+        """Count matching projects per value of each field in one pass over the indexes"""
+        bitmap = self._match_bitmap(filter)
+        return {
+            field: {value: (bitmap & values).bit_count() for value, values in self._bitmaps[field].items()}
+            for field in fields
+        }
+
+    def _match_bitmap(self, filter: Optional[Any]) -> int:
+        bitmap = self._filter_bitmap(filter)
+        if not (filter and filter.search):
+            return bitmap
+
+        # Search has no index, check the remaining candidates one by one
+        matches = _BitmapBuilder(len(self._rows))
+        for position in iter_bits(bitmap):
+            if matches_search(self._rows[position], filter.search):
+                matches.add(True, position)
+        return matches.build().get(True, 0)
+
+    def _filter_bitmap(self, filter: Optional[Any]) -> int:
+        bitmap = self._all
+        if not filter:
+            return bitmap
+
+        if filter.status:
+            bitmap &= self._bitmaps["status"].get(filter.status.value, 0)
+        if filter.priority:
+            bitmap &= self._bitmaps["priority"].get(filter.priority.value, 0)
+        if filter.owner_id:
+            bitmap &= self._bitmaps["owner_id"].get(filter.owner_id, 0)
+        if filter.tags:
+            # Any of the requested tags
+            tags = 0
+            for tag in filter.tags:
+                tags |= self._bitmaps["tags"].get(tag, 0)
+            bitmap &= tags
+        return bitmap
+
+    def _build_index(self):
+        rows = sorted(self._items.values(), key=row_key)
+        builders = {field: _BitmapBuilder(len(rows)) for field in (*INDEXED_FIELDS, "tags")}
+        for position, item in enumerate(rows):
+            for field, value in indexed_values(item):
+                builders[field].add(value, position)
+
+        self._rows = rows
+        self._keys = [row_key(item) for item in rows]
+        self._positions = {item["id"]: position for position, item in enumerate(rows)}
+        self._holes = 0
+        self._all = (1 << len(rows)) - 1
+        self._bitmaps = {field: builder.build() for field, builder in builders.items()}
+        self._orders = {
+            signature: (order, sort_items(rows, order)) for signature, (order, _) in self._orders.items()
+        }
+
+    def _index(self, item: Dict[str, Any], position: int):
+        bit = 1 << position
+        for field, value in indexed_values(item):
+            bitmaps = self._bitmaps[field]
+            bitmaps[value] = bitmaps.get(value, 0) | bit
+
+    def _unindex(self, item: Dict[str, Any], position: int):
+        mask = ~(1 << position)
+        for field, value in indexed_values(item):
+            bitmaps = self._bitmaps[field]
+            remaining = bitmaps.get(value, 0) & mask
+            if remaining:
+                bitmaps[value] = remaining
+            else:
+                bitmaps.pop(value, None)
+
+    def _add_row(self, item: Dict[str, Any]):
+        key = row_key(item)
+        position = bisect_right(self._keys, key)
+        if position > 0 and self._rows[position - 1] is None:
+            # Reuse the hole just below, the order of the keys is unchanged
+            position -= 1
+            self._keys[position] = key
+            self._holes -= 1
+        elif position < len(self._rows):
+            # Older than the newest project: move everything above up one bit
+            self._all = insert_bit(self._all, position)
+            for bitmaps in self._bitmaps.values():
+                for value, bitmap in bitmaps.items():
+                    bitmaps[value] = insert_bit(bitmap, position)
+            self._rows.insert(position, None)
+            self._keys.insert(position, key)
+            for moved in range(position + 1, len(self._rows)):
+                row = self._rows[moved]
+                if row is not None:
+                    self._positions[row["id"]] = moved
+        else:
+            self._rows.append(None)
+            self._keys.append(key)
+
+        self._rows[position] = item
+        self._positions[item["id"]] = position
+        self._all |= 1 << position
+        self._index(item, position)
+
+    def _drop_row(self, item: Dict[str, Any]):
+        position = self._positions.pop(item["id"])
+        self._unindex(item, position)
+        self._all &= ~(1 << position)
+        self._rows[position] = None
+        self._holes += 1
+
+    def _reorder(self, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]):
+        """Move an item within every cached `orderBy` order"""
+        for order, items in self._orders.values():
+            if old is not None:
+                del items[seek(items, order, sort_key(old, order)) - 1]
+            if new is not None:
+                items.insert(seek(items, order, sort_key(new, order)), new)
+
+    async def reload(self, load_items: Callable[[], Awaitable[List[Dict[str, Any]]]]):
+        """Reload from the container, replaying writes that happened meanwhile"""
+        self._reload_ops = []
+        try:
+            items = await load_items()
+            ops, self._reload_ops = self._reload_ops, None
+            self.load(items)
+            for op, value in ops:
+                if op == "upsert":
+                    self.upsert(value)
+                else:
+                    self.remove(value)
+        finally:
+            self._reload_ops = None
+        logger.info(f"Project replica loaded with {len(self._items)} projects")
+
+    async def start(self, load_items: Callable[[], Awaitable[List[Dict[str, Any]]]], hub=None):
+        """Warm the replica, then follow the change feed and reload periodically"""
+        await self.reload(load_items)
+        if hub is not None:
+            self._tasks.append(asyncio.ensure_future(self._follow(hub, load_items)))
+        if self.refresh_interval > 0:
+            self._tasks.append(asyncio.ensure_future(self._refresh(load_items)))
+
+    async def _follow(self, hub, load_items):
+        # Set when events may have been missed, so following resumes from a fresh load
+        resync = False
+        while True:
+            try:
+                if resync:
+                    await self.reload(load_items)
+                    resync = False
+                async for item in hub.subscribe():
+                    self.upsert(item)
+            except asyncio.CancelledError:
+                raise
+            except SlowConsumerError:
+                logger.warning("Project replica fell behind the change feed, reloading")
+                resync = True
+            except Exception as e:
+                logger.error(f"Project replica stopped following the change feed, restarting: {e}")
+                resync = True
+                await asyncio.sleep(self.restart_delay)
+
+    async def _refresh(self, load_items):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.reload(load_items)
+            except Exception as e:
+                logger.error(f"Project replica refresh failed: {e}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+# Global replica, only used when PROJECT_REPLICA_ENABLED
+project_replica = ProjectReplica()
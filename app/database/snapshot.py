@@ -0,0 +1,329 @@
+import asyncio
+import json
+import math
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from decouple import config
+import logging
+
+from app.database.facets import MULTI_VALUED_FIELDS
+from app.database.stats import DEFAULT_PERCENTILES, BudgetStats, summarize_groups
+from app.database.sync import requires_full_resync, to_timestamp
+from app.models.project import parse_datetime
+
+try:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    np = pa = pc = None
+
+logger = logging.getLogger(__name__)
+
+# Columnar snapshot configuration
+PROJECT_SNAPSHOT_ENABLED = config('PROJECT_SNAPSHOT_ENABLED', default=False, cast=bool)
+PROJECT_SNAPSHOT_PATH = config('PROJECT_SNAPSHOT_PATH', default='data/projects.arrow')
+PROJECT_SNAPSHOT_REFRESH_INTERVAL = config('PROJECT_SNAPSHOT_REFRESH_INTERVAL', default=600, cast=int)
+PROJECT_SNAPSHOT_PAGE_SIZE = config('PROJECT_SNAPSHOT_PAGE_SIZE', default=1000, cast=int)
+
+# Tombstones are written with the deleting instance's clock, start a little early
+TOMBSTONE_CLOCK_MARGIN = timedelta(minutes=5)
+
+SNAPSHOT_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+
+SNAPSHOT_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("project_id", pa.string()),
+    ("name", pa.string()),
+    ("description", pa.string()),
+    ("status", pa.string()),
+    ("priority", pa.string()),
+    ("owner_id", pa.string()),
+    ("tags", pa.list_(pa.string())),
+    ("budget", pa.float64()),
+    ("created_at", pa.string()),
+    ("updated_at", pa.string()),
+]) if pa is not None else None
+
+# Reads one (updated_at, id) ordered page of projects, or of tombstones when the flag is set
+ReadPage = Callable[[Optional[Tuple[str, str]], int, bool], Awaitable[List[Dict[str, Any]]]]
+
+
+def to_record_batch(items: List[Dict[str, Any]]):
+    """Convert raw project items to a record batch with the snapshot columns"""
+    columns = {name: [item.get(name) for item in items] for name in SNAPSHOT_SCHEMA.names}
+    columns["budget"] = [
+        float(budget) if isinstance(budget, (int, float)) and not isinstance(budget, bool) else None
+        for budget in columns["budget"]
+    ]
+    return pa.RecordBatch.from_pydict(columns, schema=SNAPSHOT_SCHEMA)
+
+
+def keep_latest(table):
+    """Drop earlier rows of ids that appear more than once, later rows are newer"""
+    if pc.count_distinct(table["id"]).as_py() == table.num_rows:
+        return table
+    rows = pa.table({"id": table["id"], "row": pa.array(np.arange(table.num_rows))})
+    latest = rows.group_by("id").aggregate([("row", "max")])["row_max"]
+    # Row numbers of the kept rows, back in table order
+    return table.take(pc.take(latest, pc.sort_indices(latest)))
+
+
+def filter_mask(table, filter: Optional[Any]):
+    """Boolean mask of the rows matching a ProjectFilter, None when nothing is filtered"""
+    if not filter:
+        return None
+
+    conditions = []
+    if filter.status:
+        conditions.append(pc.equal(table["status"], filter.status.value))
+    if filter.priority:
+        conditions.append(pc.equal(table["priority"], filter.priority.value))
+    if filter.owner_id:
+        conditions.append(pc.equal(table["owner_id"], filter.owner_id))
+    if filter.tags:
+        # Any of the requested tags
+        tags = table["tags"].combine_chunks()
+        hits = pc.is_in(pc.list_flatten(tags), value_set=pa.array(filter.tags, pa.string()))
+        matched = np.zeros(table.num_rows, dtype=bool)
+        matched[pc.list_parent_indices(tags).to_numpy()[hits.to_numpy(zero_copy_only=False)]] = True
+        conditions.append(pa.array(matched))
+    if filter.search:
+        search = filter.search.lower()
+        conditions.append(pc.or_kleene(
+            pc.match_substring(pc.utf8_lower(table["name"]), search),
+            pc.match_substring(pc.utf8_lower(table["description"]), search)
+        ))
+
+    if not conditions:
+        return None
+    mask = conditions[0]
+    for condition in conditions[1:]:
+        mask = pc.and_kleene(mask, condition)
+    return pc.fill_null(mask, False)
+
+
+def _encode(array) -> Tuple[Any, List[Any]]:
+    """Dictionary-encode an array; nulls get the last code, which maps to None"""
+    encoded = pc.dictionary_encode(array)
+    dictionary = encoded.dictionary.to_pylist() + [None]
+    codes = pc.fill_null(encoded.indices, len(dictionary) - 1).to_numpy(zero_copy_only=False)
+    return codes.astype(np.intp), dictionary
+
+
+def table_stats(table, fields: Sequence[str], percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> List[BudgetStats]:
+    """compute_project_stats over an Arrow table, without materialising rows"""
+    rows = np.arange(table.num_rows)
+    columns: List[Tuple[Any, List[Any]]] = []  # (code per row, dictionary) for each field
+    for name in fields:
+        column = table.column(name).combine_chunks()
+        if name not in MULTI_VALUED_FIELDS:
+            codes, dictionary = _encode(column)
+            columns.append((codes[rows], dictionary))
+            continue
+
+        # One row per (project, tag), untagged projects keep a single row with a None tag
+        offsets = column.offsets.to_numpy()
+        values, dictionary = _encode(column.values)
+        lengths = (offsets[1:] - offsets[:-1])[rows]
+        counts = np.maximum(lengths, 1)
+        expanded = np.repeat(np.arange(rows.size), counts)
+        within = np.arange(expanded.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.repeat(offsets[:-1][rows], counts) + within
+        tagged = np.repeat(lengths > 0, counts)
+        codes = np.full(expanded.size, len(dictionary) - 1, dtype=np.intp)
+        codes[tagged] = values[positions[tagged]]
+
+        rows = rows[expanded]
+        columns = [(previous[expanded], previous_dictionary) for previous, previous_dictionary in columns]
+        columns.append((codes, dictionary))
+
+    if not columns:
+        keys = [()] if rows.size else []
+        return summarize_groups(keys, np.zeros(rows.size, dtype=np.intp), table["budget"].to_numpy(), percentiles)
+
+    multi_valued = any(name in MULTI_VALUED_FIELDS for name in fields)
+    sizes = [len(dictionary) for _, dictionary in columns]
+    if math.prod(sizes) * max(table.num_rows, 1) < 2 ** 62:
+        # Pack the codes into one integer per row, a 1-D sort is much cheaper than rows of a matrix
+        combined = np.zeros(rows.size, dtype=np.int64)
+        for (codes, _), size in zip(columns, sizes):
+            combined = combined * size + codes
+        if multi_valued:
+            # A project repeating a tag still counts once in that group
+            pairs = np.sort(combined * table.num_rows + rows)
+            pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))] if pairs.size else pairs
+            combined, rows = np.divmod(pairs, table.num_rows)
+        unique, inverse = np.unique(combined, return_inverse=True)
+        matrix = np.empty((unique.size, len(columns)), dtype=np.int64)
+        for index in range(len(columns) - 1, -1, -1):
+            unique, matrix[:, index] = np.divmod(unique, sizes[index])
+    else:
+        matrix = np.stack([codes for codes, _ in columns], axis=1)
+        if multi_valued:
+            pairs = np.unique(np.column_stack([rows, matrix]), axis=0)
+            rows, matrix = pairs[:, 0], pairs[:, 1:]
+        matrix, inverse = np.unique(matrix, axis=0, return_inverse=True)
+
+    keys = [
+        tuple(dictionary[code] for (_, dictionary), code in zip(columns, key))
+        for key in matrix.tolist()
+    ]
+    budgets = table["budget"].to_numpy()[rows]
+    return summarize_groups(keys, inverse.reshape(-1), budgets, percentiles)
+
+
+class ProjectSnapshot:
+    """Columnar copy of the projects container in a memory-mapped Arrow IPC file
+
+    Refreshed in the background from `updated_at` ordered pages of projects and
+    tombstones, so analytics read the local file instead of spending RUs.
+    """
+
+    def __init__(
+        self,
+        path: str = PROJECT_SNAPSHOT_PATH,
+        refresh_interval: int = PROJECT_SNAPSHOT_REFRESH_INTERVAL,
+        page_size: int = PROJECT_SNAPSHOT_PAGE_SIZE
+    ):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.page_size = page_size
+        self.table = None
+        # Watermarks and refresh time, stored in the file's schema metadata
+        self.state: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.table is not None
+
+    @property
+    def refreshed_at(self) -> Optional[datetime]:
+        value = self.state.get("refreshed_at")
+        return parse_datetime(value) if value else None
+
+    def open(self) -> bool:
+        """Memory-map the snapshot file, False if it is missing or unusable"""
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(self.path, "r"))
+            table = reader.read_all()
+        except FileNotFoundError:
+            return False
+        except (pa.ArrowInvalid, OSError) as e:
+            logger.warning(f"Ignoring unreadable project snapshot {self.path}: {e}")
+            return False
+
+        if not table.schema.equals(SNAPSHOT_SCHEMA):
+            logger.warning(f"Project snapshot {self.path} has an outdated schema, rebuilding")
+            return False
+
+        self.state = json.loads((table.schema.metadata or {}).get(b"snapshot", b"{}"))
+        self.table = table
+        return True
+
+    def matching(self, filter: Optional[Any]):
+        """Rows matching a ProjectFilter"""
+        table = self.table
+        mask = filter_mask(table, filter)
+        return table if mask is None else table.filter(mask)
+
+    def stats(self, filter: Optional[Any], fields: Sequence[str], percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> List[BudgetStats]:
+        return table_stats(self.matching(filter), fields, percentiles)
+
+    async def refresh(self, read_page: ReadPage):
+        """Apply changes since the last refresh, or rebuild when there is no usable snapshot"""
+        async with self._lock:
+            refreshed_at = self.refreshed_at
+            full = self.table is None or refreshed_at is None or requires_full_resync(refreshed_at)
+            started = datetime.now(timezone.utc)
+
+            after = None if full else self.state.get("projects_after")
+            batches, projects_after = await self._read_changes(read_page, after)
+            deleted: Set[str] = set()
+            if full:
+                # Anything deleted before the scan started is already absent
+                tombstones_after = [to_timestamp(started - TOMBSTONE_CLOCK_MARGIN), ""]
+            else:
+                tombstones, tombstones_after = await self._read_changes(
+                    read_page, self.state.get("tombstones_after"), deleted=True
+                )
+                deleted = {item["id"] for page in tombstones for item in page}
+
+            state = {
+                "projects_after": projects_after,
+                "tombstones_after": tombstones_after,
+                "refreshed_at": to_timestamp(started),
+            }
+            if not full and not batches and not deleted:
+                self.state.update(state)
+                return
+
+            await asyncio.to_thread(self._write, batches, deleted, full, state)
+            logger.info(
+                f"Project snapshot {'rebuilt' if full else 'refreshed'} with {self.table.num_rows} projects"
+            )
+
+    async def _read_changes(self, read_page: ReadPage, after: Optional[List[str]], deleted: bool = False) -> Tuple[list, Optional[List[str]]]:
+        """Page through changes after a watermark; returns the pages and the new watermark"""
+        pages = []
+        while True:
+            page = await read_page(tuple(after) if after else None, self.page_size, deleted)
+            if not page:
+                break
+            # Projects are converted page by page so raw items don't pile up
+            pages.append(page if deleted else to_record_batch(page))
+            after = [page[-1]["updated_at"], page[-1]["id"]]
+            if len(page) < self.page_size:
+                break
+        return pages, after
+
+    def _write(self, batches: list, deleted: Set[str], full: bool, state: Dict[str, Any]):
+        changed = keep_latest(pa.Table.from_batches(batches, schema=SNAPSHOT_SCHEMA))
+        if full:
+            table = changed
+        else:
+            removed = pa.array(list(deleted.union(changed["id"].to_pylist())), pa.string())
+            kept = self.table.filter(pc.invert(pc.is_in(self.table["id"], value_set=removed)))
+            table = pa.concat_tables([kept, changed])
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write next to the live file and swap it in, readers keep their old mapping
+        temporary_path = f"{self.path}.tmp"
+        schema = SNAPSHOT_SCHEMA.with_metadata({"snapshot": json.dumps(state)})
+        with pa.OSFile(temporary_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            writer.write_table(table.combine_chunks())
+        os.replace(temporary_path, self.path)
+        self.open()
+
+    async def start(self, read_page: ReadPage):
+        """Open the existing snapshot and keep it refreshed in the background"""
+        if pa is None:
+            logger.warning("Project snapshot needs pyarrow and numpy, which are not installed")
+            return
+        if self.open():
+            logger.info(f"Opened project snapshot with {self.table.num_rows} projects")
+        self._task = asyncio.ensure_future(self._run(read_page))
+
+    async def _run(self, read_page: ReadPage):
+        while True:
+            try:
+                await self.refresh(read_page)
+            except Exception as e:
+                logger.error(f"Project snapshot refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Global snapshot, only refreshed when PROJECT_SNAPSHOT_ENABLED
+project_snapshot = ProjectSnapshot()
@@ -0,0 +1,172 @@
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.database.facets import MULTI_VALUED_FIELDS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+@dataclass
+class BudgetStats:
+    key: Tuple[Optional[str], ...]  # one value per group-by field
+    count: int  # projects in the group
+    budget_count: int  # projects in the group with a budget
+    sum: float = 0.0
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    percentiles: List[Tuple[float, float]] = field(default_factory=list)
+
+
+def build_stats_query(fields: Sequence[str], where_clause: str) -> str:
+    """Projection of just the columns the stats need"""
+    columns = ", ".join(f"c.{name}" for name in ("budget", *fields))
+    query = f"SELECT {columns} FROM c"
+    if where_clause:
+        query += f" WHERE {where_clause}"
+    return query
+
+
+def group_keys(item: Dict[str, Any], fields: Sequence[str]) -> List[Tuple[Optional[str], ...]]:
+    """Group keys of one project; a project lands in one group per tag, untagged ones under None"""
+    keys = [()]
+    for name in fields:
+        if name in MULTI_VALUED_FIELDS:
+            values = sorted(set(item.get(name) or ())) or [None]
+        else:
+            values = [item.get(name)]
+        keys = [key + (value,) for key in keys for value in values]
+    return keys
+
+
+def budget_value(item: Dict[str, Any]) -> float:
+    budget = item.get("budget")
+    if isinstance(budget, (int, float)) and not isinstance(budget, bool):
+        return float(budget)
+    return math.nan
+
+
+def compute_project_stats(
+    items: Iterable[Dict[str, Any]],
+    fields: Sequence[str],
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    use_numpy: bool = np is not None
+) -> List[BudgetStats]:
+    """Count and summarise budgets per group, largest groups first"""
+    # Columnar layout: one group code and one budget per (project, group) row
+    codes: Dict[Tuple[Optional[str], ...], int] = {}
+    if any(name in MULTI_VALUED_FIELDS for name in fields):
+        row_codes: List[int] = []
+        budgets: List[float] = []
+        for item in items:
+            budget = budget_value(item)
+            for key in group_keys(item, fields):
+                row_codes.append(codes.setdefault(key, len(codes)))
+                budgets.append(budget)
+    else:
+        items = list(items)
+        budgets = [budget_value(item) for item in items]
+        row_codes = [
+            codes.setdefault(key, len(codes))
+            for key in (tuple([item.get(name) for name in fields]) for item in items)
+        ]
+
+    return summarize_groups(list(codes), row_codes, budgets, percentiles, use_numpy)
+
+
+def summarize_groups(
+    keys: List[Tuple[Optional[str], ...]],
+    row_codes: Sequence[int],
+    budgets: Sequence[float],
+    percentiles: Sequence[float],
+    use_numpy: bool = np is not None
+) -> List[BudgetStats]:
+    """Summarise budget columns where row_codes index into keys, largest groups first"""
+    for percentile in percentiles:
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"Percentile {percentile} must be between 0 and 100")
+
+    summarize = _summarize_numpy if use_numpy else _summarize_python
+    stats = [
+        BudgetStats(key, *summary)
+        for key, summary in zip(keys, summarize(row_codes, budgets, len(keys), percentiles))
+    ]
+    stats.sort(key=lambda group: (-group.count, [value or "" for value in group.key]))
+    return stats
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Linear interpolation between closest ranks, like numpy.percentile"""
+    rank = (len(values) - 1) * percentile / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def _summary(count: int, values: List[float], total: float, percentiles: Sequence[float]) -> tuple:
+    if not values:
+        return count, 0, 0.0, None, None, None, []
+    return (
+        count, len(values), total, total / len(values), values[0], values[-1],
+        [(percentile, _percentile(values, percentile)) for percentile in percentiles]
+    )
+
+
+def _summarize_python(codes: Sequence[int], budgets: Sequence[float], group_count: int, percentiles: Sequence[float]) -> List[tuple]:
+    counts = [0] * group_count
+    groups: List[List[float]] = [[] for _ in range(group_count)]
+    for code, budget in zip(codes, budgets):
+        counts[code] += 1
+        if not math.isnan(budget):
+            groups[code].append(budget)
+
+    summaries = []
+    for count, values in zip(counts, groups):
+        values.sort()
+        summaries.append(_summary(count, values, math.fsum(values), percentiles))
+    return summaries
+
+
+def _summarize_numpy(codes: Sequence[int], budgets: Sequence[float], group_count: int, percentiles: Sequence[float]) -> List[tuple]:
+    codes = np.asarray(codes, dtype=np.intp)
+    budgets = np.asarray(budgets, dtype=np.float64)
+    counts = np.bincount(codes, minlength=group_count)
+
+    # Sort budgets by (group, value) so every group is a sorted slice
+    valid = ~np.isnan(budgets)
+    codes, values = codes[valid], budgets[valid]
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+
+    sizes = np.bincount(codes, minlength=group_count)
+    sums = np.bincount(codes, weights=values, minlength=group_count)
+    starts = np.cumsum(sizes) - sizes
+
+    if values.size:
+        # Percentile ranks of every group at once, shape (groups, percentiles)
+        last = max(values.size - 1, 0)
+        ranks = np.maximum(sizes - 1, 0)[:, None] * (np.asarray(percentiles, dtype=np.float64) / 100)[None, :]
+        low = np.floor(ranks).astype(np.intp)
+        high = np.ceil(ranks).astype(np.intp)
+        low_values = values[np.minimum(starts[:, None] + low, last)]
+        high_values = values[np.minimum(starts[:, None] + high, last)]
+        points = (low_values + (high_values - low_values) * (ranks - low)).tolist()
+        minimums = values[np.minimum(starts, last)].tolist()
+        maximums = values[np.minimum(starts + np.maximum(sizes - 1, 0), last)].tolist()
+
+    summaries = []
+    for code, (count, size, total) in enumerate(zip(counts.tolist(), sizes.tolist(), sums.tolist())):
+        if not size:
+            summaries.append(_summary(count, [], 0.0, percentiles))
+            continue
+        summaries.append((
+            count, size, total, total / size, minimums[code], maximums[code],
+            list(zip(percentiles, points[code]))
+        ))
+    return summaries
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from decouple import config
+
+# Tombstones expire through the container TTL; clients that last synced
+# before that window must refetch everything
+TOMBSTONE_TTL_DAYS = config('TOMBSTONE_TTL_DAYS', default=30, cast=int)
+
+# Composite index needed by the ORDER BY of the delta-sync queries
+UPDATED_AT_COMPOSITE_INDEX = [
+    {"path": "/updated_at", "order": "ascending"},
+    {"path": "/id", "order": "ascending"},
+]
+
+
+def to_timestamp(value: datetime) -> str:
+    """Format a datetime like the stored `updated_at` values (UTC ISO 8601)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def build_changes_query(since: datetime, after: Optional[Tuple[str, str]], limit: int) -> Tuple[str, List[Dict[str, Any]]]:
+    """Range query over `updated_at`, resuming after an (updated_at, id) key"""
+    if after:
+        where_clause = "(c.updated_at > @after_ts OR (c.updated_at = @after_ts AND c.id > @after_id))"
+        parameters = [
+            {"name": "@after_ts", "value": after[0]},
+            {"name": "@after_id", "value": after[1]},
+        ]
+    else:
+        where_clause = "c.updated_at > @since"
+        parameters = [{"name": "@since", "value": to_timestamp(since)}]
+
+    query = f"SELECT * FROM c WHERE {where_clause} ORDER BY c.updated_at ASC, c.id ASC OFFSET 0 LIMIT {limit}"
+    return query, parameters
+
+
+def change_key(item: Dict[str, Any]) -> Tuple[str, str]:
+    return item["updated_at"], item["id"]
+
+
+def merge_changes(
+    upserts: List[Dict[str, Any]],
+    tombstones: List[Dict[str, Any]],
+    first: int
+) -> Tuple[List[Tuple[Dict[str, Any], bool]], bool]:
+    """Merge two `updated_at` ordered pages into one
+
+    Returns up to `first` (item, deleted) pairs and whether more changes follow.
+    """
+    changes = [(item, False) for item in upserts] + [(item, True) for item in tombstones]
+    changes.sort(key=lambda change: change_key(change[0]))
+    return changes[:first], len(changes) > first
+
+
+def make_tombstone(project_id: str, item_id: str, owner_id: str, deleted_at: Optional[datetime] = None) -> Dict[str, Any]:
+    """Lightweight record of a deleted project, kept for TOMBSTONE_TTL_DAYS"""
+    timestamp = to_timestamp(deleted_at or datetime.now(timezone.utc))
+    return {
+        "id": item_id,
+        "project_id": project_id,
+        "owner_id": owner_id,
+        "updated_at": timestamp,
+        "deleted_at": timestamp,
+    }
+
+
+def requires_full_resync(since: datetime, now: Optional[datetime] = None) -> bool:
+    """True when `since` is older than the tombstone retention window"""
+    now = now or datetime.now(timezone.utc)
+    return to_timestamp(since) < to_timestamp(now - timedelta(days=TOMBSTONE_TTL_DAYS))
@@ -0,0 +1,217 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+from decouple import config
+import logging
+
+from azure.cosmos import ConnectionRetryPolicy
+from azure.cosmos._retry_options import RetryOptions
+from azure.cosmos.documents import ConnectionPolicy
+from azure.cosmos.exceptions import CosmosHttpResponseError
+
+logger = logging.getLogger(__name__)
+
+# Client-side throttling configuration
+COSMOS_THROTTLE_ENABLED = config('COSMOS_THROTTLE_ENABLED', default=True, cast=bool)
+# Most concurrent calls per budget; the adaptive limit moves between 1 and these
+COSMOS_READ_CONCURRENCY = config('COSMOS_READ_CONCURRENCY', default=32, cast=int)
+COSMOS_WRITE_CONCURRENCY = config('COSMOS_WRITE_CONCURRENCY', default=8, cast=int)
+# Seconds a call may spend queueing and retrying 429s before the error is raised
+COSMOS_RETRY_DEADLINE = config('COSMOS_RETRY_DEADLINE', default=5.0, cast=float)
+COSMOS_RETRY_BASE_DELAY = config('COSMOS_RETRY_BASE_DELAY', default=0.05, cast=float)
+COSMOS_RETRY_MAX_DELAY = config('COSMOS_RETRY_MAX_DELAY', default=1.0, cast=float)
+# The SDK's own 429 retries, kept short so the deadline above is what bounds a call.
+# Connection and read retries are separate and keep the SDK defaults
+COSMOS_SDK_RETRY_TOTAL = config('COSMOS_SDK_RETRY_TOTAL', default=1, cast=int)
+COSMOS_SDK_RETRY_BACKOFF_MAX = config('COSMOS_SDK_RETRY_BACKOFF_MAX', default=1, cast=int)
+
+READ = "read"
+WRITE = "write"
+
+TOO_MANY_REQUESTS = 429
+RETRY_AFTER_HEADER = "x-ms-retry-after-ms"
+
+# One halving per burst: further 429s within this many seconds don't shrink the limit again
+DECREASE_COOLDOWN = 1.0
+
+
+def retry_after_seconds(error: CosmosHttpResponseError) -> float:
+    """Server requested wait of a 429, 0 when absent"""
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return max(float(headers.get(RETRY_AFTER_HEADER, 0)) / 1000, 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def retry_delay(
+    attempt: int,
+    retry_after: float,
+    base_delay: float = COSMOS_RETRY_BASE_DELAY,
+    max_delay: float = COSMOS_RETRY_MAX_DELAY,
+    rng: Callable[[], float] = random.random
+) -> float:
+    """Wait at least the server's retry-after, plus full-jitter exponential backoff"""
+    return retry_after + rng() * min(max_delay, base_delay * (2 ** attempt))
+
+
+def sdk_connection_policy() -> ConnectionPolicy:
+    """Cosmos client policy with short 429 retries and default transport retries
+
+    The client's `retry_total` and `retry_backoff_max` arguments would also
+    cap retries of failed connections and reads, so only the throttling
+    options are set and the transport retry policy is given explicitly.
+    """
+    policy = ConnectionPolicy()
+    policy.RetryOptions = RetryOptions(
+        max_retry_attempt_count=COSMOS_SDK_RETRY_TOTAL,
+        max_wait_time_in_seconds=COSMOS_SDK_RETRY_BACKOFF_MAX
+    )
+    # Same as the client builds when no retry arguments are passed
+    policy.ConnectionRetryConfiguration = ConnectionRetryPolicy(retry_on_status_codes=[], retry_backoff_factor=0.8)
+    return policy
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that halves when throttled and grows back while calls succeed (AIMD)
+
+    The limit grows by about one per `limit` successes, so recovery takes a
+    few round trips' worth of calls rather than a fixed time.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        min_limit: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.max_limit = max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self.clock = clock
+        self._last_decrease = float("-inf")
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: Optional[float] = None):
+        """Take a slot, raising asyncio.TimeoutError if none frees up within `timeout`"""
+        if self.in_flight < self.capacity and not self._waiters:
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as we gave up, hand it on
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self):
+        if self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._wake()
+
+    def on_throttle(self):
+        now = self.clock()
+        if now - self._last_decrease < DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit / 2)
+        logger.warning(f"Cosmos DB {self.name} calls throttled, concurrency limit lowered to {self.capacity}")
+
+    def _wake(self):
+        while self._waiters and self.in_flight < self.capacity:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class CosmosThrottle:
+    """Runs blocking container calls under separate read and write concurrency budgets
+
+    429 responses shrink the budget of their kind and are retried after the
+    server's retry-after plus jitter, until the call's deadline. Other errors
+    pass straight through.
+    """
+
+    def __init__(
+        self,
+        read_limit: int = COSMOS_READ_CONCURRENCY,
+        write_limit: int = COSMOS_WRITE_CONCURRENCY,
+        deadline: float = COSMOS_RETRY_DEADLINE,
+        enabled: bool = COSMOS_THROTTLE_ENABLED,
+        delay: Callable[[int, float], float] = retry_delay
+    ):
+        self.limiters: Dict[str, AdaptiveLimiter] = {
+            READ: AdaptiveLimiter(READ, read_limit),
+            WRITE: AdaptiveLimiter(WRITE, write_limit),
+        }
+        self.deadline = deadline
+        self.enabled = enabled
+        self.delay = delay
+        self.throttled = 0  # 429 responses seen
+        self.rejected = 0  # calls that ran out of time
+
+    async def call(self, kind: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        if not self.enabled:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+        limiter = self.limiters[kind]
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            try:
+                await limiter.acquire(max(deadline - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise CosmosHttpResponseError(
+                    status_code=TOO_MANY_REQUESTS,
+                    message=f"Cosmos DB {kind} budget exhausted, no slot within {self.deadline}s"
+                )
+
+            try:
+                result = await asyncio.to_thread(func, *args, **kwargs)
+            except CosmosHttpResponseError as e:
+                if e.status_code != TOO_MANY_REQUESTS:
+                    raise
+                self.throttled += 1
+                limiter.on_throttle()
+                wait = self.delay(attempt, retry_after_seconds(e))
+                if time.monotonic() + wait > deadline:
+                    self.rejected += 1
+                    raise
+            else:
+                limiter.on_success()
+                return result
+            finally:
+                limiter.release()
+
+            attempt += 1
+            await asyncio.sleep(wait)
+
+
+# Global throttle shared by every container call in the process
+cosmos_throttle = CosmosThrottle()
@@ -0,0 +1,19 @@
+from .deadline import DeadlineExtension
+from .metrics import MetricsExtension
+from .query_cost import QueryCostAnalyzer, QueryCostLimiter
+from .response_cache import ResponseCache, ResponseCacheExtension, response_cache
+from .single_flight import SingleFlightExtension, query_flights
+from .stale_reads import StaleReadExtension
+
+__all__ = [
+    "DeadlineExtension",
+    "MetricsExtension",
+    "QueryCostAnalyzer",
+    "QueryCostLimiter",
+    "ResponseCache",
+    "ResponseCacheExtension",
+    "response_cache",
+    "SingleFlightExtension",
+    "query_flights",
+    "StaleReadExtension"
+]
@@ -0,0 +1,29 @@
+from strawberry.extensions import SchemaExtension
+
+from app.utils.deadline import DEADLINE_CONTEXT_KEY, current_deadline
+
+
+class DeadlineExtension(SchemaExtension):
+    """Make the request deadline from the GraphQL context visible to the data layer
+
+    Data-layer calls read it through `current_deadline`, so resolvers don't
+    have to pass it along. Calls still running when it passes are cancelled
+    and their fields resolve to errors, while fields already resolved are
+    returned as partial data.
+    """
+
+    def __init__(self, *, execution_context=None):
+        self.execution_context = execution_context
+
+    def on_execute(self):
+        context = self.execution_context.context
+        deadline = context.get(DEADLINE_CONTEXT_KEY) if isinstance(context, dict) else None
+        if deadline is None:
+            yield
+            return
+
+        token = current_deadline.set(deadline)
+        try:
+            yield
+        finally:
+            current_deadline.reset(token)
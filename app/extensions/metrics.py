@@ -0,0 +1,38 @@
+import time
+from inspect import isawaitable
+
+from strawberry.extensions import SchemaExtension
+
+from app.utils.metrics import resolver_duration, tag_operation
+
+
+class MetricsExtension(SchemaExtension):
+    """Label request latency with the operation name and time async resolvers by field
+
+    Listed first so resolver timings include the work of the other
+    extensions. Synchronous resolvers only read attributes of their parent
+    and are not timed, which keeps the per-field overhead to one check.
+    """
+
+    def __init__(self, *, execution_context=None):
+        self.execution_context = execution_context
+
+    def on_execute(self):
+        context = self.execution_context.context
+        request = context.get("request") if isinstance(context, dict) else None
+        if request is not None:
+            tag_operation(request.scope, self.execution_context.operation_name)
+        yield
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        result = _next(root, info, *args, **kwargs)
+        if isawaitable(result):
+            return self._timed(result, f"{info.parent_type.name}.{info.field_name}", time.perf_counter())
+        return result
+
+    @staticmethod
+    async def _timed(awaitable, field: str, started: float):
+        try:
+            return await awaitable
+        finally:
+            resolver_duration.observe(time.perf_counter() - started, field)
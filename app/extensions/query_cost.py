@@ -0,0 +1,292 @@
+from typing import Any, Dict, List, Optional, Tuple
+from graphql import (
+    GraphQLError,
+    GraphQLObjectType,
+    GraphQLSchema,
+    get_named_type,
+    is_leaf_type,
+    is_list_type,
+    is_non_null_type,
+    value_from_ast_untyped,
+)
+from graphql.language import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+)
+from graphql.utilities import get_operation_ast
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.execute import validate_document
+from decouple import config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Query cost configuration
+QUERY_MAX_COST = config('QUERY_MAX_COST', default=1000, cast=int)
+QUERY_MAX_DEPTH = config('QUERY_MAX_DEPTH', default=10, cast=int)
+QUERY_MAX_FIRST = config('QUERY_MAX_FIRST', default=100, cast=int)
+QUERY_DEFAULT_LIST_SIZE = config('QUERY_DEFAULT_LIST_SIZE', default=50, cast=int)
+QUERY_OWNER_COST = config('QUERY_OWNER_COST', default=5, cast=int)
+QUERY_COST_ENFORCE = config('QUERY_COST_ENFORCE', default=True, cast=bool)
+
+# Per-field costs keyed by "<ParentType>.<fieldName>". Fields not listed here
+# cost 1 when they return an object and 0 when they return a scalar or enum.
+FIELD_COSTS: Dict[str, int] = {
+    "Project.owner": QUERY_OWNER_COST,  # one user lookup per project node
+}
+
+# Argument that carries the page size of paginated fields
+PAGE_SIZE_ARGUMENT = "first"
+# Argument of batch lookups, one result per id
+IDS_ARGUMENT = "ids"
+
+
+class QueryCostAnalyzer:
+    """Compute the cost and depth of an operation against a schema"""
+
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        document: DocumentNode,
+        variables: Optional[Dict[str, Any]] = None,
+        max_first: int = QUERY_MAX_FIRST,
+        default_list_size: int = QUERY_DEFAULT_LIST_SIZE,
+        field_costs: Optional[Dict[str, int]] = None,
+    ):
+        self.schema = schema
+        self.document = document
+        self.variables = variables or {}
+        self.max_first = max_first
+        self.default_list_size = default_list_size
+        self.field_costs = FIELD_COSTS if field_costs is None else field_costs
+        self.errors: List[GraphQLError] = []
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+
+    def analyze(self, operation_name: Optional[str] = None) -> Tuple[int, int]:
+        """Return (cost, depth) for the selected operation"""
+        operation = get_operation_ast(self.document, operation_name)
+        if operation is None:
+            return 0, 0
+
+        root_type = self.schema.get_root_type(operation.operation)
+        if root_type is None:
+            return 0, 0
+
+        variables = self._coerce_variable_defaults(operation)
+        return self._selection_set_cost(operation.selection_set, root_type, variables, set(), False)
+
+    def _coerce_variable_defaults(self, operation: OperationDefinitionNode) -> Dict[str, Any]:
+        """Merge operation variable defaults with the provided variables"""
+        variables = {}
+        for definition in operation.variable_definitions or []:
+            name = definition.variable.name.value
+            if definition.default_value is not None:
+                variables[name] = value_from_ast_untyped(definition.default_value)
+        variables.update(self.variables)
+        return variables
+
+    def _selection_set_cost(
+        self,
+        selection_set: SelectionSetNode,
+        parent_type: GraphQLObjectType,
+        variables: Dict[str, Any],
+        visited_fragments: set,
+        paged: bool,
+    ) -> Tuple[int, int]:
+        cost = 0
+        depth = 0
+
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                field_cost, field_depth = self._field_cost(
+                    selection, parent_type, variables, visited_fragments, paged
+                )
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition:
+                    fragment_type = self.schema.get_type(selection.type_condition.name.value) or parent_type
+                field_cost, field_depth = self._selection_set_cost(
+                    selection.selection_set, fragment_type, variables, visited_fragments, paged
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.fragments.get(name)
+                if fragment is None or name in visited_fragments:
+                    continue
+                fragment_type = self.schema.get_type(fragment.type_condition.name.value) or parent_type
+                field_cost, field_depth = self._selection_set_cost(
+                    fragment.selection_set, fragment_type, variables, visited_fragments | {name}, paged
+                )
+            else:
+                continue
+
+            cost += field_cost
+            depth = max(depth, field_depth)
+
+        return cost, depth
+
+    def _field_cost(
+        self,
+        node: FieldNode,
+        parent_type: GraphQLObjectType,
+        variables: Dict[str, Any],
+        visited_fragments: set,
+        paged: bool,
+    ) -> Tuple[int, int]:
+        name = node.name.value
+
+        # Introspection is served from the schema and never reaches Cosmos
+        if name.startswith("__"):
+            return 0, 0
+
+        fields = getattr(parent_type, "fields", {})
+        field_def = fields.get(name)
+        if field_def is None:
+            return 0, 0
+
+        named_type = get_named_type(field_def.type)
+        base_cost = self.field_costs.get(
+            f"{parent_type.name}.{name}",
+            0 if is_leaf_type(named_type) else 1
+        )
+
+        if not node.selection_set:
+            return base_cost, 1
+
+        # Paginated fields size the lists nested below them (connection edges)
+        is_paged = PAGE_SIZE_ARGUMENT in field_def.args
+        child_cost, child_depth = self._selection_set_cost(
+            node.selection_set, named_type, variables, visited_fragments, is_paged
+        )
+        size = self._list_size(node, field_def, variables, paged)
+        return base_cost + size * child_cost, child_depth + 1
+
+    def _list_size(self, node: FieldNode, field_def, variables: Dict[str, Any], paged: bool) -> int:
+        """Estimate how many times the children of a field are resolved"""
+        if PAGE_SIZE_ARGUMENT in field_def.args:
+            first = self._argument_value(node, PAGE_SIZE_ARGUMENT, variables)
+            if first is None:
+                first = field_def.args[PAGE_SIZE_ARGUMENT].default_value
+            if not isinstance(first, int):
+                first = self.default_list_size
+
+            if first < 0 or first > self.max_first:
+                self.errors.append(GraphQLError(
+                    f"Argument '{PAGE_SIZE_ARGUMENT}' on field '{node.name.value}' must be "
+                    f"between 0 and {self.max_first}, got {first}",
+                    nodes=[node],
+                    extensions={"code": "PAGE_SIZE_EXCEEDED", "maxFirst": self.max_first}
+                ))
+            return max(first, 0)
+
+        if IDS_ARGUMENT in field_def.args:
+            ids = self._argument_value(node, IDS_ARGUMENT, variables)
+            if isinstance(ids, list):
+                return len(ids)
+
+        field_type = field_def.type
+        if is_non_null_type(field_type):
+            field_type = field_type.of_type
+        if is_list_type(field_type) and not paged:
+            return self.default_list_size
+
+        return 1
+
+    @staticmethod
+    def _argument_value(node: FieldNode, name: str, variables: Dict[str, Any]) -> Any:
+        for argument in node.arguments or []:
+            if argument.name.value == name:
+                return value_from_ast_untyped(argument.value, variables)
+        return None
+
+
+class QueryCostLimiter(SchemaExtension):
+    """Reject operations that exceed the configured cost, depth or page size
+
+    The computed cost is reported in the response ``extensions`` so clients
+    can see how close they are to the budget.
+    """
+
+    max_cost = QUERY_MAX_COST
+    max_depth = QUERY_MAX_DEPTH
+    max_first = QUERY_MAX_FIRST
+    enforce = QUERY_COST_ENFORCE
+
+    def __init__(self, *, execution_context=None):
+        self.execution_context = execution_context
+        self.cost: Optional[int] = None
+        self.depth: Optional[int] = None
+
+    def on_validate(self):
+        execution_context = self.execution_context
+
+        # Run the standard validation first, cost analysis assumes a valid document
+        errors = validate_document(
+            execution_context.schema._schema,
+            execution_context.graphql_document,
+            execution_context.validation_rules,
+        )
+
+        if not errors:
+            errors = self.check_cost()
+
+        execution_context.errors = errors
+        yield
+
+    def check_cost(self) -> List[GraphQLError]:
+        """Analyze the current operation and return any limit violations"""
+        execution_context = self.execution_context
+        analyzer = QueryCostAnalyzer(
+            execution_context.schema._schema,
+            execution_context.graphql_document,
+            variables=execution_context.variables,
+            max_first=self.max_first,
+        )
+        self.cost, self.depth = analyzer.analyze(execution_context.operation_name)
+
+        errors = list(analyzer.errors)
+        details = self.cost_details()
+
+        if self.depth > self.max_depth:
+            errors.append(GraphQLError(
+                f"Query depth {self.depth} exceeds the maximum allowed depth of {self.max_depth}",
+                extensions={"code": "MAX_DEPTH_EXCEEDED", "cost": details}
+            ))
+
+        if self.cost > self.max_cost:
+            errors.append(GraphQLError(
+                f"Query cost {self.cost} exceeds the maximum allowed cost of {self.max_cost}",
+                extensions={"code": "MAX_COST_EXCEEDED", "cost": details}
+            ))
+
+        if errors:
+            logger.warning(
+                f"Query limits exceeded for operation {execution_context.operation_name}: "
+                f"cost={self.cost}, depth={self.depth}"
+            )
+            if not self.enforce:
+                return []
+
+        return errors
+
+    def cost_details(self) -> Dict[str, int]:
+        return {
+            "requestedQueryCost": self.cost,
+            "maximumAvailable": self.max_cost,
+            "depth": self.depth,
+            "maximumDepth": self.max_depth,
+        }
+
+    def get_results(self) -> Dict[str, Any]:
+        if self.cost is None:
+            return {}
+        return {"cost": self.cost_details()}
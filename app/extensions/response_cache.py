@@ -0,0 +1,322 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from inspect import isawaitable
+from typing import Any, Dict, Iterable, Optional, Set
+from graphql import ExecutionResult, get_named_type
+from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+from decouple import config
+import logging
+
+from app.extensions.stale_reads import is_stale_result
+from app.extensions.utils import iter_selected_fields, resolve_auth_scope
+from app.incremental import get_publisher
+
+logger = logging.getLogger(__name__)
+
+# Response cache configuration
+RESPONSE_CACHE_ENABLED = config('RESPONSE_CACHE_ENABLED', default=True, cast=bool)
+RESPONSE_CACHE_MAX_ENTRIES = config('RESPONSE_CACHE_MAX_ENTRIES', default=1000, cast=int)
+
+
+@dataclass(frozen=True)
+class CacheHint:
+    max_age: int  # seconds
+    private: bool = False  # cache per user instead of per auth scope
+
+
+# Cache hints keyed by "<ParentType>.<fieldName>". An operation is cached for
+# the smallest max_age of the fields it selects, and only if every root field
+# has a hint.
+CACHE_HINTS: Dict[str, CacheHint] = {
+    "Query.projects": CacheHint(max_age=30),
+    "Query.project": CacheHint(max_age=30),
+    "Query.projectsByIds": CacheHint(max_age=30),
+    "Query.projectStats": CacheHint(max_age=300),  # dropped by any project write
+    "Query.users": CacheHint(max_age=60),
+    "Query.user": CacheHint(max_age=60),
+    "Query.usersByIds": CacheHint(max_age=60),
+    "Query.me": CacheHint(max_age=60, private=True),
+    "Project.owner": CacheHint(max_age=60),
+}
+
+# Types whose instances are tagged by id so writes can invalidate them
+ENTITY_TYPES = {"Project", "User"}
+
+# Root list fields tagged with a collection tag, invalidated by any write
+COLLECTION_FIELDS = {
+    "projects": "Project",
+    "projectStats": "Project",
+    "users": "User",
+}
+
+
+# Marks results shared by SingleFlightExtension; the leader already cached them with its tags
+COALESCED_KEY = "coalesced"
+
+
+def is_coalesced_result(result: Optional[Any]) -> bool:
+    return result is not None and bool((result.extensions or {}).get(COALESCED_KEY))
+
+
+def collection_tag(type_name: str) -> str:
+    return f"{type_name}:*"
+
+
+def entity_tag(type_name: str, entity_id: str) -> str:
+    return f"{type_name}:{entity_id}"
+
+
+def project_tags(*ids: Optional[str]) -> Set[str]:
+    """Tags touched by a write to a project known by any of the given ids"""
+    tags = {collection_tag("Project")}
+    tags.update(entity_tag("Project", project_id) for project_id in ids if project_id)
+    return tags
+
+
+@dataclass
+class CacheEntry:
+    data: Dict[str, Any]
+    expires_at: float
+    tags: Set[str]
+
+
+class ResponseCache:
+    """In-process LRU cache of query results with tag based invalidation"""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, data: Dict[str, Any], ttl: float, tags: Iterable[str], version: int) -> bool:
+        """Store a result unless a write invalidated the cache since `version` was read"""
+        if version != self.version:
+            return False
+
+        if key in self._entries:
+            self._remove(key)
+
+        entry = CacheEntry(data=data, expires_at=time.monotonic() + ttl, tags=set(tags))
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+        return True
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of the tags, returns the number removed"""
+        self.version += 1
+
+        keys = set()
+        for tag in tags:
+            keys.update(self._tag_index.get(tag, ()))
+
+        for key in keys:
+            self._remove(key)
+
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cached responses")
+        return len(keys)
+
+    def clear(self):
+        self.version += 1
+        self._entries.clear()
+        self._tag_index.clear()
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global response cache instance
+response_cache = ResponseCache()
+
+
+def make_cache_key(query: str, variables: Optional[Dict[str, Any]], scope: str) -> str:
+    """Build a cache key from the document hash, variables and auth scope"""
+    document_hash = hashlib.sha256(query.encode()).hexdigest()
+    variables_json = json.dumps(variables or {}, sort_keys=True, default=str)
+    return f"{document_hash}:{hashlib.sha256(variables_json.encode()).hexdigest()}:{scope}"
+
+
+def make_operation_key(execution_context, scope: str) -> str:
+    return make_cache_key(
+        f"{execution_context.operation_name}:{execution_context.query}",
+        execution_context.variables,
+        scope
+    )
+
+
+def get_cache_policy(execution_context) -> Optional[CacheHint]:
+    """Combine the cache hints of the selected fields, None if not cacheable"""
+    max_age = None
+    private = False
+    for parent_type, field_name, is_root in iter_selected_fields(
+        execution_context.schema._schema,
+        execution_context.graphql_document,
+        execution_context.operation_name
+    ):
+        hint = CACHE_HINTS.get(f"{parent_type}.{field_name}")
+        if hint is None:
+            if is_root:
+                return None
+            continue
+        max_age = hint.max_age if max_age is None else min(max_age, hint.max_age)
+        private = private or hint.private
+
+    if not max_age:
+        return None
+    return CacheHint(max_age=max_age, private=private)
+
+
+class ResponseCacheExtension(SchemaExtension):
+    """Serve read-only operations from the response cache
+
+    Writes invalidate entries through `response_cache.invalidate` using the
+    entity tags collected while the cached result was resolved.
+    """
+
+    cache = response_cache
+    enabled = RESPONSE_CACHE_ENABLED
+
+    def __init__(self, *, execution_context=None):
+        self.execution_context = execution_context
+        self.key: Optional[str] = None
+        self.ttl = 0
+        self.hit = False
+        self.tags: Set[str] = set()
+
+    async def on_execute(self):
+        if not self.enabled or not await self._prepare():
+            yield
+            return
+
+        entry = self.cache.get(self.key)
+        if entry is not None:
+            self.hit = True
+            self.execution_context.result = ExecutionResult(data=entry.data, errors=None)
+            yield
+            return
+
+        version = self.cache.version
+        yield
+
+        # Responses still waiting for @defer/@stream payloads are incomplete
+        publisher = get_publisher(self.execution_context.context)
+        if publisher is not None and publisher.has_pending:
+            return
+
+        # Stale fallbacks served during an outage must not outlive it, and results
+        # shared by another request carry none of the tags collected here
+        result = self.execution_context.result
+        if (
+            result is not None
+            and not result.errors
+            and result.data is not None
+            and not is_stale_result(result)
+            and not is_coalesced_result(result)
+        ):
+            self.cache.set(self.key, result.data, self.ttl, self.tags, version)
+
+    async def _prepare(self) -> bool:
+        """Work out the TTL and key of the operation, False if it can't be cached"""
+        execution_context = self.execution_context
+        if execution_context.operation_type != OperationType.QUERY:
+            return False
+
+        policy = get_cache_policy(execution_context)
+        if policy is None:
+            return False
+
+        scope = await self.get_auth_scope(policy.private)
+        if scope is None:
+            return False
+
+        self.ttl = policy.max_age
+        self.key = make_operation_key(execution_context, scope)
+        return True
+
+    async def get_auth_scope(self, private: bool) -> Optional[str]:
+        return await resolve_auth_scope(self.execution_context.context, private)
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        result = _next(root, info, *args, **kwargs)
+        if self.key is None or self.hit:
+            return result
+
+        if isawaitable(result):
+            return self._tag_awaitable(result, info, kwargs)
+
+        self._collect_tags(result, info, kwargs)
+        return result
+
+    async def _tag_awaitable(self, awaitable, info, kwargs):
+        result = await awaitable
+        self._collect_tags(result, info, kwargs)
+        return result
+
+    def _collect_tags(self, result: Any, info, kwargs: Dict[str, Any]):
+        type_name = get_named_type(info.return_type).name
+        is_root = info.parent_type.name == "Query"
+
+        if is_root and info.field_name in COLLECTION_FIELDS:
+            self.tags.add(collection_tag(COLLECTION_FIELDS[info.field_name]))
+
+        if type_name not in ENTITY_TYPES:
+            return
+
+        # Tag the requested ids too so that a cached miss is dropped on create
+        if is_root and kwargs.get("id"):
+            self.tags.add(entity_tag(type_name, kwargs["id"]))
+        if is_root and kwargs.get("ids"):
+            self.tags.update(entity_tag(type_name, item_id) for item_id in kwargs["ids"])
+
+        items = result if isinstance(result, list) else [result]
+        for item in items:
+            if item is None:
+                continue
+            for attribute in ("id", "project_id"):
+                value = getattr(item, attribute, None)
+                if value:
+                    self.tags.add(entity_tag(type_name, value))
+
+    def get_results(self) -> Dict[str, Any]:
+        if self.key is None:
+            return {}
+        return {"responseCache": {"hit": self.hit, "maxAge": self.ttl}}
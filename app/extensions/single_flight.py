@@ -0,0 +1,90 @@
+from typing import Optional
+from graphql import ExecutionResult
+from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+from decouple import config
+import logging
+
+from app.extensions.response_cache import COALESCED_KEY, get_cache_policy, make_operation_key
+from app.extensions.utils import resolve_auth_scope
+from app.incremental import get_publisher
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+SINGLE_FLIGHT_ENABLED = config('SINGLE_FLIGHT_ENABLED', default=True, cast=bool)
+
+# Global group of in-flight query executions
+query_flights = SingleFlight()
+
+
+class SingleFlightExtension(SchemaExtension):
+    """Share one execution between identical concurrent query operations
+
+    Operations are identical when their document, variables and auth scope
+    match. Waiters receive the leader's result; if the leader fails without a
+    result they fall back to executing on their own.
+    """
+
+    flights = query_flights
+    enabled = SINGLE_FLIGHT_ENABLED
+
+    def __init__(self, *, execution_context=None):
+        self.execution_context = execution_context
+        self.coalesced = False
+
+    async def on_execute(self):
+        execution_context = self.execution_context
+
+        # Already answered, e.g. by the response cache. Incremental results are
+        # split over several payloads and can't be handed to other requests
+        if (
+            not self.enabled
+            or execution_context.result is not None
+            or get_publisher(execution_context.context) is not None
+        ):
+            yield
+            return
+
+        key = await self._get_key()
+        if key is None:
+            yield
+            return
+
+        future, is_leader = self.flights.begin(key)
+
+        if not is_leader:
+            shared_result = await self.flights.wait(future)
+            if shared_result is not None:
+                self.coalesced = True
+                # A copy flagged as shared, so the response cache doesn't store it again without tags
+                execution_context.result = ExecutionResult(
+                    data=shared_result.data,
+                    errors=shared_result.errors,
+                    extensions={**(shared_result.extensions or {}), COALESCED_KEY: True}
+                )
+            yield
+            return
+
+        try:
+            yield
+        finally:
+            self.flights.finish(key, future, result=execution_context.result)
+
+    async def _get_key(self) -> Optional[str]:
+        execution_context = self.execution_context
+        if execution_context.operation_type != OperationType.QUERY:
+            return None
+
+        # Operations without cache hints are keyed per user to stay on the safe side
+        policy = get_cache_policy(execution_context)
+        private = policy.private if policy is not None else True
+
+        scope = await self.get_auth_scope(private)
+        if scope is None:
+            return None
+
+        return make_operation_key(execution_context, scope)
+
+    async def get_auth_scope(self, private: bool) -> Optional[str]:
+        return await resolve_auth_scope(self.execution_context.context, private)
@@ -0,0 +1,43 @@
+from typing import Any, Dict, Optional
+
+from strawberry.extensions import SchemaExtension
+
+from app.database.circuit_breaker import StaleReads, stale_reads
+
+STALE_KEY = "stale"
+
+
+def is_stale_result(result: Optional[Any]) -> bool:
+    """Whether an execution result was tagged as answered from stale data"""
+    return result is not None and bool((result.extensions or {}).get(STALE_KEY))
+
+
+class StaleReadExtension(SchemaExtension):
+    """Flag responses answered from last known good data with ``extensions.stale``
+
+    Listed before ResponseCacheExtension and SingleFlightExtension: hooks exit
+    in list order, so the result is tagged before the response cache looks at
+    it and before it is shared with coalesced requests. Strawberry builds the
+    response extensions itself, so the tag on the execution result never
+    reaches clients directly.
+    """
+
+    def __init__(self, *, execution_context=None):
+        self.execution_context = execution_context
+        self.stale = False
+
+    async def on_execute(self):
+        marker = StaleReads()
+        token = stale_reads.set(marker)
+        try:
+            yield
+        finally:
+            stale_reads.reset(token)
+
+        result = self.execution_context.result
+        self.stale = marker.served or is_stale_result(result)
+        if self.stale and result is not None:
+            result.extensions = {**(result.extensions or {}), STALE_KEY: True}
+
+    def get_results(self) -> Dict[str, Any]:
+        return {STALE_KEY: True} if self.stale else {}
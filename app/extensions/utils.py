@@ -0,0 +1,84 @@
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+from graphql import GraphQLSchema, get_named_type
+from graphql.language import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    InlineFragmentNode,
+    SelectionSetNode,
+)
+from graphql.utilities import get_operation_ast
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def iter_selected_fields(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    operation_name: Optional[str] = None
+) -> Iterator[Tuple[str, str, bool]]:
+    """Yield (parent type name, field name, is root field) for every selected field"""
+    operation = get_operation_ast(document, operation_name)
+    if operation is None:
+        return
+
+    root_type = schema.get_root_type(operation.operation)
+    if root_type is None:
+        return
+
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+
+    def walk(selection_set: SelectionSetNode, parent_type, is_root: bool, visited: Set[str]):
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                name = selection.name.value
+                if name.startswith("__"):
+                    continue
+                field_def = getattr(parent_type, "fields", {}).get(name)
+                if field_def is None:
+                    continue
+                yield parent_type.name, name, is_root
+                if selection.selection_set:
+                    yield from walk(selection.selection_set, get_named_type(field_def.type), False, visited)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition:
+                    fragment_type = schema.get_type(selection.type_condition.name.value) or parent_type
+                yield from walk(selection.selection_set, fragment_type, is_root, visited)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = fragments.get(name)
+                if fragment is None or name in visited:
+                    continue
+                fragment_type = schema.get_type(fragment.type_condition.name.value) or parent_type
+                yield from walk(fragment.selection_set, fragment_type, is_root, visited | {name})
+
+    yield from walk(operation.selection_set, root_type, True, set())
+
+
+async def resolve_auth_scope(context: Dict[str, Any], private: bool = False) -> Optional[str]:
+    """Authenticate the request and describe what it is allowed to see
+
+    Returns None for unauthenticated requests. Private scopes are per user,
+    shared scopes group callers with the same tenant, roles and scopes.
+    """
+    from app.auth.azure_ad import get_context_user
+
+    try:
+        user = await get_context_user(context)
+    except Exception as e:
+        logger.debug(f"Could not resolve auth scope: {e}")
+        return None
+
+    if private:
+        return f"user:{user.get('id')}"
+
+    roles = ",".join(sorted(user.get("roles") or []))
+    scopes = ",".join(sorted(user.get("scopes") or []))
+    return f"tenant:{user.get('tenant_id')}:roles:{roles}:scopes:{scopes}"
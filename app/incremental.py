@@ -0,0 +1,332 @@
+import asyncio
+import copy
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import strawberry
+from graphql import (
+    DirectiveLocation,
+    GraphQLArgument,
+    GraphQLBoolean,
+    GraphQLDirective,
+    GraphQLError,
+    GraphQLInt,
+    GraphQLNonNull,
+    GraphQLString,
+    OperationType,
+    get_named_type,
+    is_non_null_type,
+    located_error,
+    print_schema,
+)
+from graphql.execution import ExecutionContext
+from graphql.execution.collect_fields import (
+    does_fragment_condition_match,
+    get_field_entry_key,
+    should_include_node,
+)
+from graphql.execution.execute import CollectedErrors
+from graphql.execution.values import get_directive_values
+from graphql.language import FieldNode, InlineFragmentNode
+from graphql.pyutils import Path, is_iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+# GraphQL context key holding the request's IncrementalPublisher
+PUBLISHER_CONTEXT_KEY = "incremental"
+
+DeferDirective = GraphQLDirective(
+    name="defer",
+    locations=[DirectiveLocation.FRAGMENT_SPREAD, DirectiveLocation.INLINE_FRAGMENT],
+    args={
+        "if": GraphQLArgument(GraphQLNonNull(GraphQLBoolean), default_value=True),
+        "label": GraphQLArgument(GraphQLString),
+    },
+    description="Deliver the fragment in a later payload of a multipart response",
+)
+
+StreamDirective = GraphQLDirective(
+    name="stream",
+    locations=[DirectiveLocation.FIELD],
+    args={
+        "if": GraphQLArgument(GraphQLNonNull(GraphQLBoolean), default_value=True),
+        "label": GraphQLArgument(GraphQLString),
+        "initialCount": GraphQLArgument(GraphQLNonNull(GraphQLInt), default_value=0),
+    },
+    description="Deliver list items after the first `initialCount` in later payloads",
+)
+
+DeferredFragment = Tuple[Optional[str], Dict[str, List[FieldNode]]]
+
+
+class _Record:
+    """A deferred fragment or streamed item that will be sent in a later payload"""
+
+    __slots__ = ("label", "path", "parent", "previous", "task")
+
+    def __init__(self, label: Optional[str], path: Optional[Path], parent, previous):
+        self.label = label
+        self.path = path
+        self.parent = parent
+        self.previous = previous
+        self.task: Optional[asyncio.Task] = None
+
+
+class IncrementalPublisher:
+    """Collects @defer/@stream work started during execution and yields the later payloads
+
+    Records start running as soon as execution reaches them. A record is only
+    delivered after the payload holding its parent and, for streams, after the
+    previous item.
+    """
+
+    def __init__(self):
+        self._pending: List[_Record] = []
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def add(
+        self,
+        label: Optional[str],
+        path: Optional[Path],
+        run: Callable[[_Record], Awaitable[Dict[str, Any]]],
+        parent: Optional[_Record] = None,
+        previous: Optional[_Record] = None
+    ) -> _Record:
+        record = _Record(label, path, parent, previous)
+        record.task = asyncio.ensure_future(self._complete(record, run))
+        self._pending.append(record)
+        return record
+
+    async def _complete(self, record: _Record, run) -> Dict[str, Any]:
+        entry = await run(record)
+        for dependency in (record.parent, record.previous):
+            if dependency is not None:
+                await asyncio.wait([dependency.task])
+        return entry
+
+    async def subsequent_payloads(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield `{"incremental": [...], "hasNext": ...}` payloads until all records are sent"""
+        while self._pending:
+            await asyncio.wait([record.task for record in self._pending], return_when=asyncio.FIRST_COMPLETED)
+            done = [record for record in self._pending if record.task.done()]
+            self._pending = [record for record in self._pending if not record.task.done()]
+            yield {
+                "incremental": [record.task.result() for record in done],
+                "hasNext": bool(self._pending)
+            }
+
+    def cancel(self):
+        """Stop outstanding work, e.g. when the client disconnects"""
+        for record in self._pending:
+            record.task.cancel()
+        self._pending = []
+
+
+def get_publisher(context: Any) -> Optional[IncrementalPublisher]:
+    """The publisher of a GraphQL context, None when incremental delivery is off"""
+    if isinstance(context, dict):
+        return context.get(PUBLISHER_CONTEXT_KEY)
+    return None
+
+
+class IncrementalExecutionContext(ExecutionContext):
+    """Execution context that moves @defer fragments and @stream items to later payloads
+
+    Without a publisher in the GraphQL context (the client did not accept a
+    multipart response, batched operations, mutations) the directives are
+    ignored and everything is returned in the initial result.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        publisher = get_publisher(self.context_value)
+        self.publisher = publisher if self.operation.operation == OperationType.QUERY else None
+        self.parent_record: Optional[_Record] = None
+        self._incremental_fields_cache: Dict[Tuple, Tuple[Dict[str, List[FieldNode]], List[DeferredFragment]]] = {}
+
+    def execute_operation(self, operation, root_value):
+        if self.publisher is None:
+            return super().execute_operation(operation, root_value)
+
+        root_type = self.schema.query_type
+        fields, deferred = self.collect_incremental_fields(root_type, [operation.selection_set])
+        self.defer_fragments(root_type, root_value, None, deferred)
+        return self.execute_fields(root_type, root_value, None, fields)
+
+    def collect_subfields(self, return_type, field_nodes):
+        if self.publisher is None:
+            return super().collect_subfields(return_type, field_nodes)
+        return self._collect_subfields(return_type, field_nodes)[0]
+
+    def complete_object_value(self, return_type, field_nodes, info, path, result):
+        if self.publisher is not None:
+            deferred = self._collect_subfields(return_type, field_nodes)[1]
+            if deferred:
+                self.defer_fragments(return_type, result, path, deferred)
+        return super().complete_object_value(return_type, field_nodes, info, path, result)
+
+    def complete_list_value(self, return_type, field_nodes, info, path, result):
+        """Complete the first `initialCount` items now and the rest as stream records
+
+        The resolver's list is already fetched in full, so streaming only
+        defers completing each item's selection (e.g. owner lookups); the
+        first payload does not arrive before the whole list was read.
+        """
+        stream = self.get_stream_arguments(field_nodes)
+        if stream is None or not is_iterable(result):
+            return super().complete_list_value(return_type, field_nodes, info, path, result)
+
+        initial_count = stream["initialCount"]
+        if initial_count < 0:
+            raise GraphQLError("initialCount must be a positive integer", field_nodes)
+
+        items = list(result)
+        completed = super().complete_list_value(return_type, field_nodes, info, path, items[:initial_count])
+
+        previous = None
+        for index in range(initial_count, len(items)):
+            item_path = path.add_key(index, None)
+            previous = self.publisher.add(
+                stream.get("label"),
+                item_path,
+                self._fork(
+                    self._complete_stream_item, return_type.of_type, field_nodes, info, item_path, items[index]
+                ),
+                parent=self.parent_record,
+                previous=previous
+            )
+        return completed
+
+    def get_stream_arguments(self, field_nodes: List[FieldNode]) -> Optional[Dict[str, Any]]:
+        if self.publisher is None:
+            return None
+        stream = get_directive_values(StreamDirective, field_nodes[0], self.variable_values)
+        if not stream or not stream["if"]:
+            return None
+        return stream
+
+    def collect_incremental_fields(self, runtime_type, selection_sets) -> Tuple[Dict[str, List[FieldNode]], List[DeferredFragment]]:
+        """Like graphql-core's collect_fields, with @defer fragments split out"""
+        fields: Dict[str, List[FieldNode]] = {}
+        deferred: List[DeferredFragment] = []
+        visited = set()
+        for selection_set in selection_sets:
+            self._collect_fields_impl(runtime_type, selection_set, fields, deferred, visited)
+        return fields, deferred
+
+    def _collect_subfields(self, return_type, field_nodes):
+        key = (return_type, *map(id, field_nodes))
+        collected = self._incremental_fields_cache.get(key)
+        if collected is None:
+            collected = self.collect_incremental_fields(
+                return_type, [node.selection_set for node in field_nodes if node.selection_set]
+            )
+            self._incremental_fields_cache[key] = collected
+        return collected
+
+    def _collect_fields_impl(self, runtime_type, selection_set, fields, deferred, visited):
+        variable_values = self.variable_values
+        for selection in selection_set.selections:
+            if not should_include_node(variable_values, selection):
+                continue
+
+            if isinstance(selection, FieldNode):
+                fields.setdefault(get_field_entry_key(selection), []).append(selection)
+                continue
+
+            if isinstance(selection, InlineFragmentNode):
+                fragment = selection
+            else:
+                name = selection.name.value
+                if name in visited:
+                    continue
+                visited.add(name)
+                fragment = self.fragments.get(name)
+                if fragment is None:
+                    continue
+
+            if not does_fragment_condition_match(self.schema, fragment, runtime_type):
+                continue
+
+            defer = get_directive_values(DeferDirective, selection, variable_values)
+            if defer and defer["if"]:
+                deferred_fields: Dict[str, List[FieldNode]] = {}
+                self._collect_fields_impl(runtime_type, fragment.selection_set, deferred_fields, deferred, set())
+                if deferred_fields:
+                    deferred.append((defer.get("label"), deferred_fields))
+            else:
+                self._collect_fields_impl(runtime_type, fragment.selection_set, fields, deferred, visited)
+
+    def defer_fragments(self, parent_type, source, path: Optional[Path], deferred: List[DeferredFragment]):
+        for label, fields in deferred:
+            self.publisher.add(
+                label,
+                path,
+                self._fork(self._execute_deferred_fragment, parent_type, source, path, fields),
+                parent=self.parent_record
+            )
+
+    def _fork(self, method, *args) -> Callable[[_Record], Awaitable[Dict[str, Any]]]:
+        """Bind `method` to a copy of this context with its own errors and parent record"""
+        def run(record: _Record):
+            child = copy.copy(self)
+            child.collected_errors = CollectedErrors()
+            child.parent_record = record
+            return method.__func__(child, record, *args)
+        return run
+
+    async def _execute_deferred_fragment(self, record, parent_type, source, path, fields) -> Dict[str, Any]:
+        try:
+            data = self.execute_fields(parent_type, source, path, fields)
+            if self.is_awaitable(data):
+                data = await data
+        except Exception as raw_error:
+            self.collected_errors.add(located_error(raw_error, None, path.as_list() if path else None), path)
+            data = None
+        return self._incremental_entry(record, "data", data)
+
+    async def _complete_stream_item(self, record, item_type, field_nodes, info, item_path, item) -> Dict[str, Any]:
+        try:
+            completed = self.complete_value(item_type, field_nodes, info, item_path, item)
+            if self.is_awaitable(completed):
+                completed = await completed
+            items = [completed]
+        except Exception as raw_error:
+            self.collected_errors.add(located_error(raw_error, field_nodes, item_path.as_list()), item_path)
+            items = None if is_non_null_type(item_type) else [None]
+        return self._incremental_entry(record, "items", items)
+
+    def _incremental_entry(self, record: _Record, key: str, value: Any) -> Dict[str, Any]:
+        entry = {key: value, "path": record.path.as_list() if record.path else []}
+        if record.label is not None:
+            entry["label"] = record.label
+        errors = self.collected_errors.errors
+        if errors:
+            for error in errors:
+                logger.error(f"Error in incremental payload at {error.path}: {error.message}")
+            entry["errors"] = [error.formatted for error in errors]
+        return entry
+
+
+class IncrementalSchema(strawberry.Schema):
+    """Strawberry schema with @defer and @stream support"""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("execution_context_class", IncrementalExecutionContext)
+        super().__init__(*args, **kwargs)
+
+        graphql_schema = self._schema
+        graphql_schema.directives = (*graphql_schema.directives, DeferDirective, StreamDirective)
+        for directive in (DeferDirective, StreamDirective):
+            for argument in directive.args.values():
+                argument_type = get_named_type(argument.type)
+                graphql_schema.type_map.setdefault(argument_type.name, argument_type)
+
+    def as_str(self) -> str:
+        # Strawberry's printer only handles directives defined through Strawberry
+        return print_schema(self._schema)
+
+    __str__ = as_str
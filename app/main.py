@@ -1,15 +1,40 @@
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi.responses import FileResponse, Response
+from starlette.requests import HTTPConnection
 from fastapi.middleware.cors import CORSMiddleware
-import strawberry
-from strawberry.fastapi import GraphQLRouter
 import logging
 from contextlib import asynccontextmanager
 
 from app.schema.queries import Query
 from app.schema.mutations import Mutation
-from app.database.connection import init_database
+from app.schema.subscriptions import Subscription
+from app.database.connection import (
+    init_database, db_client, load_project_items, read_project_changes_page, read_owned_projects, write_owner_summary,
+    project_partitions, missing_projects, missing_users, project_lookups, user_lookups
+)
+from app.database.change_feed import CosmosChangeFeedSource, project_changes
+from app.database.replica import PROJECT_REPLICA_ENABLED, project_replica
+from app.database.snapshot import PROJECT_SNAPSHOT_ENABLED, SNAPSHOT_MEDIA_TYPE, project_snapshot
+from app.database.owners import OWNER_FANOUT_ENABLED, OWNER_FANOUT_POLL_INTERVAL, owner_fanout
+from app.database.circuit_breaker import CLOSED, container_breakers
+from app.database.hedging import hedged_reads
+from app.database.throttling import cosmos_throttle
 from decouple import config
-from app.auth.azure_ad import get_current_user
+from app.auth.azure_ad import get_current_user, get_current_user_dependency
+from app.extensions import (
+    DeadlineExtension, MetricsExtension, QueryCostLimiter, ResponseCacheExtension, SingleFlightExtension,
+    StaleReadExtension, query_flights
+)
+from app.extensions.response_cache import response_cache, project_tags, entity_tag
+from app.utils.json_encoder import EncodedJSONResponse
+from app.router import AppGraphQLRouter
+from app.incremental import IncrementalSchema
+from app.schema.loaders import create_loaders
+from app.utils.deadline import DEADLINE_CONTEXT_KEY, deadline_from_headers
+from app.middleware.compression import CompressionMiddleware, COMPRESSION_ENABLED
+from app.middleware.admission import ADMISSION_ENABLED, AdmissionControlMiddleware, admission_control
+from app.middleware.metrics import MetricsMiddleware
+from app.utils.metrics import CONTENT_TYPE, METRICS_ENABLED, MetricFamily, cache_metrics, registry
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -17,8 +42,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create GraphQL schema
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+schema_extensions = [
+    DeadlineExtension, QueryCostLimiter, StaleReadExtension, ResponseCacheExtension, SingleFlightExtension
+]
+if METRICS_ENABLED:
+    # First, so resolver timings include the work of the other extensions
+    schema_extensions.insert(0, MetricsExtension)
+
+# Create GraphQL schema (with @defer/@stream support)
+schema = IncrementalSchema(
+    query=Query,
+    mutation=Mutation,
+    subscription=Subscription,
+    extensions=schema_extensions
+)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -29,6 +66,26 @@ async def lifespan(app: FastAPI):
         await init_database()
         logger.info("Database initialized successfully")
         
+        # One change feed reader per process serves every projectChanged subscription
+        project_changes.source = CosmosChangeFeedSource(db_client.projects_container)
+        
+        if PROJECT_REPLICA_ENABLED:
+            await project_replica.start(load_project_items, project_changes)
+        
+        if PROJECT_SNAPSHOT_ENABLED:
+            await project_snapshot.start(read_project_changes_page)
+        
+        if OWNER_FANOUT_ENABLED:
+            # Keep the owner summaries embedded in projects in step with the users container
+            await owner_fanout.start(
+                CosmosChangeFeedSource(db_client.users_container, poll_interval=OWNER_FANOUT_POLL_INTERVAL),
+                read_owned_projects,
+                write_owner_summary,
+                on_update=lambda user_id, project_ids: response_cache.invalidate(
+                    project_tags(*project_ids) | {entity_tag("User", user_id)}
+                )
+            )
+        
         # Log authentication mode
         if config('DEBUG', default=False, cast=bool):
             logger.warning("Running in DEBUG mode with development authentication")
@@ -43,15 +100,24 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down GraphQL API...")
+    await owner_fanout.stop()
+    await project_snapshot.stop()
+    await project_replica.stop()
+    await project_changes.stop()
 
 # Create FastAPI app
 app = FastAPI(
     title="Project Management GraphQL API",
     description="A GraphQL API for managing projects with Azure AD authentication",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=EncodedJSONResponse
 )
 
+# Shed excess /graphql load early; added first so it sits inside CORS and rejections keep CORS headers
+if ADMISSION_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -61,16 +127,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large GraphQL and export responses for clients that accept it
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Outermost, so request latency includes admission control and compression
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Custom context getter for GraphQL
-async def get_context(request: Request):
-    """Custom context function to pass request to GraphQL resolvers"""
-    return {
+async def get_context(request: HTTPConnection):
+    """Custom context function to pass request (or websocket) to GraphQL resolvers"""
+    # Batched operations share this context, so auth, loaders and the deadline are per request.
+    # Websocket contexts live as long as the connection, so they get no loader caches or deadline
+    context = {
         "request": request,
-        "current_user": None  # Will be populated by permission classes
+        "current_user": None,  # Will be populated by permission classes
     }
+    if request.scope["type"] == "http":
+        context.update(create_loaders())
+        context[DEADLINE_CONTEXT_KEY] = deadline_from_headers(request.headers)
+    return context
 
 # Create GraphQL router
-graphql_app = GraphQLRouter(
+graphql_app = AppGraphQLRouter(
     schema,
     context_getter=get_context,
     graphiql=config('GRAPHIQL_ENABLED', default=True, cast=bool)
@@ -98,6 +178,9 @@ async def health_check():
         return {
             "status": "healthy",
             "database": "connected",
+            "circuits": container_breakers.states(),
+            "hedged_reads": hedged_reads.metrics(),
+            "admission": admission_control.stats(),
             "authentication": "Azure AD" if not config('DEBUG', default=False, cast=bool) else "Development",
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -105,6 +188,63 @@ async def health_check():
         logger.error(f"Health check failed: {e}")
         raise HTTPException(status_code=503, detail="Service unavailable")
 
+def collect_service_metrics():
+    """Scrape-time view of the counters kept by caches, coalescing, admission and Cosmos resilience"""
+    yield from cache_metrics({
+        "response": response_cache,
+        "partition_keys": project_partitions,
+        "missing_projects": missing_projects,
+        "missing_users": missing_users,
+    })
+
+    coalesced = MetricFamily("singleflight_coalesced_total", "Calls that shared an in-flight call", "counter", ("flight",))
+    for name, flights in {"query": query_flights, "project": project_lookups, "user": user_lookups}.items():
+        coalesced.add(flights.coalesced, name)
+    yield coalesced
+
+    stats = admission_control.stats()
+    yield MetricFamily("admission_in_flight", "Admitted requests being processed").add(stats["in_flight"])
+    yield MetricFamily("admission_queued", "Requests waiting for a slot").add(stats["queued"])
+    outcomes = MetricFamily("admission_requests_total", "Admission decisions", "counter", ("outcome",))
+    for outcome in ("admitted", "rate_limited", "client_concurrency_limited", "shed"):
+        outcomes.add(stats[outcome], outcome)
+    yield outcomes
+
+    yield MetricFamily("cosmos_throttled_total", "429 responses from Cosmos DB", "counter").add(cosmos_throttle.throttled)
+    yield MetricFamily(
+        "cosmos_deadline_rejected_total", "Throttled calls that ran out of time", "counter"
+    ).add(cosmos_throttle.rejected)
+    capacity = MetricFamily("cosmos_concurrency_limit", "Current adaptive concurrency limit", "gauge", ("kind",))
+    for kind, limiter in cosmos_throttle.limiters.items():
+        capacity.add(limiter.capacity, kind)
+    yield capacity
+
+    circuits = MetricFamily("circuit_breaker_open", "1 while the container's circuit is not closed", "gauge", ("container",))
+    for container, state in container_breakers.states().items():
+        circuits.add(0 if state == CLOSED else 1, container)
+    yield circuits
+
+    hedges = MetricFamily("hedged_reads_total", "Hedged read outcomes", "counter", ("operation", "outcome"))
+    for operation, counts in hedged_reads.metrics().items():
+        for outcome, count in counts.items():
+            hedges.add(count, operation, outcome)
+    yield hedges
+
+registry.add_collector(collect_service_metrics)
+
+if METRICS_ENABLED:
+    @app.get("/metrics")
+    async def metrics():
+        """Prometheus scrape endpoint"""
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
+@app.get("/export/projects.arrow")
+async def export_projects(user: dict = Depends(get_current_user_dependency)):
+    """Download the columnar projects snapshot (Arrow IPC file)"""
+    if not project_snapshot.ready:
+        raise HTTPException(status_code=503, detail="Project snapshot is not available")
+    return FileResponse(project_snapshot.path, media_type=SNAPSHOT_MEDIA_TYPE, filename="projects.arrow")
+
 @app.post("/test-auth")
 async def test_auth(request: Request):
     try:
@@ -131,20 +271,29 @@ async def auth_info():
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions"""
-    return {
-        "error": {
-            "message": exc.detail,
-            "status_code": exc.status_code
-        }
-    }
+    return EncodedJSONResponse(
+        status_code=exc.status_code,
+        content={
+            "error": {
+                "message": exc.detail,
+                "status_code": exc.status_code
+            }
+        },
+        headers=exc.headers
+    )
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return HTTPException(
+    return EncodedJSONResponse(
         status_code=500,
-        detail="Internal server error"
+        content={
+            "error": {
+                "message": "Internal server error",
+                "status_code": 500
+            }
+        }
     )
 
 if __name__ == "__main__":
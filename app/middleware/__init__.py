@@ -0,0 +1,5 @@
+from .admission import AdmissionControlMiddleware, admission_control
+from .compression import CompressionMiddleware
+from .metrics import MetricsMiddleware
+
+__all__ = ["AdmissionControlMiddleware", "admission_control", "CompressionMiddleware", "MetricsMiddleware"]
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Optional, Sequence
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+from decouple import config
+import logging
+
+from app.auth.identities import verified_tokens
+
+logger = logging.getLogger(__name__)
+
+# Admission control configuration
+ADMISSION_ENABLED = config('ADMISSION_ENABLED', default=True, cast=bool)
+ADMISSION_PATHS = config(
+    'ADMISSION_PATHS',
+    default='/graphql',
+    cast=lambda value: [path.strip() for path in value.split(',') if path.strip()]
+)
+# Requests processed at once across all clients; the rest wait in a bounded queue
+ADMISSION_MAX_CONCURRENCY = config('ADMISSION_MAX_CONCURRENCY', default=64, cast=int)
+ADMISSION_MAX_QUEUE = config('ADMISSION_MAX_QUEUE', default=128, cast=int)
+# Seconds a request may wait for a slot before it is shed with 503
+ADMISSION_QUEUE_TIMEOUT = config('ADMISSION_QUEUE_TIMEOUT', default=2.0, cast=float)
+# Per-client token bucket (requests per second, burst size) and concurrent requests
+ADMISSION_CLIENT_RATE = config('ADMISSION_CLIENT_RATE', default=20.0, cast=float)
+ADMISSION_CLIENT_BURST = config('ADMISSION_CLIENT_BURST', default=40, cast=int)
+ADMISSION_CLIENT_CONCURRENCY = config('ADMISSION_CLIENT_CONCURRENCY', default=16, cast=int)
+ADMISSION_MAX_CLIENTS = config('ADMISSION_MAX_CLIENTS', default=10000, cast=int)
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated_at = now
+
+
+class ClientLimits:
+    """Token buckets and in-flight counts per client identity, LRU bounded"""
+
+    def __init__(
+        self,
+        rate: float = ADMISSION_CLIENT_RATE,
+        burst: int = ADMISSION_CLIENT_BURST,
+        concurrency: int = ADMISSION_CLIENT_CONCURRENCY,
+        max_clients: int = ADMISSION_MAX_CLIENTS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_clients = max_clients
+        self.clock = clock
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._in_flight: Dict[str, int] = {}
+
+    def take(self, identity: str) -> float:
+        """Spend a token, returning 0 on success or the seconds until one is available"""
+        if self.rate <= 0:
+            return 0.0  # per-client rate limiting disabled
+        now = self.clock()
+        bucket = self._buckets.get(identity)
+        if bucket is None:
+            bucket = self._buckets[identity] = TokenBucket(float(self.burst), now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(identity)
+            bucket.tokens = min(float(self.burst), bucket.tokens + (now - bucket.updated_at) * self.rate)
+            bucket.updated_at = now
+
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return 0.0
+        return (1 - bucket.tokens) / self.rate
+
+    def enter(self, identity: str) -> bool:
+        if self._in_flight.get(identity, 0) >= self.concurrency:
+            return False
+        self._in_flight[identity] = self._in_flight.get(identity, 0) + 1
+        return True
+
+    def leave(self, identity: str):
+        remaining = self._in_flight.get(identity, 0) - 1
+        if remaining > 0:
+            self._in_flight[identity] = remaining
+        else:
+            self._in_flight.pop(identity, None)
+
+
+class ConcurrencyGate:
+    """Fixed number of slots with a bounded FIFO queue of waiters"""
+
+    def __init__(self, limit: int = ADMISSION_MAX_CONCURRENCY, max_queue: int = ADMISSION_MAX_QUEUE):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> bool:
+        """Take a slot, False when the queue is full or no slot frees up within `timeout`"""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self):
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class AdmissionController:
+    """Decides which requests are let through, shared by every middleware instance"""
+
+    def __init__(
+        self,
+        gate: Optional[ConcurrencyGate] = None,
+        clients: Optional[ClientLimits] = None,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT
+    ):
+        self.gate = gate or ConcurrencyGate()
+        self.clients = clients or ClientLimits()
+        self.queue_timeout = queue_timeout
+        self.admitted = 0
+        self.rate_limited = 0  # 429, client over its token bucket
+        self.client_concurrency_limited = 0  # 429, client over its concurrent requests
+        self.shed = 0  # 503, no global slot within the queue timeout
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.gate.in_flight,
+            "queued": self.gate.queued,
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "client_concurrency_limited": self.client_concurrency_limited,
+            "shed": self.shed,
+        }
+
+
+# Global controller, so limits hold across requests and show up in /health
+admission_control = AdmissionController()
+
+
+def identify_client(scope: Scope) -> str:
+    """Verified oid/appid of the bearer token, or the client address for tokens not seen yet"""
+    authorization = Headers(scope=scope).get("authorization", "")
+    if authorization.startswith("Bearer "):
+        identity = verified_tokens.get(authorization[7:])
+        if identity:
+            return identity
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else "ip:unknown"
+
+
+class AdmissionControlMiddleware:
+    """Shed excess GraphQL load before it reaches auth or the database
+
+    Each client is held to a token bucket and a number of concurrent
+    requests (429 when exceeded). Admitted requests then take one of the
+    global slots, waiting up to the queue timeout behind a bounded queue
+    (503 when they can't). Both answers carry `Retry-After`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController = admission_control,
+        paths: Sequence[str] = tuple(ADMISSION_PATHS),
+    ):
+        self.app = app
+        self.controller = controller
+        self.paths = tuple(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        identity = identify_client(scope)
+        wait = controller.clients.take(identity)
+        if wait:
+            controller.rate_limited += 1
+            await self.reject(send, 429, "Too many requests", wait)
+            return
+        if not controller.clients.enter(identity):
+            controller.client_concurrency_limited += 1
+            await self.reject(send, 429, "Too many concurrent requests", 1)
+            return
+
+        try:
+            if not await controller.gate.acquire(controller.queue_timeout):
+                controller.shed += 1
+                await self.reject(send, 503, "Server is overloaded", controller.queue_timeout)
+                return
+            try:
+                controller.admitted += 1
+                await self.app(scope, receive, send)
+            finally:
+                controller.gate.release()
+        finally:
+            controller.clients.leave(identity)
+
+    @staticmethod
+    async def reject(send: Send, status: int, detail: str, retry_after: float):
+        body = json.dumps({"detail": detail}).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,222 @@
+import gzip
+import zlib
+from typing import List, Optional, Sequence, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from decouple import config
+import logging
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Compression configuration
+COMPRESSION_ENABLED = config('COMPRESSION_ENABLED', default=True, cast=bool)
+COMPRESSION_MINIMUM_SIZE = config('COMPRESSION_MINIMUM_SIZE', default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=4, cast=int)
+COMPRESSION_PATHS = config(
+    'COMPRESSION_PATHS',
+    default='/graphql,/export',
+    cast=lambda value: [path.strip() for path in value.split(',') if path.strip()]
+)
+
+# Content types worth compressing; images and archives are already compressed
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/graphql-response+json",
+    "multipart/mixed",
+    "text/",
+    "application/x-ndjson",
+    "application/vnd.apache.arrow",
+)
+
+
+class GzipCompressor:
+    encoding = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        # Sync flush so each streamed chunk reaches the client immediately
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+    @staticmethod
+    def compress_all(data: bytes, level: int) -> bytes:
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class BrotliCompressor:
+    encoding = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+    @staticmethod
+    def compress_all(data: bytes, quality: int) -> bytes:
+        return brotli.compress(data, quality=quality)
+
+
+def parse_accept_encoding(header: str) -> List[Tuple[str, float]]:
+    """Parse an Accept-Encoding header into (encoding, q) pairs"""
+    encodings = []
+    for part in header.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings.append((name.strip().lower(), quality))
+    return encodings
+
+
+def choose_encoding(header: str, available: Sequence[str]) -> Optional[str]:
+    """Pick the client's most preferred encoding we support, ties favour `available` order"""
+    accepted = dict(parse_accept_encoding(header))
+    wildcard = accepted.get("*")
+
+    best = None
+    best_quality = 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, wildcard if wildcard is not None else 0.0)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """Negotiated gzip/brotli compression for buffered and streamed responses
+
+    Buffered responses below `minimum_size` are sent as is. Streamed
+    responses are compressed chunk by chunk and flushed after every chunk so
+    incremental delivery keeps working.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+        paths: Sequence[str] = tuple(COMPRESSION_PATHS),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.paths = tuple(paths)
+        self.available = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = choose_encoding(headers.get("accept-encoding", ""), self.available)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def create_compressor(self, encoding: str):
+        if encoding == "br":
+            return BrotliCompressor(self.brotli_quality)
+        return GzipCompressor(self.gzip_level)
+
+    def compress_all(self, encoding: str, data: bytes) -> bytes:
+        if encoding == "br":
+            return BrotliCompressor.compress_all(data, self.brotli_quality)
+        return GzipCompressor.compress_all(data, self.gzip_level)
+
+
+class _CompressionResponder:
+    """Per-request state for CompressionMiddleware"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message: Message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if self.passthrough:
+                await self._send(message)
+            else:
+                # Wait for the first body chunk to decide how to respond
+                self.start_message = message
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+
+            if not more_body:
+                await self._send_buffered(start_message, body)
+                return
+
+            self.compressor = self.middleware.create_compressor(self.encoding)
+            headers = MutableHeaders(raw=start_message["headers"])
+            self._set_encoding_headers(headers)
+            del headers["content-length"]
+            await self._send(start_message)
+
+        chunk = self.compressor.compress(body) if body else b""
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _send_buffered(self, start_message: Message, body: bytes):
+        if len(body) < self.middleware.minimum_size:
+            await self._send(start_message)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        compressed = self.middleware.compress_all(self.encoding, body)
+        headers = MutableHeaders(raw=start_message["headers"])
+        self._set_encoding_headers(headers)
+        headers["content-length"] = str(len(compressed))
+        await self._send(start_message)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    def _set_encoding_headers(self, headers: MutableHeaders):
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
@@ -0,0 +1,61 @@
+import time
+from typing import Sequence
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from decouple import config
+
+from app.utils.metrics import OPERATION_STATE_KEY, Histogram, http_request_duration
+
+# Path prefixes reported as such; anything else is labelled "other" to bound the series
+METRICS_PATHS = config(
+    'METRICS_PATHS',
+    default='/graphql,/export,/health,/metrics,/auth,/test-auth',
+    cast=lambda value: [path.strip() for path in value.split(',') if path.strip()]
+)
+
+
+class MetricsMiddleware:
+    """Record the latency of every HTTP request by method, path, status and GraphQL operation
+
+    Added last so it is the outermost middleware and also times requests
+    shed by admission control and the compression of responses.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        histogram: Histogram = http_request_duration,
+        paths: Sequence[str] = tuple(METRICS_PATHS),
+    ):
+        self.app = app
+        self.histogram = histogram
+        self.paths = tuple(paths)
+
+    def path_label(self, path: str) -> str:
+        if path == "/":
+            return path
+        for prefix in self.paths:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return prefix
+        return "other"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            operation = scope.get("state", {}).get(OPERATION_STATE_KEY, "")
+            self.histogram.observe(
+                time.perf_counter() - started, scope["method"], self.path_label(scope["path"]), str(status), operation
+            )
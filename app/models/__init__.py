@@ -1,4 +1,4 @@
-from .project import Project, ProjectCreate, ProjectUpdate, ProjectStatus, ProjectPriority
+from .project import Project, ProjectCreate, ProjectUpdate, ProjectStatus, ProjectPriority, ProjectRecord
 from .user import User, UserRole
 
 __all__ = [
@@ -7,6 +7,7 @@ __all__ = [
     "ProjectUpdate",
     "ProjectStatus",
     "ProjectPriority",
+    "ProjectRecord",
     "User",
     "UserRole"
 ]
\ No newline at end of file
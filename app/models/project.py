@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from pydantic import BaseModel, Field
 from enum import Enum
@@ -41,6 +41,102 @@ class Project(ProjectBase):
     id: str
     created_at: datetime
     updated_at: datetime
+    owner_summary: Optional[Dict[str, Any]] = None  # denormalized copy of the owner
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+def parse_datetime(value: Any) -> datetime:
+    """Parse an ISO 8601 timestamp as stored in Cosmos DB"""
+    if isinstance(value, str):
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return datetime.fromisoformat(value)
+    return value
+
+def _enum_lookup(enum_class) -> Dict[str, Enum]:
+    """Map stored values, in either case, to enum members"""
+    lookup = {}
+    for member in enum_class:
+        lookup[member.value] = member
+        lookup[member.value.lower()] = member
+    return lookup
+
+_STATUS_LOOKUP = _enum_lookup(ProjectStatus)
+_PRIORITY_LOOKUP = _enum_lookup(ProjectPriority)
+
+class ProjectRecord:
+    """Read-only project built straight from a stored document
+
+    Documents read back from Cosmos DB were validated on write, so the read
+    path skips Pydantic and keeps timestamps as strings until a resolver
+    asks for them.
+    """
+
+    __slots__ = (
+        "id",
+        "project_id",
+        "name",
+        "description",
+        "status",
+        "priority",
+        "tags",
+        "owner_id",
+        "budget",
+        "owner_summary",
+        "_created_at",
+        "_updated_at",
+    )
+
+    def __init__(self, item: Dict[str, Any]):
+        get = item.get
+        self.id = item["id"]
+        self.project_id = get("project_id")
+        self.name = item["name"]
+        self.description = get("description")
+
+        status = get("status")
+        self.status = _STATUS_LOOKUP.get(status) or (ProjectStatus(status.upper()) if status else ProjectStatus.ACTIVE)
+        priority = get("priority")
+        self.priority = _PRIORITY_LOOKUP.get(priority) or (ProjectPriority(priority.upper()) if priority else ProjectPriority.MEDIUM)
+
+        self.tags = get("tags") or []
+        self.owner_id = item["owner_id"]
+        self.budget = get("budget")
+        self.owner_summary = get("owner_summary")
+        self._created_at = item["created_at"]
+        self._updated_at = item["updated_at"]
+
+    @property
+    def created_at(self) -> datetime:
+        value = self._created_at
+        if isinstance(value, str):
+            value = self._created_at = parse_datetime(value)
+        return value
+
+    @property
+    def updated_at(self) -> datetime:
+        value = self._updated_at
+        if isinstance(value, str):
+            value = self._updated_at = parse_datetime(value)
+        return value
+
+    def to_model(self) -> Project:
+        """Validate into a full Project model"""
+        return Project(
+            id=self.id,
+            project_id=self.project_id,
+            name=self.name,
+            description=self.description,
+            status=self.status,
+            priority=self.priority,
+            tags=self.tags,
+            owner_id=self.owner_id,
+            budget=self.budget,
+            owner_summary=self.owner_summary,
+            created_at=self.created_at,
+            updated_at=self.updated_at
+        )
+
+    def __repr__(self) -> str:
+        return f"ProjectRecord(id={self.id!r}, project_id={self.project_id!r}, name={self.name!r})"
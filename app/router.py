@@ -0,0 +1,178 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from graphql import GraphQLError, OperationType as ASTOperationType, parse
+from graphql.utilities import get_operation_ast
+from strawberry import UNSET
+from strawberry.exceptions import MissingQueryError
+from strawberry.fastapi import GraphQLRouter
+from strawberry.http import GraphQLHTTPResponse, parse_request_data
+from strawberry.http.exceptions import HTTPException as StrawberryHTTPException
+from strawberry.schema.exceptions import InvalidOperationTypeError
+from strawberry.types.graphql import OperationType
+from decouple import config
+import logging
+
+from app.incremental import PUBLISHER_CONTEXT_KEY, IncrementalPublisher
+from app.utils.json_encoder import response_encoder
+
+logger = logging.getLogger(__name__)
+
+GRAPHQL_MAX_BATCH_SIZE = config('GRAPHQL_MAX_BATCH_SIZE', default=10, cast=int)
+
+# Incremental delivery over multipart HTTP, as implemented by Apollo Client and graphql-js
+MULTIPART_CONTENT_TYPE = 'multipart/mixed; boundary="-"; deferSpec=20220824'
+MULTIPART_PART_HEADER = b"\r\n---\r\nContent-Type: application/json; charset=utf-8\r\n\r\n"
+MULTIPART_END = b"\r\n-----\r\n"
+
+
+class AppGraphQLRouter(GraphQLRouter):
+    """GraphQL router with the configured response encoder, batching and incremental delivery
+
+    A POST body holding a JSON array is executed as a batch: every operation
+    shares the request context (authenticated user, DataLoaders) and results
+    are returned in request order. Queries run concurrently; a mutation waits
+    for the operations before it and runs alone, so writes apply in order.
+
+    Clients accepting `multipart/mixed` get @defer fragments and @stream items
+    as later parts of a multipart response.
+    """
+
+    max_batch_size = GRAPHQL_MAX_BATCH_SIZE
+
+    def encode_json(self, response_data) -> bytes:
+        return response_encoder.encode(response_data)
+
+    def parse_json(self, data):
+        try:
+            return response_encoder.decode(data)
+        except ValueError as e:
+            raise StrawberryHTTPException(400, "Unable to parse request body as JSON") from e
+
+    async def run(self, request: Request, context=UNSET, root_value=UNSET):
+        if request.method == "POST" and "application/json" in request.headers.get("content-type", ""):
+            body = await request.body()
+            if body.lstrip()[:1] == b"[":
+                return await self.run_batch(request, self.parse_json(body), context, root_value)
+
+        if "multipart/mixed" in request.headers.get("accept", ""):
+            return await self.run_incremental(request, context, root_value)
+
+        return await super().run(request, context=context, root_value=root_value)
+
+    async def run_incremental(self, request: Request, context: Any, root_value: Any):
+        sub_response = await self.get_sub_response(request)
+        if context is UNSET:
+            context = await self.get_context(request, response=sub_response)
+        if root_value is UNSET:
+            root_value = await self.get_root_value(request)
+
+        publisher = IncrementalPublisher()
+        if isinstance(context, dict):
+            context[PUBLISHER_CONTEXT_KEY] = publisher
+
+        try:
+            result = await self.execute_operation(request=request, context=context, root_value=root_value)
+        except InvalidOperationTypeError as e:
+            raise StrawberryHTTPException(400, e.as_http_error_reason(request.method)) from e
+        except MissingQueryError as e:
+            raise StrawberryHTTPException(400, "No GraphQL query found in the request") from e
+
+        response_data = await self.process_result(request=request, result=result)
+        if result.errors:
+            self._handle_errors(result.errors, response_data)
+
+        # Nothing was deferred, a plain JSON response will do
+        if not publisher.has_pending:
+            return self.create_response(response_data=response_data, sub_response=sub_response)
+
+        response = StreamingResponse(
+            self.stream_multipart(response_data, publisher),
+            media_type=MULTIPART_CONTENT_TYPE,
+            status_code=sub_response.status_code or 200,
+        )
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    async def stream_multipart(self, response_data: GraphQLHTTPResponse, publisher: IncrementalPublisher):
+        try:
+            yield MULTIPART_PART_HEADER + self.encode_json({**response_data, "hasNext": True})
+            async for payload in publisher.subsequent_payloads():
+                yield MULTIPART_PART_HEADER + self.encode_json(payload)
+            yield MULTIPART_END
+        finally:
+            publisher.cancel()
+
+    async def run_batch(self, request: Request, operations: List[Any], context: Any, root_value: Any):
+        if not operations:
+            raise StrawberryHTTPException(400, "Batch must contain at least one operation")
+        if len(operations) > self.max_batch_size:
+            raise StrawberryHTTPException(
+                400, f"Batch contains {len(operations)} operations, the maximum is {self.max_batch_size}"
+            )
+
+        sub_response = await self.get_sub_response(request)
+        allowed_operation_types = OperationType.from_http("POST")
+
+        results: List[GraphQLHTTPResponse] = []
+        pending = []  # queries since the last mutation
+        for operation in operations:
+            execution = self.execute_batched_operation(request, operation, context, root_value, allowed_operation_types)
+            if not _is_mutation(operation):
+                pending.append(execution)
+                continue
+            results.extend(await asyncio.gather(*pending))
+            pending = []
+            results.append(await execution)
+        results.extend(await asyncio.gather(*pending))
+
+        logger.info(f"Executed batch of {len(operations)} GraphQL operations")
+        return self.create_response(response_data=results, sub_response=sub_response)
+
+    async def execute_batched_operation(
+        self,
+        request: Request,
+        operation: Any,
+        context: Any,
+        root_value: Any,
+        allowed_operation_types
+    ) -> GraphQLHTTPResponse:
+        if not isinstance(operation, dict):
+            return _error_response("Each batched operation must be a JSON object")
+
+        request_data = parse_request_data(operation)
+        try:
+            result = await self.schema.execute(
+                request_data.query,
+                root_value=root_value,
+                variable_values=request_data.variables,
+                context_value=context,
+                operation_name=request_data.operation_name,
+                allowed_operation_types=allowed_operation_types,
+            )
+        except InvalidOperationTypeError as e:
+            return _error_response(e.as_http_error_reason("POST"))
+        except MissingQueryError:
+            return _error_response("No GraphQL query found in the request")
+
+        response_data = await self.process_result(request=request, result=result)
+        if result.errors:
+            self._handle_errors(result.errors, response_data)
+        return response_data
+
+
+def _is_mutation(operation: Any) -> bool:
+    """Whether a batch entry selects a mutation; unparsable entries fail on execution instead"""
+    if not isinstance(operation, dict) or not isinstance(operation.get("query"), str):
+        return False
+    try:
+        document = parse(operation["query"])
+    except GraphQLError:
+        return False
+    definition = get_operation_ast(document, operation.get("operationName"))
+    return definition is not None and definition.operation == ASTOperationType.MUTATION
+
+
+def _error_response(message: str) -> Dict[str, Optional[Any]]:
+    return {"data": None, "errors": [{"message": message}]}
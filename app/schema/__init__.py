@@ -1,5 +1,6 @@
 from .queries import Query
 from .mutations import Mutation
+from .subscriptions import Subscription
 from .types import (
     Project,
     User,
@@ -12,6 +13,7 @@ from .types import (
 __all__ = [
     "Query",
     "Mutation",
+    "Subscription",
     "Project",
     "User",
     "ProjectConnection",
@@ -0,0 +1,10 @@
+from typing import Dict
+from strawberry.dataloader import DataLoader
+
+from app.database.connection import get_users_by_ids
+
+def create_loaders() -> Dict[str, DataLoader]:
+    """Create the per-request DataLoaders placed in the GraphQL context"""
+    return {
+        "user_loader": DataLoader(load_fn=get_users_by_ids)
+    }
@@ -4,6 +4,7 @@ from app.schema.types import Project, User, UserRole, CreateProjectInput
 from app.database.connection import create_project, update_project, delete_project, get_project_by_id
 from app.models.project import ProjectCreate, ProjectUpdate
 from app.auth.permissions import IsAuthenticated
+from app.extensions.response_cache import response_cache, project_tags, collection_tag
 from strawberry.types import Info
 from fastapi import HTTPException
 import logging
@@ -43,7 +44,9 @@ class Mutation:
                 budget=input.budget
             )
             
-            return await create_project(project_data)
+            created = await create_project(project_data)
+            response_cache.invalidate(project_tags(created.id, created.project_id))
+            return created
         except Exception as e:
             logger.error(f"Failed to create project: {e}")
             raise HTTPException(
@@ -80,7 +83,9 @@ class Mutation:
                 budget=input.budget
             )
             
-            return await update_project(id, project_data)
+            updated = await update_project(id, project_data)
+            response_cache.invalidate(project_tags(id, project.id, project.project_id))
+            return updated
         except Exception as e:
             logger.error(f"Failed to update project: {e}")
             raise HTTPException(
@@ -102,7 +107,10 @@ class Mutation:
             )
         
         try:
-            return await delete_project(id)
+            deleted = await delete_project(id)
+            if deleted:
+                response_cache.invalidate(project_tags(id, project.id, project.project_id))
+            return deleted
         except Exception as e:
             logger.error(f"Failed to delete project: {e}")
             raise HTTPException(
@@ -116,6 +124,7 @@ class Mutation:
         try:
             from app.database.connection import seed_test_data
             await seed_test_data()
+            response_cache.invalidate(project_tags() | {collection_tag("User")})
             return "Test data seeded successfully"
         except Exception as e:
             logger.error(f"Failed to seed test data: {e}")
@@ -1,12 +1,22 @@
 import strawberry
 from typing import List, Optional
-from app.schema.types import Project, ProjectConnection, ProjectFilter, User, UserRole
+from datetime import datetime
+from app.schema.types import (
+    Project, ProjectConnection, ProjectChangeConnection, ProjectDimension, ProjectFilter, ProjectOrder,
+    ProjectStatsGroup, User, UserRole
+)
 from app.database.connection import (
     get_projects, 
+    get_projects_by_ids,
+    get_users_by_ids,
+    get_project_stats,
+    get_project_changes,
     get_project_by_id, 
     get_users,
     get_user_by_id
 )
+from app.database.stats import DEFAULT_PERCENTILES
+from app.database.lookups import check_batch_size, dedupe_ids
 from app.auth.permissions import IsAuthenticated
 from strawberry.types import Info
 from fastapi import HTTPException
@@ -22,14 +32,46 @@ class Query:
         info: Info,
         first: Optional[int] = 10,
         after: Optional[str] = None,
-        filter: Optional[ProjectFilter] = None
+        filter: Optional[ProjectFilter] = None,
+        order_by: Optional[List[ProjectOrder]] = None
     ) -> ProjectConnection:
-        """Get paginated list of projects with optional filtering"""
+        """Get paginated list of projects with optional filtering and ordering"""
         # All authenticated users can see all projects
         return await get_projects(
             first=first,
             after=after,
-            filter=filter
+            filter=filter,
+            order_by=order_by
+        )
+    
+    @strawberry.field(permission_classes=[IsAuthenticated])
+    async def project_stats(
+        self,
+        info: Info,
+        filter: Optional[ProjectFilter] = None,
+        group_by: Optional[List[ProjectDimension]] = None,
+        percentiles: Optional[List[float]] = None
+    ) -> List[ProjectStatsGroup]:
+        """Get project counts and budget statistics, optionally grouped"""
+        return await get_project_stats(
+            filter=filter,
+            group_by=group_by or [],
+            percentiles=percentiles if percentiles is not None else DEFAULT_PERCENTILES
+        )
+    
+    @strawberry.field(permission_classes=[IsAuthenticated])
+    async def projects_changed_since(
+        self,
+        info: Info,
+        since: datetime,
+        first: Optional[int] = 100,
+        after: Optional[str] = None
+    ) -> ProjectChangeConnection:
+        """Get upserts and deletions after `since` for client-side caches"""
+        return await get_project_changes(
+            since=since,
+            first=first,
+            after=after
         )
     
     @strawberry.field(permission_classes=[IsAuthenticated])
@@ -43,6 +85,12 @@ class Query:
         
         return project
     
+    @strawberry.field(permission_classes=[IsAuthenticated])
+    async def projects_by_ids(self, info: Info, ids: List[str]) -> List[Optional[Project]]:
+        """Get projects by ID or project_id in one round trip, null for ids that don't exist"""
+        check_batch_size(dedupe_ids(ids))
+        return await get_projects_by_ids(ids)
+    
     @strawberry.field(permission_classes=[IsAuthenticated])
     async def users(self, info: Info) -> List[User]:
         """Get list of users"""
@@ -55,6 +103,12 @@ class Query:
         # All authenticated users can see all users
         return await get_user_by_id(id)
     
+    @strawberry.field(permission_classes=[IsAuthenticated])
+    async def users_by_ids(self, info: Info, ids: List[str]) -> List[Optional[User]]:
+        """Get users by ID in one round trip, null for ids that don't exist"""
+        check_batch_size(dedupe_ids(ids))
+        return await get_users_by_ids(ids)
+    
     @strawberry.field(permission_classes=[IsAuthenticated])
     async def me(self, info: Info) -> User:
         """Get current user information"""
@@ -0,0 +1,24 @@
+import strawberry
+from typing import AsyncGenerator, Optional
+from app.schema.types import Project, ProjectFilter
+from app.database.change_feed import project_changes
+from app.database.converters import convert_item_to_project_record
+from app.database.filters import project_matches_filter
+from app.auth.permissions import IsAuthenticated
+from strawberry.types import Info
+import logging
+
+logger = logging.getLogger(__name__)
+
+@strawberry.type
+class Subscription:
+    @strawberry.subscription(permission_classes=[IsAuthenticated])
+    async def project_changed(
+        self,
+        info: Info,
+        filter: Optional[ProjectFilter] = None
+    ) -> AsyncGenerator[Project, None]:
+        """Push projects matching the filter as they are created or updated"""
+        logger.info(f"Subscription to project changes started, {project_changes.subscriber_count} active")
+        async for item in project_changes.subscribe(lambda item: project_matches_filter(item, filter)):
+            yield convert_item_to_project_record(item)
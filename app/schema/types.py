@@ -50,7 +50,18 @@ class Project:
     
     @strawberry.field
     async def owner(self, info) -> Optional[User]:
-        # This will be implemented with a data loader to avoid N+1 queries
+        # The summary embedded in the project answers selections it covers without a users read,
+        # as long as the fan-out job keeps it current
+        from app.database.owners import OWNER_FANOUT_ENABLED, OwnerSummary, owner_summary_fits
+        summary = getattr(self, "owner_summary", None)
+        if OWNER_FANOUT_ENABLED and summary and owner_summary_fits(info.selected_fields):
+            return OwnerSummary(self.owner_id, summary)
+
+        # Batch owner lookups through the request's data loader when available
+        loader = info.context.get("user_loader") if isinstance(info.context, dict) else None
+        if loader is not None:
+            return await loader.load(self.owner_id)
+
         from app.database.connection import get_user_by_id
         return await get_user_by_id(self.owner_id)
 
@@ -62,6 +73,24 @@ class ProjectFilter:
     tags: Optional[List[str]] = None
     search: Optional[str] = None  # Search in name and description
 
+@strawberry.enum
+class ProjectOrderField(Enum):
+    NAME = "name"
+    BUDGET = "budget"
+    PRIORITY = "priority_rank"  # LOW < MEDIUM < HIGH < CRITICAL
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+
+@strawberry.enum
+class SortDirection(Enum):
+    ASC = "ASC"
+    DESC = "DESC"
+
+@strawberry.input
+class ProjectOrder:
+    field: ProjectOrderField
+    direction: SortDirection = SortDirection.ASC
+
 @strawberry.input
 class CreateProjectInput:
     project_id: str = strawberry.field(description="Unique project identifier")
@@ -95,7 +124,72 @@ class ProjectEdge:
     node: Project
     cursor: str
 
+@strawberry.enum
+class ProjectDimension(Enum):
+    STATUS = "status"
+    PRIORITY = "priority"
+    OWNER = "owner_id"
+    TAG = "tags"
+
+@strawberry.type
+class FacetValue:
+    value: str
+    count: int
+
+@strawberry.type
+class ProjectFacet:
+    dimension: ProjectDimension
+    values: List[FacetValue]
+
 @strawberry.type
 class ProjectConnection:
     edges: List[ProjectEdge]
-    page_info: PaginationInfo
\ No newline at end of file
+    page_info: PaginationInfo
+    filter: strawberry.Private[Optional[ProjectFilter]] = None
+
+    @strawberry.field
+    async def facets(self, dimensions: List[ProjectDimension], top: int = 10) -> List[ProjectFacet]:
+        """Project counts per value of each dimension, under the same filter as the edges"""
+        from app.database.connection import get_project_facets
+        return await get_project_facets(self.filter, dimensions, top)
+
+@strawberry.type
+class DimensionValue:
+    dimension: ProjectDimension
+    value: Optional[str]
+
+@strawberry.type
+class BudgetPercentile:
+    percentile: float
+    value: float
+
+@strawberry.type
+class ProjectStatsGroup:
+    key: List[DimensionValue]  # empty when not grouped
+    count: int
+    budget_count: int  # projects in the group that have a budget
+    sum: float
+    mean: Optional[float]
+    min: Optional[float]
+    max: Optional[float]
+    percentiles: List[BudgetPercentile]
+
+@strawberry.type
+class ProjectChange:
+    id: str
+    project_id: str
+    deleted: bool
+    updated_at: datetime
+    project: Optional[Project]  # None for deleted projects
+
+@strawberry.type
+class ProjectChangeEdge:
+    node: ProjectChange
+    cursor: str
+
+@strawberry.type
+class ProjectChangeConnection:
+    edges: List[ProjectChangeEdge]
+    has_next_page: bool
+    end_cursor: Optional[str]
+    full_resync_required: bool  # `since` is older than the tombstone retention window
\ No newline at end of file
@@ -1,3 +1,14 @@
-from .pagination import encode_cursor, decode_cursor
+from .pagination import encode_cursor, decode_cursor, encode_keyset_cursor, decode_keyset_cursor
+from .single_flight import SingleFlight
+from .json_encoder import EncodedJSONResponse, get_response_encoder, response_encoder
 
-__all__ = ["encode_cursor", "decode_cursor"]
\ No newline at end of file
+__all__ = [
+    "encode_cursor",
+    "decode_cursor",
+    "encode_keyset_cursor",
+    "decode_keyset_cursor",
+    "SingleFlight",
+    "EncodedJSONResponse",
+    "get_response_encoder",
+    "response_encoder"
+]
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Mapping, Optional
+from decouple import config
+
+# Request deadline configuration
+REQUEST_TIMEOUT_DEFAULT = config('REQUEST_TIMEOUT_DEFAULT', default=10.0, cast=float)
+REQUEST_TIMEOUT_MAX = config('REQUEST_TIMEOUT_MAX', default=30.0, cast=float)
+# Clients may ask for a shorter (or, up to the max, longer) budget in seconds
+REQUEST_TIMEOUT_HEADER = config('REQUEST_TIMEOUT_HEADER', default='x-request-timeout')
+
+DEADLINE_CONTEXT_KEY = "deadline"
+
+
+class DeadlineExceeded(Exception):
+    """The request ran out of time
+
+    `running` is set when the call was cut off while still in progress, as
+    opposed to never being started because no time was left.
+    """
+
+    def __init__(self, timeout: float, running: bool = False):
+        super().__init__(f"Request deadline of {timeout:g}s exceeded")
+        self.timeout = timeout
+        self.running = running
+
+
+class Deadline:
+    """Point in time by which a request has to be answered"""
+
+    __slots__ = ("timeout", "expires_at", "clock")
+
+    def __init__(self, timeout: float, clock: Callable[[], float] = time.monotonic):
+        self.timeout = timeout
+        self.clock = clock
+        self.expires_at = clock() + timeout
+
+    def remaining(self) -> float:
+        return max(self.expires_at - self.clock(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.clock() >= self.expires_at
+
+    def check(self):
+        if self.expired:
+            raise DeadlineExceeded(self.timeout)
+
+
+def deadline_from_headers(
+    headers: Mapping[str, str],
+    default: float = REQUEST_TIMEOUT_DEFAULT,
+    maximum: float = REQUEST_TIMEOUT_MAX
+) -> Deadline:
+    """Deadline from the request timeout header, the default when absent or invalid"""
+    try:
+        timeout = float(headers.get(REQUEST_TIMEOUT_HEADER, default))
+    except (TypeError, ValueError):
+        timeout = default
+    if not timeout > 0:
+        timeout = default
+    return Deadline(min(timeout, maximum))
+
+
+# Deadline of the GraphQL operation being executed, set by DeadlineExtension
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left for the current request, None outside a request"""
+    deadline = current_deadline.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def deadline_expired() -> bool:
+    deadline = current_deadline.get()
+    return deadline is not None and deadline.expired
+
+
+async def within_deadline(func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """Await func, cancelling it and raising DeadlineExceeded when the request runs out of time"""
+    deadline = current_deadline.get()
+    if deadline is None:
+        return await func(*args, **kwargs)
+
+    deadline.check()
+    try:
+        return await asyncio.wait_for(func(*args, **kwargs), deadline.remaining())
+    except asyncio.TimeoutError:
+        if deadline.expired:
+            raise DeadlineExceeded(deadline.timeout, running=True) from None
+        raise
+
+
+def call_with_timeout(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking SDK call with the remaining time as its client-side `timeout`
+
+    Runs on the worker thread, which inherits the request's context, so the
+    SDK gives up on its own instead of holding the thread after the request
+    was abandoned.
+    """
+    deadline = current_deadline.get()
+    if deadline is not None:
+        deadline.check()
+        kwargs["timeout"] = deadline.remaining()
+    return func(*args, **kwargs)
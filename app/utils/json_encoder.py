@@ -0,0 +1,87 @@
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+from fastapi.responses import JSONResponse
+from decouple import config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Response encoder selection: "orjson" (default) or "json"
+RESPONSE_ENCODER = config('RESPONSE_ENCODER', default='orjson')
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types the standard library encoder doesn't handle"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StdlibJSONEncoder:
+    """Encoder backed by the standard library json module"""
+
+    name = "json"
+
+    def encode(self, value: Any) -> bytes:
+        # Same output as Starlette's JSONResponse and orjson: compact, UTF-8 rather than \u escapes
+        return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def decode(self, data: Any) -> Any:
+        return json.loads(data)
+
+
+class OrjsonEncoder:
+    """Encoder backed by orjson, which handles datetime, enum and UUID natively"""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def encode(self, value: Any) -> bytes:
+        return self._orjson.dumps(value, default=_default, option=self._options)
+
+    def decode(self, data: Any) -> Any:
+        return self._orjson.loads(data)
+
+
+ENCODERS = {
+    StdlibJSONEncoder.name: StdlibJSONEncoder,
+    OrjsonEncoder.name: OrjsonEncoder,
+}
+
+
+def get_response_encoder(name: str = RESPONSE_ENCODER):
+    """Create the configured encoder, falling back to the standard library"""
+    encoder_class = ENCODERS.get(name)
+    if encoder_class is None:
+        logger.warning(f"Unknown response encoder '{name}', using json")
+        return StdlibJSONEncoder()
+
+    try:
+        return encoder_class()
+    except ImportError:
+        logger.warning(f"Response encoder '{name}' is not installed, using json")
+        return StdlibJSONEncoder()
+
+
+# Global response encoder instance
+response_encoder = get_response_encoder()
+
+
+class EncodedJSONResponse(JSONResponse):
+    """JSON response rendered with the configured response encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return response_encoder.encode(content)
@@ -0,0 +1,313 @@
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from decouple import config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Metrics configuration
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+# Label combinations kept per metric; further ones are counted under "other"
+METRICS_MAX_SERIES = config('METRICS_MAX_SERIES', default=200, cast=int)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+OVERFLOW_LABEL = "other"
+REQUEST_CHARGE_HEADER = "x-ms-request-charge"
+
+# Seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Request units
+REQUEST_CHARGE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    """Labelled series of one metric, capped at `max_series` label combinations
+
+    Updates may come from worker threads (Cosmos calls), so series are
+    created and updated under a lock.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), max_series: int = METRICS_MAX_SERIES):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._series: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _new_series(self) -> Any:
+        raise NotImplementedError
+
+    def _series_for(self, labels: Tuple[str, ...]) -> Any:
+        series = self._series.get(labels)
+        if series is None:
+            if len(self._series) >= self.max_series:
+                labels = (OVERFLOW_LABEL,) * len(self.labelnames)
+                series = self._series.get(labels)
+            if series is None:
+                series = self._series.setdefault(labels, self._new_series())
+        return series
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class HistogramSeries:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    """Fixed-bucket histogram; an observation is a bisect and three additions"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        max_series: int = METRICS_MAX_SERIES
+    ):
+        super().__init__(name, documentation, labelnames, max_series)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self) -> HistogramSeries:
+        # One slot per bucket plus +Inf
+        return HistogramSeries(len(self.buckets) + 1)
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series_for(labels)
+            series.counts[index] += 1
+            series.total += value
+            series.count += 1
+
+    def snapshot(self, *labels: str) -> Optional[HistogramSeries]:
+        return self._series.get(labels)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        bounds = [*self.buckets, float("inf")]
+        with self._lock:
+            for labels, series in self._series.items():
+                cumulative = 0
+                for bound, count in zip(bounds, series.counts):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+                label_text = _format_labels(self.labelnames, labels)
+                lines.append(f"{self.name}_sum{label_text} {_format_value(series.total)}")
+                lines.append(f"{self.name}_count{label_text} {series.count}")
+        return lines
+
+
+class MetricFamily:
+    """Samples produced at scrape time by a collector, e.g. from existing stats counters"""
+
+    def __init__(self, name: str, documentation: str, kind: str = "gauge", labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.samples: List[Tuple[Tuple[str, ...], float]] = []
+
+    def add(self, value: float, *labels: str) -> "MetricFamily":
+        self.samples.append((labels, value))
+        return self
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.samples:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics recorded in process, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        self.collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[MetricFamily]]):
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            try:
+                for family in collector():
+                    lines.extend(family.render())
+            except Exception as e:
+                logger.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+        return "\n".join(lines) + "\n"
+
+
+# Global registry served by /metrics
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to answer HTTP requests, by GraphQL operation name for /graphql",
+    ("method", "path", "status", "operation")
+)
+resolver_duration = registry.histogram(
+    "graphql_resolver_duration_seconds",
+    "Time spent in async GraphQL resolvers, by parent type and field",
+    ("field",)
+)
+cosmos_call_duration = registry.histogram(
+    "cosmos_call_duration_seconds",
+    "Duration of Cosmos DB SDK calls, by data-layer function",
+    ("function",)
+)
+cosmos_request_charge = registry.histogram(
+    "cosmos_request_charge",
+    "Request units charged per Cosmos DB SDK call, by data-layer function",
+    ("function",),
+    buckets=REQUEST_CHARGE_BUCKETS
+)
+auth_verification_duration = registry.histogram(
+    "auth_verification_duration_seconds",
+    "Time to verify bearer tokens",
+    ("result",)
+)
+
+
+# Data-layer function on whose behalf Cosmos calls are made, set by @data_function
+current_data_function: ContextVar[str] = ContextVar("current_data_function", default="unknown")
+
+
+def data_function(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Attribute the Cosmos calls made while `func` runs to its name
+
+    The innermost decorated function wins, so helpers shared by several
+    entry points report under whichever one called them.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = current_data_function.set(name)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            current_data_function.reset(token)
+
+    return wrapper
+
+
+class RequestCharge:
+    __slots__ = ("total",)
+
+    def __init__(self):
+        self.total = 0.0
+
+
+# Request units of the SDK call running on this worker thread
+current_request_charge: ContextVar[Optional[RequestCharge]] = ContextVar("current_request_charge", default=None)
+
+
+def record_request_charge(pipeline_response: Any):
+    """Cosmos client `raw_response_hook`: add each HTTP response's charge to the running call
+
+    Queries fetch their pages with one HTTP request each, all on the thread
+    that iterates them, so the charges of a whole call add up here.
+    """
+    charge = current_request_charge.get()
+    if charge is None:
+        return
+    try:
+        charge.total += float(pipeline_response.http_response.headers.get(REQUEST_CHARGE_HEADER) or 0)
+    except (AttributeError, TypeError, ValueError):
+        pass
+
+
+def measure_cosmos_call(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking SDK call on the worker thread, recording its duration and request charge"""
+    charge = RequestCharge()
+    token = current_request_charge.set(charge)
+    started = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - started
+        current_request_charge.reset(token)
+        function = current_data_function.get()
+        cosmos_call_duration.observe(elapsed, function)
+        cosmos_request_charge.observe(charge.total, function)
+
+
+def cache_metrics(caches: Dict[str, Any]) -> List[MetricFamily]:
+    """Hit and miss counters plus the lifetime hit ratio of caches exposing `hits` and `misses`"""
+    hits = MetricFamily("cache_hits_total", "Lookups answered from the cache", "counter", ("cache",))
+    misses = MetricFamily("cache_misses_total", "Lookups the cache could not answer", "counter", ("cache",))
+    ratio = MetricFamily("cache_hit_ratio", "Share of lookups answered from the cache since start", "gauge", ("cache",))
+    for name, cache in caches.items():
+        hits.add(cache.hits, name)
+        misses.add(cache.misses, name)
+        lookups = cache.hits + cache.misses
+        ratio.add(cache.hits / lookups if lookups else 0.0, name)
+    return [hits, misses, ratio]
+
+
+# Key in the ASGI scope state under which the GraphQL operation name is passed to MetricsMiddleware
+OPERATION_STATE_KEY = "graphql_operation"
+ANONYMOUS_OPERATION = "anonymous"
+BATCH_OPERATION = "batch"
+
+
+def tag_operation(scope: Dict[str, Any], name: Optional[str]):
+    """Record the GraphQL operation an HTTP request carried, batches of different ones as "batch\""""
+    state = scope.setdefault("state", {})
+    name = name or ANONYMOUS_OPERATION
+    previous = state.get(OPERATION_STATE_KEY)
+    state[OPERATION_STATE_KEY] = name if previous in (None, name) else BATCH_OPERATION
@@ -1,6 +1,6 @@
 import base64
 import json
-from typing import Optional
+from typing import Any, List, Optional, Tuple
 
 def encode_cursor(offset: int) -> str:
     """Encode offset as base64 cursor"""
@@ -15,4 +15,38 @@ def decode_cursor(cursor: str) -> int:
         cursor_data = json.loads(cursor_json)
         return cursor_data.get("offset", 0)
     except Exception:
-        return 0
\ No newline at end of file
+        return 0
+
+def encode_keyset_cursor(updated_at: str, item_id: str) -> str:
+    """Encode the sort key of the last returned item as base64 cursor"""
+    cursor_json = json.dumps({"updated_at": updated_at, "id": item_id})
+    return base64.b64encode(cursor_json.encode()).decode()
+
+def decode_keyset_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Decode a keyset cursor to (updated_at, id), None if missing or invalid"""
+    if not cursor:
+        return None
+    try:
+        cursor_json = base64.b64decode(cursor.encode()).decode()
+        cursor_data = json.loads(cursor_json)
+        return cursor_data["updated_at"], cursor_data["id"]
+    except Exception:
+        return None
+
+def encode_sort_cursor(order: str, key: List[Any]) -> str:
+    """Encode the sort key of the last returned item together with the ordering it belongs to"""
+    cursor_json = json.dumps({"order": order, "key": key})
+    return base64.b64encode(cursor_json.encode()).decode()
+
+def decode_sort_cursor(cursor: Optional[str], order: str) -> Optional[List[Any]]:
+    """Decode a sort cursor to its key, None if missing, invalid or from another ordering"""
+    if not cursor:
+        return None
+    try:
+        cursor_json = base64.b64decode(cursor.encode()).decode()
+        cursor_data = json.loads(cursor_json)
+        if cursor_data["order"] != order:
+            return None
+        return list(cursor_data["key"])
+    except Exception:
+        return None
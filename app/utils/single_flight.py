@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Collapse concurrent calls sharing a key into one underlying call
+
+    The first caller for a key (the leader) does the work, every caller that
+    arrives while it is in flight waits for and shares the leader's result.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def begin(self, key: Hashable) -> Tuple[asyncio.Future, bool]:
+        """Join the flight for a key, returns (future, is_leader)"""
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return future, False
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        return future, True
+
+    def finish(
+        self,
+        key: Hashable,
+        future: asyncio.Future,
+        result: Any = None,
+        error: Optional[BaseException] = None
+    ):
+        """Publish the leader's outcome to the waiters and close the flight"""
+        self._forget(key, future)
+
+        if future.done():
+            return
+
+        if error is not None:
+            future.set_exception(error)
+            # Mark the exception as retrieved when nobody was waiting
+            future.exception()
+        else:
+            future.set_result(result)
+
+    async def wait(self, future: asyncio.Future) -> Any:
+        """Wait for the leader without letting our own cancellation cancel it"""
+        return await asyncio.shield(future)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run `func` once for all concurrent callers using the same key"""
+        future, is_leader = self.begin(key)
+
+        if not is_leader:
+            try:
+                return await self.wait(future)
+            except asyncio.CancelledError:
+                # The leader was cancelled but we were not, run the call ourselves
+                task = asyncio.current_task()
+                if task is not None and task.cancelling():
+                    raise
+                return await self.do(key, func)
+
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            self._forget(key, future)
+            future.cancel()
+            raise
+        except Exception as e:
+            self.finish(key, future, error=e)
+            raise
+
+        self.finish(key, future, result=result)
+        return result
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+    def in_flight(self) -> int:
+        return len(self._calls)
@@ -0,0 +1,38 @@
+# bench_compression.py
+
+import argparse
+import timeit
+
+from app.middleware.compression import BrotliCompressor, GzipCompressor, brotli
+from app.utils.json_encoder import OrjsonEncoder
+from benchmarks.bench_json_encoding import build_project_page
+
+
+def run_benchmark(size: int, number: int):
+    body = OrjsonEncoder().encode(build_project_page(size))
+    candidates = [("gzip", level, GzipCompressor) for level in (1, 6, 9)]
+    if brotli is not None:
+        candidates += [("br", quality, BrotliCompressor) for quality in (1, 4, 8, 11)]
+
+    print(f"Compressing a {size}-edge projects response of {len(body)} bytes ({number} iterations)")
+    print(f"{'encoding':<9} {'level':>5} {'ms/op':>10} {'bytes':>10} {'ratio':>7} {'MB/s':>8}")
+
+    for encoding, level, compressor in candidates:
+        seconds = min(timeit.repeat(
+            lambda: compressor.compress_all(body, level), number=number, repeat=3
+        ))
+        per_op = seconds / number
+        compressed = compressor.compress_all(body, level)
+        print(
+            f"{encoding:<9} {level:>5} {per_op * 1000:>10.3f} {len(compressed):>10} "
+            f"{len(body) / len(compressed):>6.1f}x {len(body) / per_op / 1e6:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response compression levels")
+    parser.add_argument("--size", type=int, default=500, help="Number of edges in the page")
+    parser.add_argument("--number", type=int, default=10, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    run_benchmark(args.size, args.number)
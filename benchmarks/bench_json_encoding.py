@@ -0,0 +1,84 @@
+# bench_json_encoding.py
+
+import argparse
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from app.models.project import ProjectPriority, ProjectStatus
+from app.utils.json_encoder import OrjsonEncoder, StdlibJSONEncoder
+
+
+def build_project_page(size: int = 500, serialized: bool = True) -> dict:
+    """Build a ProjectConnection response with `size` edges
+
+    With `serialized` the values look like Strawberry's output (ISO strings),
+    otherwise they keep datetime and enum objects like the REST endpoints.
+    """
+    now = datetime.now(timezone.utc)
+    edges = []
+    for i in range(size):
+        created_at = now - timedelta(days=i)
+        node = {
+            "id": f"6f1c2a4e-0000-4000-8000-{i:012d}",
+            "projectId": f"PROJ-2024-{i:04d}",
+            "name": f"Project {i}",
+            "description": "Modern e-commerce solution with React and Node.js",
+            "status": ProjectStatus.ACTIVE,
+            "priority": ProjectPriority.HIGH,
+            "tags": ["web", "ecommerce", "react"],
+            "ownerId": "test-user-123",
+            "budget": 50000.0 + i,
+            "createdAt": created_at,
+            "updatedAt": created_at,
+        }
+        if serialized:
+            node.update(
+                status=node["status"].value,
+                priority=node["priority"].value,
+                createdAt=created_at.isoformat(),
+                updatedAt=created_at.isoformat(),
+            )
+        edges.append({"node": node, "cursor": f"eyJvZmZzZXQiOiB7{i}fQ=="})
+
+    return {
+        "data": {
+            "projects": {
+                "edges": edges,
+                "pageInfo": {
+                    "hasNextPage": True,
+                    "hasPreviousPage": False,
+                    "startCursor": edges[0]["cursor"] if edges else None,
+                    "endCursor": edges[-1]["cursor"] if edges else None,
+                    "totalCount": size * 4,
+                },
+            }
+        }
+    }
+
+
+def run_benchmark(size: int, number: int):
+    encoders = [StdlibJSONEncoder(), OrjsonEncoder()]
+
+    print(f"Encoding a {size}-edge ProjectConnection page ({number} iterations)")
+    print(f"{'payload':<12} {'encoder':<8} {'ms/op':>10} {'bytes':>10} {'speedup':>8}")
+
+    for label, serialized in (("graphql", True), ("rest", False)):
+        page = build_project_page(size, serialized=serialized)
+        baseline = None
+        for encoder in encoders:
+            seconds = min(timeit.repeat(lambda: encoder.encode(page), number=number, repeat=5))
+            per_op_ms = seconds / number * 1000
+            baseline = baseline or per_op_ms
+            print(
+                f"{label:<12} {encoder.name:<8} {per_op_ms:>10.3f} "
+                f"{len(encoder.encode(page)):>10} {baseline / per_op_ms:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GraphQL response encoding")
+    parser.add_argument("--size", type=int, default=500, help="Number of edges in the page")
+    parser.add_argument("--number", type=int, default=50, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    run_benchmark(args.size, args.number)
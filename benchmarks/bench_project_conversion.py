@@ -0,0 +1,94 @@
+# bench_project_conversion.py
+
+import argparse
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from app.database.converters import convert_item_to_project, convert_item_to_project_record
+
+FIELDS = (
+    "id", "project_id", "name", "description", "status", "priority",
+    "tags", "owner_id", "budget", "created_at", "updated_at",
+)
+
+
+def build_items(size: int = 500) -> list:
+    """Build documents shaped like the ones Cosmos DB returns for projects"""
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(size):
+        timestamp = (now - timedelta(hours=i)).isoformat()
+        items.append({
+            "id": f"6f1c2a4e-0000-4000-8000-{i:012d}",
+            "project_id": f"PROJ-2024-{i:04d}",
+            "name": f"Project {i}",
+            "description": "Real-time data processing and visualization",
+            "status": "ACTIVE",
+            "priority": "HIGH",
+            "tags": ["data", "analytics", "bi"],
+            "owner_id": "test-user-123",
+            "budget": 75000.0,
+            "created_at": timestamp,
+            "updated_at": timestamp,
+            "_rid": "abc==",
+            "_self": f"dbs/abc==/colls/def==/docs/{i}/",
+            "_etag": "\"00000000-0000-0000-0000-000000000000\"",
+            "_attachments": "attachments/",
+            "_ts": 1700000000 + i,
+        })
+    return items
+
+
+def convert_page(convert, items: list, touch_fields: bool) -> list:
+    # The model path mutates its input, so both paths convert shallow copies
+    projects = [convert(dict(item)) for item in items]
+    if touch_fields:
+        for project in projects:
+            for field in FIELDS:
+                getattr(project, field)
+    return projects
+
+
+def measure_memory(convert, items: list) -> int:
+    copies = [dict(item) for item in items]
+    tracemalloc.start()
+    projects = [convert(item) for item in copies]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del projects
+    return size
+
+
+def run_benchmark(size: int, number: int):
+    items = build_items(size)
+    converters = [
+        ("pydantic", convert_item_to_project),
+        ("record", convert_item_to_project_record),
+    ]
+
+    print(f"Converting a {size}-item projects page ({number} iterations)")
+    print(f"{'converter':<10} {'fields':<8} {'ms/op':>10} {'speedup':>8} {'KiB':>10}")
+
+    for touch_fields in (False, True):
+        baseline = None
+        for name, convert in converters:
+            seconds = min(timeit.repeat(
+                lambda: convert_page(convert, items, touch_fields), number=number, repeat=5
+            ))
+            per_op_ms = seconds / number * 1000
+            baseline = baseline or per_op_ms
+            memory_kib = measure_memory(convert, items) / 1024
+            print(
+                f"{name:<10} {'all' if touch_fields else 'none':<8} {per_op_ms:>10.3f} "
+                f"{baseline / per_op_ms:>7.1f}x {memory_kib:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark project document conversion")
+    parser.add_argument("--size", type=int, default=500, help="Number of documents in the page")
+    parser.add_argument("--number", type=int, default=20, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    run_benchmark(args.size, args.number)
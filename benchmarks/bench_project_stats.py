@@ -0,0 +1,45 @@
+# bench_project_stats.py
+
+import argparse
+import timeit
+
+from app.database import snapshot, stats
+from app.database.stats import compute_project_stats
+from benchmarks.bench_replica import build_items
+
+
+def run_benchmark(size: int, number: int):
+    items = build_items(size)
+    for i, item in enumerate(items):
+        item["budget"] = None if i % 10 == 0 else float(1000 + (i * 7919) % 250000)
+
+    engines = [("python", lambda fields: compute_project_stats(items, fields, use_numpy=False))]
+    if stats.np is not None:
+        engines.append(("numpy", lambda fields: compute_project_stats(items, fields, use_numpy=True)))
+    else:
+        print("numpy is not installed, timing the pure Python path only")
+    if snapshot.pa is not None:
+        # Columns already laid out, as read from the snapshot file
+        table = snapshot.pa.Table.from_batches([snapshot.to_record_batch(items)])
+        engines.append(("arrow", lambda fields: snapshot.table_stats(table, fields)))
+    else:
+        print("pyarrow is not installed, skipping the snapshot path")
+
+    print(f"{'groupBy':<16} {'groups':>7} " + " ".join(f"{name + ' ms':>10}" for name, _ in engines))
+    for fields in ([], ["status"], ["status", "priority"], ["owner_id"], ["tags"]):
+        group_count = len(compute_project_stats(items, fields, use_numpy=False))
+        timings = [
+            min(timeit.repeat(lambda: engine(fields), number=number, repeat=5)) / number * 1000
+            for _, engine in engines
+        ]
+        label = "+".join(fields) or "(none)"
+        print(f"{label:<16} {group_count:>7} " + " ".join(f"{timing:>10.2f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark projectStats aggregation: pure Python, NumPy and the Arrow snapshot")
+    parser.add_argument("--size", type=int, default=10000, help="Number of projects to aggregate")
+    parser.add_argument("--number", type=int, default=10, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    run_benchmark(args.size, args.number)
@@ -0,0 +1,89 @@
+# bench_replica.py
+
+import argparse
+import random
+import timeit
+from types import SimpleNamespace
+
+from app.database.filters import project_matches_filter
+from app.database.replica import ProjectReplica
+from app.models.project import ProjectPriority, ProjectStatus
+
+STATUSES = ["ACTIVE", "INACTIVE", "COMPLETED", "ARCHIVED"]
+PRIORITIES = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+TAGS = ["web", "mobile", "api", "data", "analytics", "ml", "infra", "security"]
+
+
+def build_items(size: int) -> list:
+    rng = random.Random(42)
+    return [
+        {
+            "id": f"6f1c2a4e-0000-4000-8000-{i:012d}",
+            "project_id": f"PROJ-2024-{i:05d}",
+            "name": f"Project {i}",
+            "description": "Real-time data processing and visualization",
+            "status": rng.choice(STATUSES),
+            "priority": rng.choice(PRIORITIES),
+            "tags": rng.sample(TAGS, rng.randint(1, 3)),
+            "owner_id": f"user-{rng.randint(0, 199)}",
+            "budget": 75000.0,
+            "created_at": f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T10:{i % 60:02d}:00.{i:06d}+00:00",
+            "updated_at": "2024-12-01T10:00:00+00:00",
+        }
+        for i in range(size)
+    ]
+
+
+def make_filter(**values):
+    fields = dict(status=None, priority=None, owner_id=None, tags=None, search=None)
+    fields.update(values)
+    return SimpleNamespace(**fields)
+
+
+def scan_page(items: list, filter, skip: int, limit: int):
+    """Filter, sort and slice every item, the work a replica without indexes would do"""
+    matches = [item for item in items if project_matches_filter(item, filter)]
+    matches.sort(key=lambda item: (item["created_at"], item["id"]), reverse=True)
+    return matches[skip:skip + limit], len(matches)
+
+
+def run_benchmark(size: int, number: int):
+    items = build_items(size)
+    replica = ProjectReplica(refresh_interval=0)
+    replica.load(items)
+
+    statuses = iter(STATUSES * number)
+    write_us = min(timeit.repeat(
+        lambda: (replica.upsert(dict(items[0], status=next(statuses))), replica.query(None, 0, 1)),
+        number=number, repeat=1
+    )) / number * 1e6
+    print(f"Replica of {size} projects, write and read back: {write_us:.1f} us")
+
+    filters = [
+        ("none", None),
+        ("status", make_filter(status=ProjectStatus.ACTIVE)),
+        ("status+priority", make_filter(status=ProjectStatus.ACTIVE, priority=ProjectPriority.HIGH)),
+        ("tags(any of 2)", make_filter(tags=["web", "ml"])),
+        ("owner+tags", make_filter(owner_id="user-7", tags=["api", "data"])),
+    ]
+
+    print(f"{'filter':<16} {'page':<10} {'scan us/op':>12} {'bitmap us/op':>13} {'speedup':>8}")
+    for label, filter in filters:
+        for skip in (0, size // 2):
+            scan = min(timeit.repeat(lambda: scan_page(items, filter, skip, 11), number=number, repeat=5))
+            bitmap = min(timeit.repeat(lambda: replica.query(filter, skip, 11), number=number, repeat=5))
+            scan_us = scan / number * 1e6
+            bitmap_us = bitmap / number * 1e6
+            print(
+                f"{label:<16} {'skip ' + str(skip):<10} {scan_us:>12.1f} {bitmap_us:>13.1f} "
+                f"{scan_us / bitmap_us:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark filtered paging on the local projects replica")
+    parser.add_argument("--size", type=int, default=10000, help="Number of projects in the replica")
+    parser.add_argument("--number", type=int, default=50, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    run_benchmark(args.size, args.number)
@@ -0,0 +1,42 @@
+# factories.py
+
+import random
+from types import SimpleNamespace
+
+STATUSES = ["ACTIVE", "INACTIVE", "COMPLETED"]
+PRIORITIES = ["LOW", "MEDIUM", "HIGH"]
+TAGS = ["web", "mobile", "api", "data"]
+
+
+def make_items(count: int, seed: int = 7):
+    """Raw project items as stored in Cosmos DB"""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"id-{i}",
+            "name": f"Project {i}",
+            "description": "Platform work" if i % 3 else None,
+            "status": rng.choice(STATUSES),
+            "priority": rng.choice(PRIORITIES),
+            "owner_id": f"user-{i % 4}",
+            "tags": rng.sample(TAGS, rng.randint(0, 2)),
+            "created_at": f"2024-01-{1 + i % 28:02d}T10:00:{i % 60:02d}+00:00",
+            "updated_at": "2024-02-01T10:00:00+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def make_filter(**values):
+    """Stand-in for ProjectFilter, which can't be imported without a database client"""
+    fields = dict(status=None, priority=None, owner_id=None, tags=None, search=None)
+    fields.update(values)
+    return SimpleNamespace(**fields)
+
+
+def make_order(*entries):
+    """Stand-in for ProjectOrder inputs, e.g. make_order(("budget", "DESC"))"""
+    return [
+        SimpleNamespace(field=SimpleNamespace(value=field), direction=SimpleNamespace(value=direction))
+        for field, direction in entries
+    ]
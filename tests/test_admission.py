@@ -0,0 +1,111 @@
+# test_admission.py
+
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.auth.identities import VerifiedTokens, client_identity
+from app.middleware import admission
+from app.middleware.admission import AdmissionControlMiddleware, AdmissionController, ClientLimits, ConcurrencyGate
+
+
+def make_app(controller):
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware, controller=controller, paths=("/graphql",))
+    release = asyncio.Event()
+
+    @app.post("/graphql")
+    async def graphql(wait: bool = False):
+        if wait:
+            await release.wait()
+        return JSONResponse({"data": {}})
+
+    @app.get("/health")
+    async def health():
+        return JSONResponse({"status": "healthy"})
+
+    return app, release
+
+
+def client_at(app, host):
+    """Async client whose requests come from the given address"""
+    transport = httpx.ASGITransport(app=app, client=(host, 1234))
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+class TestAdmissionControl:
+    """Test suite for admission control on /graphql"""
+
+    def test_token_bucket_refills(self):
+        """Test 1: A client gets its burst, then waits for tokens at the configured rate"""
+        now = [0.0]
+        limits = ClientLimits(rate=2, burst=3, clock=lambda: now[0])
+        assert [limits.take("oid:a") for _ in range(3)] == [0, 0, 0]
+        assert limits.take("oid:a") == pytest.approx(0.5)
+        assert limits.take("oid:b") == 0
+
+        now[0] = 1.0
+        assert [limits.take("oid:a") for _ in range(2)] == [0, 0]
+        assert limits.take("oid:a") > 0
+
+    def test_rate_limited_per_verified_identity(self, monkeypatch):
+        """Test 2: Clients are told to back off with 429 and Retry-After; other clients and paths are unaffected"""
+        tokens = VerifiedTokens()
+        tokens.remember("token-a", client_identity({"oid": "user-a", "appid": "app"}))
+        tokens.remember("token-b", client_identity({"appid": "app-b"}))
+        monkeypatch.setattr(admission, "verified_tokens", tokens)
+        controller = AdmissionController(clients=ClientLimits(rate=0.1, burst=2))
+        client = TestClient(make_app(controller)[0])
+
+        headers = {"Authorization": "Bearer token-a"}
+        assert [client.post("/graphql", headers=headers).status_code for _ in range(2)] == [200, 200]
+        response = client.post("/graphql", headers=headers)
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "10"
+
+        assert client.post("/graphql", headers={"Authorization": "Bearer token-b"}).status_code == 200
+        assert client.get("/health").status_code == 200
+        assert controller.rate_limited == 1 and controller.admitted == 3
+
+    @pytest.mark.asyncio
+    async def test_gate_queue_is_bounded(self):
+        """Test 3: Waiters get freed slots in order; a full queue or a long wait is refused"""
+        gate = ConcurrencyGate(limit=1, max_queue=1)
+        assert await gate.acquire(0.1)
+        assert not await gate.acquire(0.01)
+
+        waiter = asyncio.ensure_future(gate.acquire(1))
+        await asyncio.sleep(0)
+        assert gate.queued == 1
+        assert not await gate.acquire(1)
+
+        gate.release()
+        assert await waiter
+        assert gate.in_flight == 1 and gate.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_overload_is_shed(self):
+        """Test 4: With the server saturated, requests get 503 after the queue timeout; one client can't hold every slot"""
+        controller = AdmissionController(
+            gate=ConcurrencyGate(limit=2, max_queue=4),
+            clients=ClientLimits(rate=100, burst=100, concurrency=1),
+            queue_timeout=0.05
+        )
+        app, release = make_app(controller)
+        async with client_at(app, "10.0.0.1") as first, client_at(app, "10.0.0.2") as second, client_at(app, "10.0.0.3") as third:
+            held = [asyncio.ensure_future(client.post("/graphql?wait=true")) for client in (first, second)]
+            await asyncio.sleep(0.01)
+            assert (await first.post("/graphql")).status_code == 429
+
+            response = await third.post("/graphql")
+            assert response.status_code == 503
+            assert response.headers["retry-after"] == "1"
+
+            release.set()
+            assert [response.status_code for response in await asyncio.gather(*held)] == [200, 200]
+
+        assert controller.stats()["in_flight"] == 0
+        assert controller.shed == 1 and controller.client_concurrency_limited == 1
@@ -0,0 +1,117 @@
+# test_batching.py
+
+import asyncio
+import time
+import strawberry
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.router import AppGraphQLRouter
+
+context_calls = []
+writes = []
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def echo(self, value: str) -> str:
+        return value
+
+    @strawberry.field
+    async def slow(self, seconds: float) -> float:
+        await asyncio.sleep(seconds)
+        return seconds
+
+    @strawberry.field
+    def context_id(self, info: strawberry.types.Info) -> str:
+        return str(id(info.context))
+
+
+async def get_context():
+    context = {"loaders": object()}
+    context_calls.append(context)
+    return context
+
+
+@strawberry.type
+class Mutation:
+    @strawberry.mutation
+    async def write(self, value: str, seconds: float = 0) -> str:
+        await asyncio.sleep(seconds)
+        writes.append(value)
+        return value
+
+
+schema = strawberry.Schema(query=Query, mutation=Mutation)
+router = AppGraphQLRouter(schema, context_getter=get_context)
+router.max_batch_size = 3
+
+app = FastAPI()
+app.include_router(router, prefix="/graphql")
+client = TestClient(app)
+
+
+class TestBatching:
+    """Test suite for batched GraphQL operations"""
+
+    def test_results_in_request_order(self):
+        """Test 1: A JSON array returns one result per operation, in order"""
+        response = client.post("/graphql", json=[
+            {"query": "{ echo(value: \"a\") }"},
+            {"query": "query Echo($v: String!) { echo(value: $v) }", "variables": {"v": "b"}},
+        ])
+        assert response.status_code == 200
+        assert [item["data"]["echo"] for item in response.json()] == ["a", "b"]
+
+    def test_operations_run_concurrently(self):
+        """Test 2: Slow operations overlap instead of running back to back"""
+        start = time.perf_counter()
+        response = client.post("/graphql", json=[{"query": "{ slow(seconds: 0.3) }"}] * 3)
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 200
+        assert len(response.json()) == 3
+        assert elapsed < 0.8
+
+    def test_context_shared_across_batch(self):
+        """Test 3: The context is built once and shared by every operation"""
+        context_calls.clear()
+        response = client.post("/graphql", json=[{"query": "{ contextId }"}] * 3)
+        ids = {item["data"]["contextId"] for item in response.json()}
+        assert len(context_calls) == 1
+        assert len(ids) == 1
+
+    def test_batch_size_limit(self):
+        """Test 4: Batches over the maximum size are rejected"""
+        response = client.post("/graphql", json=[{"query": "{ echo(value: \"a\") }"}] * 4)
+        assert response.status_code == 400
+
+    def test_errors_isolated_per_operation(self):
+        """Test 5: An invalid entry fails alone"""
+        response = client.post("/graphql", json=[
+            "not an operation",
+            {"query": "{ missingField }"},
+            {"query": "{ echo(value: \"ok\") }"},
+        ])
+        results = response.json()
+        assert response.status_code == 200
+        assert results[0]["data"] is None and results[0]["errors"]
+        assert results[1]["errors"]
+        assert results[2]["data"]["echo"] == "ok"
+
+    def test_single_operation_unchanged(self):
+        """Test 6: A JSON object body is still a single operation"""
+        response = client.post("/graphql", json={"query": "{ echo(value: \"a\") }"})
+        assert response.json() == {"data": {"echo": "a"}}
+
+    def test_mutations_run_in_request_order(self):
+        """Test 7: A mutation waits for the operations before it, so writes apply in order"""
+        writes.clear()
+        response = client.post("/graphql", json=[
+            {"query": "mutation { write(value: \"create\", seconds: 0.1) }"},
+            {"query": "mutation { write(value: \"update\") }"},
+            {"query": "{ echo(value: \"read\") }"},
+        ])
+        assert response.status_code == 200
+        assert writes == ["create", "update"]
+        assert [item["data"] for item in response.json()] == [{"write": "create"}, {"write": "update"}, {"echo": "read"}]
@@ -0,0 +1,152 @@
+# test_circuit_breaker.py
+
+import asyncio
+import pytest
+import strawberry
+from azure.cosmos.exceptions import CosmosHttpResponseError, CosmosResourceNotFoundError
+
+from app.database.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, StaleCache, is_outage, serve_stale
+)
+from app.extensions.stale_reads import StaleReadExtension
+from app.utils.deadline import Deadline, DeadlineExceeded, current_deadline, within_deadline
+
+stale_names = StaleCache()
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def name(self, id: str, fail: bool = False) -> str:
+        if not fail:
+            stale_names.remember(f"name-{id}", id)
+            return f"name-{id}"
+        error = CosmosHttpResponseError(status_code=503, message="Service unavailable")
+        stale = serve_stale(stale_names, [id], error)
+        if stale is None:
+            raise error
+        return stale[0]
+
+
+schema = strawberry.Schema(query=Query, extensions=[StaleReadExtension])
+
+
+def make_breaker(now):
+    return CircuitBreaker("projects", failure_rate=0.5, min_calls=4, window=10, open_duration=5, clock=lambda: now[0])
+
+
+async def succeed():
+    return "ok"
+
+
+async def unavailable():
+    raise CosmosHttpResponseError(status_code=503, message="Service unavailable")
+
+
+async def hang():
+    await asyncio.sleep(5)
+
+
+async def call_with_deadline(breaker, timeout, func):
+    """Run func under the breaker and a request deadline, the way run_read does"""
+    token = current_deadline.set(Deadline(timeout))
+    try:
+        return await breaker.call(within_deadline, func)
+    finally:
+        current_deadline.reset(token)
+
+
+class TestCircuitBreaker:
+    """Test suite for the container circuit breakers and stale read fallback"""
+
+    def test_outage_errors(self):
+        """Test 1: Only availability problems count against the circuit"""
+        assert is_outage(CosmosHttpResponseError(status_code=503, message="down"))
+        assert is_outage(CosmosHttpResponseError(status_code=429, message="throttled"))
+        assert is_outage(TimeoutError())
+        assert not is_outage(CosmosResourceNotFoundError(status_code=404, message="missing"))
+        assert not is_outage(ValueError("bad cursor"))
+
+    @pytest.mark.asyncio
+    async def test_opens_at_failure_rate_and_fails_fast(self):
+        """Test 2: The circuit opens once enough calls fail and then rejects without calling"""
+        now = [0.0]
+        breaker = make_breaker(now)
+        await breaker.call(succeed)
+        with pytest.raises(CosmosHttpResponseError):
+            await breaker.call(unavailable)
+        await breaker.call(succeed)
+        assert breaker.state == CLOSED
+
+        with pytest.raises(CosmosHttpResponseError):
+            await breaker.call(unavailable)
+        assert breaker.state == OPEN
+
+        calls = []
+        with pytest.raises(CircuitOpenError) as error:
+            await breaker.call(lambda: calls.append(1))
+        assert calls == [] and breaker.rejected == 1
+        assert error.value.retry_after == 5
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe(self):
+        """Test 3: After the open period one probe goes through; failure reopens, success closes"""
+        now = [0.0]
+        breaker = make_breaker(now)
+        for _ in range(4):
+            with pytest.raises(CosmosHttpResponseError):
+                await breaker.call(unavailable)
+        assert breaker.state == OPEN
+
+        now[0] = 5.0
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CosmosHttpResponseError):
+            await breaker.call(unavailable)
+        assert breaker.state == OPEN
+
+        now[0] = 10.0
+        breaker.allow()
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+        breaker.record(False, probe=True)
+        assert breaker.state == CLOSED
+        assert await breaker.call(succeed) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_stale_values_are_flagged(self):
+        """Test 4: Values served from the stale cache set extensions.stale, fresh ones don't"""
+        result = await schema.execute('{ name(id: "a") }')
+        assert result.data == {"name": "name-a"}
+        assert "stale" not in (result.extensions or {})
+
+        result = await schema.execute('{ name(id: "a", fail: true) }')
+        assert result.data == {"name": "name-a"}
+        assert result.extensions["stale"] is True
+
+        result = await schema.execute('{ name(id: "b", fail: true) }')
+        assert result.errors and "stale" not in (result.extensions or {})
+
+    @pytest.mark.asyncio
+    async def test_calls_cut_off_by_the_deadline(self):
+        """Test 5: Calls still hanging at the deadline open the circuit, a timed-out probe reopens it"""
+        now = [0.0]
+        breaker = make_breaker(now)
+        for _ in range(4):
+            with pytest.raises(DeadlineExceeded):
+                await call_with_deadline(breaker, 0.01, hang)
+        assert breaker.state == OPEN
+
+        now[0] = 5.0
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(DeadlineExceeded):
+            await call_with_deadline(breaker, 0.01, hang)
+        assert breaker.state == OPEN
+
+        # Out of time before the call starts: not recorded, the probe slot is given back
+        now[0] = 10.0
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(DeadlineExceeded):
+            await call_with_deadline(breaker, 0, succeed)
+        assert breaker.state == HALF_OPEN
+        assert await call_with_deadline(breaker, 1, succeed) == "ok"
+        assert breaker.state == CLOSED
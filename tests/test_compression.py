@@ -0,0 +1,92 @@
+# test_compression.py
+
+import gzip
+import brotli
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware, choose_encoding
+
+LARGE_PAYLOAD = {"projects": [{"id": str(i), "name": f"Project {i}"} for i in range(200)]}
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=500, paths=("/graphql", "/export"))
+
+
+@app.get("/graphql")
+async def graphql():
+    return JSONResponse(LARGE_PAYLOAD)
+
+
+@app.get("/graphql/small")
+async def graphql_small():
+    return JSONResponse({"data": None})
+
+
+@app.get("/export/stream")
+async def export_stream():
+    async def rows():
+        for i in range(100):
+            yield f'{{"id": "{i}"}}\n'.encode()
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+@app.get("/health")
+async def health():
+    return JSONResponse(LARGE_PAYLOAD)
+
+
+client = TestClient(app)
+
+
+def raw_get(path: str, accept_encoding: str):
+    # Ask httpx not to decode so the encoded bytes can be checked
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestCompression:
+    """Test suite for the compression middleware"""
+
+    def test_brotli_preferred_when_accepted(self):
+        """Test 1: Brotli is chosen over gzip"""
+        response, body = raw_get("/graphql", "gzip, deflate, br")
+        assert response.headers["content-encoding"] == "br"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) == len(body)
+        assert brotli.decompress(body) == client.get("/graphql", headers={"Accept-Encoding": "identity"}).content
+
+    def test_gzip_fallback(self):
+        """Test 2: Gzip is used when brotli is not accepted"""
+        response, body = raw_get("/graphql", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(body).startswith(b'{"projects"')
+
+    def test_small_responses_not_compressed(self):
+        """Test 3: Responses below the minimum size are sent as is"""
+        response, body = raw_get("/graphql/small", "br, gzip")
+        assert "content-encoding" not in response.headers
+        assert body == b'{"data":null}'
+
+    def test_streamed_responses_are_compressed(self):
+        """Test 4: Streamed bodies are compressed chunk by chunk"""
+        response, body = raw_get("/export/stream", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        lines = gzip.decompress(body).decode().splitlines()
+        assert len(lines) == 100
+
+    def test_other_paths_untouched(self):
+        """Test 5: Only configured paths are compressed"""
+        response, _ = raw_get("/health", "br, gzip")
+        assert "content-encoding" not in response.headers
+
+    def test_negotiation(self):
+        """Test 6: Quality values and wildcards are respected"""
+        assert choose_encoding("br;q=0, gzip", ("br", "gzip")) == "gzip"
+        assert choose_encoding("gzip;q=0.5, br;q=0.8", ("br", "gzip")) == "br"
+        assert choose_encoding("*", ("br", "gzip")) == "br"
+        assert choose_encoding("identity", ("br", "gzip")) is None
+        assert choose_encoding("", ("br", "gzip")) is None
@@ -0,0 +1,86 @@
+# test_deadline.py
+
+import asyncio
+import pytest
+import strawberry
+from typing import Optional
+
+from app.extensions.deadline import DeadlineExtension
+from app.utils.deadline import (
+    Deadline, DeadlineExceeded, call_with_timeout, current_deadline, deadline_from_headers, within_deadline
+)
+
+
+async def slow_value(value: str, delay: float) -> str:
+    await asyncio.sleep(delay)
+    return value
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def fast(self) -> Optional[str]:
+        return await within_deadline(slow_value, "fast", 0)
+
+    @strawberry.field
+    async def slow(self) -> Optional[str]:
+        return await within_deadline(slow_value, "slow", 5)
+
+
+schema = strawberry.Schema(query=Query, extensions=[DeadlineExtension])
+
+
+class TestDeadline:
+    """Test suite for request deadlines"""
+
+    def test_deadline_from_headers(self):
+        """Test 1: The header sets the budget, capped at the maximum; bad values use the default"""
+        assert deadline_from_headers({"x-request-timeout": "2.5"}, default=10, maximum=30).timeout == 2.5
+        assert deadline_from_headers({"x-request-timeout": "600"}, default=10, maximum=30).timeout == 30
+        assert deadline_from_headers({"x-request-timeout": "soon"}, default=10, maximum=30).timeout == 10
+        assert deadline_from_headers({"x-request-timeout": "-1"}, default=10, maximum=30).timeout == 10
+        assert deadline_from_headers({}, default=10, maximum=30).timeout == 10
+
+    @pytest.mark.asyncio
+    async def test_work_is_cancelled_at_the_deadline(self):
+        """Test 2: Slow calls are cancelled once time runs out, later calls fail without starting"""
+        assert await within_deadline(slow_value, "no deadline", 0.01) == "no deadline"
+
+        started = []
+
+        async def tracked(delay):
+            started.append(delay)
+            await asyncio.sleep(delay)
+
+        token = current_deadline.set(Deadline(0.05))
+        try:
+            with pytest.raises(DeadlineExceeded):
+                await within_deadline(tracked, 5)
+            with pytest.raises(DeadlineExceeded):
+                await within_deadline(tracked, 0)
+        finally:
+            current_deadline.reset(token)
+        assert started == [5]
+
+    @pytest.mark.asyncio
+    async def test_sdk_calls_get_the_remaining_time(self):
+        """Test 3: Blocking calls on worker threads receive the remaining budget as `timeout`"""
+        def sdk_call(item, **kwargs):
+            return item, kwargs.get("timeout")
+
+        assert await asyncio.to_thread(call_with_timeout, sdk_call, "a") == ("a", None)
+
+        token = current_deadline.set(Deadline(2))
+        try:
+            item, timeout = await asyncio.to_thread(call_with_timeout, sdk_call, "b")
+        finally:
+            current_deadline.reset(token)
+        assert item == "b" and 1 < timeout <= 2
+
+    @pytest.mark.asyncio
+    async def test_partial_data_with_errors(self):
+        """Test 4: Fields resolved in time are returned next to errors for the ones that weren't"""
+        result = await schema.execute("{ fast slow }", context_value={"deadline": Deadline(0.1)})
+        assert result.data == {"fast": "fast", "slow": None}
+        assert [error.message for error in result.errors] == ["Request deadline of 0.1s exceeded"]
+        assert current_deadline.get() is None
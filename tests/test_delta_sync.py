@@ -0,0 +1,66 @@
+# test_delta_sync.py
+
+from datetime import datetime, timedelta, timezone
+
+from app.database.sync import (
+    build_changes_query,
+    make_tombstone,
+    merge_changes,
+    requires_full_resync,
+    to_timestamp,
+)
+from app.utils.pagination import decode_keyset_cursor, encode_keyset_cursor
+
+
+def change(item_id: str, minute: int) -> dict:
+    return {"id": item_id, "updated_at": f"2024-01-15T10:{minute:02d}:00+00:00"}
+
+
+class TestDeltaSync:
+    """Test suite for delta-sync helpers"""
+
+    def test_merge_orders_upserts_and_tombstones(self):
+        """Test 1: Both pages are merged by (updated_at, id) and cut at `first`"""
+        upserts = [change("a", 1), change("c", 3), change("e", 5)]
+        tombstones = [change("b", 2), change("d", 3)]
+        changes, has_next = merge_changes(upserts, tombstones, 4)
+        assert [(item["id"], deleted) for item, deleted in changes] == [
+            ("a", False), ("b", True), ("c", False), ("d", True)
+        ]
+        assert has_next is True
+
+        changes, has_next = merge_changes(upserts[:1], [], 4)
+        assert len(changes) == 1 and has_next is False
+
+    def test_query_resumes_after_cursor(self):
+        """Test 2: The cursor's sort key replaces `since` so ties aren't skipped"""
+        since = datetime(2024, 1, 15, 10, 0, tzinfo=timezone.utc)
+        query, parameters = build_changes_query(since, None, 11)
+        assert "c.updated_at > @since" in query and query.endswith("LIMIT 11")
+        assert parameters == [{"name": "@since", "value": "2024-01-15T10:00:00+00:00"}]
+
+        cursor = encode_keyset_cursor("2024-01-15T10:03:00+00:00", "c")
+        query, parameters = build_changes_query(since, decode_keyset_cursor(cursor), 11)
+        assert "c.updated_at = @after_ts AND c.id > @after_id" in query
+        assert {p["name"]: p["value"] for p in parameters} == {
+            "@after_ts": "2024-01-15T10:03:00+00:00", "@after_id": "c"
+        }
+        assert "ORDER BY c.updated_at ASC, c.id ASC" in query
+
+    def test_timestamps_match_stored_format(self):
+        """Test 3: Naive and offset datetimes are normalised to UTC ISO strings"""
+        assert to_timestamp(datetime(2024, 1, 15, 10, 0)) == "2024-01-15T10:00:00+00:00"
+        offset = timezone(timedelta(hours=2))
+        assert to_timestamp(datetime(2024, 1, 15, 12, 0, tzinfo=offset)) == "2024-01-15T10:00:00+00:00"
+        assert decode_keyset_cursor("not-a-cursor") is None
+
+    def test_tombstone_and_retention(self):
+        """Test 4: Tombstones sort like projects and old `since` values need a resync"""
+        deleted_at = datetime(2024, 1, 15, 10, 0, tzinfo=timezone.utc)
+        tombstone = make_tombstone("ECOM-2024-001", "cosmos-id-1", "test-user-123", deleted_at)
+        assert tombstone["updated_at"] == tombstone["deleted_at"] == "2024-01-15T10:00:00+00:00"
+        assert tombstone["id"] == "cosmos-id-1"
+
+        now = datetime.now(timezone.utc)
+        assert requires_full_resync(now - timedelta(days=365))
+        assert not requires_full_resync(now - timedelta(hours=1))
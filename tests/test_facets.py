@@ -0,0 +1,112 @@
+# test_facets.py
+
+import os
+import pytest
+from collections import Counter
+from unittest import mock
+
+from app.database.facets import build_facet_query, count_facets, top_counts
+from app.database.filters import project_matches_filter
+from app.database.replica import ProjectReplica
+from app.models.project import ProjectStatus
+from tests.factories import make_filter, make_items
+
+
+def expected_counts(items, filter, field):
+    counts = Counter()
+    for item in items:
+        if project_matches_filter(item, filter):
+            values = (item.get(field) or []) if field == "tags" else [item.get(field)]
+            counts.update(set(values))
+    return counts
+
+
+class FakeContainer:
+    """Projects container answering the facet query with the projects matching `filter`"""
+
+    id = "projects"
+
+    def __init__(self, items, filter):
+        self.items = items
+        self.filter = filter
+        self.queries = []
+
+    def query_items(self, query, parameters=None, **kwargs):
+        self.queries.append(query)
+        return iter([item for item in self.items if project_matches_filter(item, self.filter)])
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    """The data layer, imported without connecting to Cosmos DB"""
+    for name, value in {
+        "COSMOS_URL": "https://localhost:8081/", "COSMOS_KEY": "a2V5",
+        "AZURE_CLIENT_ID": "test", "AZURE_TENANT_ID": "test", "AZURE_AUDIENCE": "test",
+    }.items():
+        os.environ.setdefault(name, value)
+    with mock.patch("azure.cosmos.CosmosClient"):
+        import app.schema  # noqa: F401 - loads the schema before the data layer it imports
+        from app.database import connection
+    return connection
+
+
+class TestProjectFacets:
+    """Test suite for facet counts"""
+
+    def test_facet_query(self):
+        """Test 1: One projection of the faceted fields, no GROUP BY or JOIN"""
+        assert build_facet_query(["status"], "") == "SELECT c.status FROM c"
+        assert build_facet_query(["status", "tags"], "c.status = @status") == (
+            "SELECT c.status, c.tags FROM c WHERE c.status = @status"
+        )
+
+    def test_replica_counts_match_filter(self):
+        """Test 2: In-memory counts agree with counting the filtered projects"""
+        items = make_items(150)
+        replica = ProjectReplica(refresh_interval=0)
+        replica.load(items)
+        fields = ["status", "priority", "owner_id", "tags"]
+
+        for filter in (None, make_filter(status=ProjectStatus.ACTIVE), make_filter(search="platform", tags=["web"])):
+            counts = replica.facet_counts(filter, fields)
+            for field in fields:
+                observed = {value: count for value, count in counts[field].items() if count}
+                assert observed == dict(expected_counts(items, filter, field))
+
+    def test_top_counts(self):
+        """Test 3: Buckets are ordered by count then value, trimmed and cleaned"""
+        counts = {"web": 3, "api": 5, "data": 3, None: 9, "empty": 0}
+        assert top_counts(counts, 10) == [("api", 5), ("data", 3), ("web", 3)]
+        assert top_counts(counts, 2) == [("api", 5), ("data", 3)]
+
+    def test_duplicate_tags_count_once(self):
+        """Test 4: A project counts once per distinct tag, missing values count under None"""
+        items = [{"status": "ACTIVE", "tags": ["web", "web", "api"]}, {"status": "ACTIVE", "tags": None}, {}]
+        assert count_facets(items, ["status", "tags"]) == {
+            "status": {"ACTIVE": 2, None: 1},
+            "tags": {"web": 1, "api": 1},
+        }
+
+    @pytest.mark.asyncio
+    async def test_cosmos_path_matches_replica(self, connection, monkeypatch):
+        """Test 5: Without a warm replica, facets come from one query and match the replica's counts"""
+        from app.schema.types import ProjectDimension
+
+        items = make_items(120)
+        items[0] = dict(items[0], tags=["web", "web"])
+        filter = make_filter(status=ProjectStatus.ACTIVE)
+        container = FakeContainer(items, filter)
+        monkeypatch.setattr(connection.db_client, "projects_container", container)
+        monkeypatch.setattr(connection.project_replica, "ready", False)
+
+        dimensions = [ProjectDimension.STATUS, ProjectDimension.TAG, ProjectDimension.OWNER]
+        facets = await connection.get_project_facets(filter, dimensions, top=50)
+
+        assert len(container.queries) == 1
+        assert "GROUP BY" not in container.queries[0] and "JOIN" not in container.queries[0]
+        replica = ProjectReplica(refresh_interval=0)
+        replica.load(items)
+        expected = replica.facet_counts(filter, [dimension.value for dimension in dimensions])
+        for facet in facets:
+            observed = [(value.value, value.count) for value in facet.values]
+            assert observed == top_counts(expected[facet.dimension.value], 50)
@@ -0,0 +1,89 @@
+# test_hedging.py
+
+import asyncio
+import pytest
+
+from app.database.hedging import HedgedReads, LatencyTracker
+
+
+def make_hedger(delay=0.02, max_rate=1.0):
+    """Hedger whose trackers already settled on `delay`"""
+    def tracker():
+        tracker = LatencyTracker(percentile=0.95, min_samples=1, min_delay=0)
+        tracker.record(delay)
+        return tracker
+    return HedgedReads(enabled=True, max_rate=max_rate, tracker_factory=tracker)
+
+
+class Replica:
+    """Read whose copies take the given times in turn, failing where the time is an exception"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def read(self, item_id):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        await asyncio.sleep(outcome)
+        return f"{item_id}@{outcome}"
+
+
+class TestHedgedReads:
+    """Test suite for hedged point reads"""
+
+    def test_delay_follows_percentile(self):
+        """Test 1: No hedging until enough samples, then the p95 latency with a floor"""
+        tracker = LatencyTracker(percentile=0.95, min_samples=20, min_delay=0.005)
+        for latency in range(1, 20):
+            tracker.record(latency / 1000)
+        assert tracker.delay is None
+
+        for latency in range(20, 101):
+            tracker.record(latency / 1000)
+        assert tracker.delay == pytest.approx(0.096)
+
+        fast = LatencyTracker(percentile=0.95, min_samples=1, min_delay=0.005)
+        fast.record(0.001)
+        assert fast.delay == 0.005
+
+    @pytest.mark.asyncio
+    async def test_slow_read_is_hedged(self):
+        """Test 2: A read slower than the delay gets a second copy and the first answer wins"""
+        hedger = make_hedger()
+        replica = Replica(0.5, 0.001)
+        assert await hedger.run("user", replica.read, "u1") == "u1@0.001"
+        assert replica.calls == 2
+        assert hedger.metrics() == {"user": {"reads": 1, "hedged": 1, "hedge_wins": 1, "over_budget": 0}}
+
+        fast = Replica(0.001)
+        assert await hedger.run("user", fast.read, "u2") == "u2@0.001"
+        assert fast.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_rate_is_capped(self):
+        """Test 3: Slow reads beyond the hedge budget wait for their only request"""
+        hedger = make_hedger(max_rate=0.5)
+        replicas = [Replica(0.05, 0.001) for _ in range(4)]
+        for index, replica in enumerate(replicas):
+            await hedger.run("project", replica.read, f"p{index}")
+
+        stats = hedger.metrics()["project"]
+        assert stats["hedged"] == 2 and stats["over_budget"] == 2
+        assert sum(replica.calls for replica in replicas) == 6
+
+    @pytest.mark.asyncio
+    async def test_failed_copy_falls_back_to_the_other(self):
+        """Test 4: A failed copy falls back to the other, a failed read raises, disabled means one request"""
+        hedger = make_hedger()
+        assert await hedger.run("user", Replica(0.05, RuntimeError("replica down")).read, "u1") == "u1@0.05"
+
+        with pytest.raises(RuntimeError):
+            await hedger.run("user", Replica(RuntimeError("slow then down")).read, "u2")
+
+        disabled = HedgedReads(enabled=False)
+        replica = Replica(0.05, 0.001)
+        assert await disabled.run("user", replica.read, "u3") == "u3@0.05"
+        assert replica.calls == 1 and disabled.metrics() == {}
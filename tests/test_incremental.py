@@ -0,0 +1,136 @@
+# test_incremental.py
+
+import asyncio
+import json
+import strawberry
+from typing import List, Optional
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.incremental import IncrementalSchema
+from app.router import AppGraphQLRouter
+
+
+@strawberry.type
+class Owner:
+    id: str
+
+    @strawberry.field
+    async def name(self) -> str:
+        await asyncio.sleep(0.05)
+        return f"Owner {self.id}"
+
+
+@strawberry.type
+class Item:
+    id: str
+
+    @strawberry.field
+    async def owner(self) -> Optional[Owner]:
+        await asyncio.sleep(0.05)
+        if self.id == "broken":
+            raise ValueError("owner unavailable")
+        return Owner(id=f"owner-{self.id}")
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def items(self, ids: Optional[List[str]] = None) -> List[Item]:
+        return [Item(id=item_id) for item_id in (ids or ["1", "2", "3"])]
+
+
+schema = IncrementalSchema(query=Query)
+
+app = FastAPI()
+app.include_router(AppGraphQLRouter(schema), prefix="/graphql")
+client = TestClient(app)
+
+MULTIPART = {"Accept": "multipart/mixed; deferSpec=20220824, application/json"}
+
+
+def parse_parts(response) -> List[dict]:
+    assert response.headers["content-type"].startswith("multipart/mixed")
+    body = response.text
+    assert body.endswith("\r\n-----\r\n")
+    parts = body[:-len("\r\n-----\r\n")].split("\r\n---\r\n")[1:]
+    return [json.loads(part.split("\r\n\r\n", 1)[1]) for part in parts]
+
+
+def merge_incremental(parts: List[dict]) -> dict:
+    """Apply every incremental payload onto the initial data"""
+    data = parts[0]["data"]
+    for part in parts[1:]:
+        for entry in part["incremental"]:
+            *parent_path, last = entry["path"]
+            target = data
+            for key in parent_path:
+                target = target[key]
+            if "items" in entry:
+                target[last:last + len(entry["items"])] = entry["items"]
+            else:
+                target[last].update(entry["data"])
+    return data
+
+
+class TestIncrementalDelivery:
+    """Test suite for @defer and @stream"""
+
+    def test_defer_sends_fragment_later(self):
+        """Test 1: Deferred fragments are left out of the initial payload"""
+        query = "{ items { id ... @defer(label: \"owner\") { owner { id } } } }"
+        parts = parse_parts(client.post("/graphql", json={"query": query}, headers=MULTIPART))
+        assert parts[0]["data"] == {"items": [{"id": "1"}, {"id": "2"}, {"id": "3"}]}
+        assert parts[0]["hasNext"] is True
+        assert parts[-1]["hasNext"] is False
+
+        entries = [entry for part in parts[1:] for entry in part["incremental"]]
+        assert sorted(entry["path"][1] for entry in entries) == [0, 1, 2]
+        assert all(entry["label"] == "owner" for entry in entries)
+        assert merge_incremental(parts)["items"][1] == {"id": "2", "owner": {"id": "owner-2"}}
+
+    def test_stream_sends_items_in_order(self):
+        """Test 2: Items after initialCount arrive later, in list order"""
+        query = "{ items(ids: [\"1\", \"2\", \"3\", \"4\"]) @stream(initialCount: 1) { id owner { id } } }"
+        parts = parse_parts(client.post("/graphql", json={"query": query}, headers=MULTIPART))
+        assert parts[0]["data"]["items"] == [{"id": "1", "owner": {"id": "owner-1"}}]
+
+        paths = [entry["path"] for part in parts[1:] for entry in part["incremental"]]
+        assert paths == [["items", 1], ["items", 2], ["items", 3]]
+        assert [item["id"] for item in merge_incremental(parts)["items"]] == ["1", "2", "3", "4"]
+
+    def test_nested_defer_follows_parent(self):
+        """Test 3: A defer inside a deferred fragment is delivered after its parent"""
+        query = "{ items(ids: [\"1\"]) { id ... @defer { owner { id ... @defer { name } } } } }"
+        parts = parse_parts(client.post("/graphql", json={"query": query}, headers=MULTIPART))
+        entries = [entry for part in parts[1:] for entry in part["incremental"]]
+        assert [entry["path"] for entry in entries] == [["items", 0], ["items", 0, "owner"]]
+        assert merge_incremental(parts)["items"][0]["owner"] == {"id": "owner-1", "name": "Owner owner-1"}
+
+    def test_errors_reported_with_the_payload(self):
+        """Test 4: Errors in deferred fields travel with their incremental payload"""
+        query = "{ items(ids: [\"broken\"]) { id ... @defer { owner { id } } } }"
+        parts = parse_parts(client.post("/graphql", json={"query": query}, headers=MULTIPART))
+        assert "errors" not in parts[0]
+        entry = parts[1]["incremental"][0]
+        assert entry["data"] == {"owner": None}
+        assert entry["errors"][0]["message"] == "owner unavailable"
+
+    def test_plain_json_without_multipart_accept(self):
+        """Test 5: Without multipart support the directives are ignored"""
+        query = "{ items(ids: [\"1\"]) @stream { id ... @defer { owner { id } } } }"
+        response = client.post("/graphql", json={"query": query})
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {"data": {"items": [{"id": "1", "owner": {"id": "owner-1"}}]}}
+
+    def test_defer_if_false(self):
+        """Test 6: @defer(if: false) keeps the fragment in the initial payload"""
+        query = "{ items(ids: [\"1\"]) { id ... @defer(if: false) { owner { id } } } }"
+        response = client.post("/graphql", json={"query": query}, headers=MULTIPART)
+        assert response.json() == {"data": {"items": [{"id": "1", "owner": {"id": "owner-1"}}]}}
+
+    def test_schema_prints_directives(self):
+        """Test 7: The SDL includes @defer and @stream"""
+        sdl = str(schema)
+        assert "directive @defer(" in sdl
+        assert "directive @stream(" in sdl
@@ -0,0 +1,110 @@
+# test_indexing.py
+
+import copy
+
+from app.database.indexing import CONTAINERS, PROJECTS_CONTAINER, TOMBSTONES_CONTAINER, diff_policy, migrate_indexing_policies
+from app.database.ordering import EQUALITY_FILTER_FIELDS, ORDER_FIELDS, ORDER_PAIRS, build_default_order_clause
+from tests.factories import make_filter
+
+
+def as_returned(policy):
+    """A policy the way Cosmos reports it back, with its defaults filled in"""
+    policy = copy.deepcopy(policy)
+    policy["automatic"] = True
+    policy["excludedPaths"] = policy.get("excludedPaths", []) + [{"path": '/"_etag"/?'}]
+    for entry in policy["includedPaths"]:
+        entry["indexes"] = []
+    return policy
+
+
+class FakeContainer:
+    def __init__(self, properties):
+        self.properties = properties
+
+    def read(self):
+        return self.properties
+
+
+class FakeDatabase:
+    def __init__(self, properties):
+        self.containers = {container_id: FakeContainer(props) for container_id, props in properties.items()}
+        self.replaced = []
+
+    def get_container_client(self, container_id):
+        return self.containers[container_id]
+
+    def replace_container(self, container_id, partition_key, indexing_policy=None, default_ttl=None):
+        self.replaced.append(container_id)
+        self.containers[container_id].properties = {
+            "partitionKey": partition_key,
+            "indexingPolicy": as_returned(indexing_policy),
+            **({"defaultTtl": default_ttl} if default_ttl is not None else {})
+        }
+
+
+class TestIndexingPolicies:
+    """Test suite for declarative indexing policies and their migration"""
+
+    def test_defaults_filled_in_by_cosmos_are_not_drift(self):
+        """Test 1: A policy read back from Cosmos compares equal to its declaration"""
+        for spec in CONTAINERS:
+            assert diff_policy(as_returned(spec.indexing_policy), spec.indexing_policy) == []
+
+    def test_diff_lists_changes(self):
+        """Test 2: The default index-everything policy shows what the declaration changes"""
+        current = {"indexingMode": "consistent", "includedPaths": [{"path": "/*"}], "excludedPaths": []}
+        changes = diff_policy(current, TOMBSTONES_CONTAINER.indexing_policy)
+        assert changes == [
+            "+ included /updated_at/?",
+            "- included /*",
+            "+ excluded /*",
+            "+ composite (/updated_at ascending, /id ascending)",
+        ]
+
+    def test_migration_applies_only_when_asked(self):
+        """Test 3: Dry runs leave containers alone; applying keeps partition key and TTL"""
+        default_policy = {"indexingMode": "consistent", "includedPaths": [{"path": "/*"}], "excludedPaths": []}
+        database = FakeDatabase({
+            "projects": {"partitionKey": {"paths": ["/owner_id"], "kind": "Hash"}, "indexingPolicy": default_policy},
+            "project_tombstones": {
+                "partitionKey": {"paths": ["/id"], "kind": "Hash"},
+                "indexingPolicy": as_returned(TOMBSTONES_CONTAINER.indexing_policy),
+                "defaultTtl": 86400
+            },
+            "users": {"partitionKey": {"paths": ["/id"], "kind": "Hash"}, "indexingPolicy": default_policy},
+        })
+
+        plan = migrate_indexing_policies(database)
+        assert plan["projects"] and plan["users"] and plan["project_tombstones"] == []
+        assert database.replaced == []
+
+        migrate_indexing_policies(database, apply=True)
+        assert database.replaced == ["projects", "users"]
+        assert database.containers["projects"].properties["partitionKey"]["paths"] == ["/owner_id"]
+        assert not any(migrate_indexing_policies(database).values())
+
+    def test_filtered_listing_is_index_served(self):
+        """Test 4: Every equality-filtered default listing has a composite index for its ORDER BY"""
+        composites = {
+            tuple(entry["path"] for entry in index)
+            for index in PROJECTS_CONTAINER.indexing_policy["compositeIndexes"]
+            if all(entry["order"] == "ascending" for entry in index)
+        }
+        for mask in range(1 << len(EQUALITY_FILTER_FIELDS)):
+            filter = make_filter(**{
+                name: "value" for bit, name in enumerate(EQUALITY_FILTER_FIELDS) if mask >> bit & 1
+            })
+            clause = build_default_order_clause(filter)
+            paths = tuple("/" + term.split()[0][2:] for term in clause.split(", "))
+            assert all(term.endswith(" DESC") for term in clause.split(", "))
+            assert len(paths) == 1 or paths in composites
+
+        assert build_default_order_clause(None) == "c.created_at DESC"
+
+    def test_composite_index_count_is_capped(self):
+        """Test 5: Only the orders and filtered listings the API accepts get a composite index"""
+        composites = PROJECTS_CONTAINER.indexing_policy["compositeIndexes"]
+        filtered = (1 << len(EQUALITY_FILTER_FIELDS)) - 1
+        # Delta sync shares the (updated_at, id) index with orderBy UPDATED_AT
+        assert len(composites) == filtered + len(ORDER_FIELDS) + 2 * len(ORDER_PAIRS)
+        assert len(composites) <= 20
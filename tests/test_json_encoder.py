@@ -0,0 +1,82 @@
+# test_json_encoder.py
+
+import json
+import uuid
+import pytest
+from datetime import date, datetime, timezone
+from enum import Enum
+from fastapi.responses import JSONResponse
+
+from app.models.project import ProjectStatus
+from app.utils import json_encoder
+from app.utils.json_encoder import EncodedJSONResponse, OrjsonEncoder, StdlibJSONEncoder, get_response_encoder
+
+
+class Level(Enum):
+    HIGH = 3
+
+
+PAYLOAD = {
+    "data": {
+        "project": {
+            "createdAt": datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+            "updatedAt": datetime(2024, 1, 2, 3, 4, 5),
+            "dueDate": date(2024, 2, 1),
+            "status": ProjectStatus.ACTIVE,
+            "level": Level.HIGH,
+            "ownerId": uuid.UUID(int=1),
+            "name": "Café – 東京 🚀",
+            "description": None,
+            "budget": 1500.75,
+            "tags": ["web", None],
+        }
+    },
+    "errors": None,
+}
+
+
+class TestJSONEncoder:
+    """Test suite for the response encoders"""
+
+    def test_encoders_produce_identical_bytes(self):
+        """Test 1: orjson and stdlib output match for datetimes, enums, UUIDs, non-ASCII text and None"""
+        stdlib = StdlibJSONEncoder().encode(PAYLOAD)
+        assert OrjsonEncoder().encode(PAYLOAD) == stdlib
+
+        project = json.loads(stdlib)["data"]["project"]
+        assert project["createdAt"] == "2024-01-02T03:04:05.123456+00:00"
+        assert project["updatedAt"] == "2024-01-02T03:04:05"
+        assert project["dueDate"] == "2024-02-01"
+        assert project["status"] == ProjectStatus.ACTIVE.value and project["level"] == 3
+        assert project["ownerId"] == "00000000-0000-0000-0000-000000000001"
+        assert project["description"] is None
+        assert "Café – 東京 🚀".encode() in stdlib
+
+    @pytest.mark.parametrize("encoder", [StdlibJSONEncoder(), OrjsonEncoder()], ids=["json", "orjson"])
+    def test_matches_starlette_for_plain_json(self, encoder):
+        """Test 2: Plain JSON content renders exactly like Starlette's JSONResponse"""
+        content = {"data": {"name": "Café", "count": 2, "ratio": 0.5, "items": [True, None]}, "errors": None}
+        assert encoder.encode(content) == JSONResponse(content).body
+        assert encoder.decode(encoder.encode(content)) == content
+
+    @pytest.mark.parametrize("encoder", [StdlibJSONEncoder(), OrjsonEncoder()], ids=["json", "orjson"])
+    def test_unsupported_types_raise(self, encoder):
+        """Test 3: Values neither encoder knows are rejected rather than silently dropped"""
+        with pytest.raises(TypeError):
+            encoder.encode({"value": object()})
+
+    def test_response_uses_configured_encoder(self, monkeypatch):
+        """Test 4: EncodedJSONResponse renders with the configured encoder, falling back to json"""
+        response = EncodedJSONResponse(PAYLOAD)
+        assert response.body == StdlibJSONEncoder().encode(PAYLOAD)
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["content-length"] == str(len(response.body))
+
+        assert isinstance(get_response_encoder("yaml"), StdlibJSONEncoder)
+
+        class MissingEncoder:
+            def __init__(self):
+                raise ImportError("orjson")
+
+        monkeypatch.setitem(json_encoder.ENCODERS, "orjson", MissingEncoder)
+        assert isinstance(get_response_encoder("orjson"), StdlibJSONEncoder)
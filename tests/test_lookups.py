@@ -0,0 +1,66 @@
+# test_lookups.py
+
+import pytest
+
+from app.database.lookups import NegativeCache, PartitionKeyCache, check_batch_size, dedupe_ids, plan_lookups
+
+
+class TestBatchLookups:
+    """Test suite for batched lookups by id"""
+
+    def test_known_partitions_become_point_reads(self):
+        """Test 1: Ids with a cached location are point reads, the rest go to the query"""
+        cache = PartitionKeyCache()
+        cache.remember({"id": "id-1", "project_id": "WEB-1", "owner_id": "user-1"}, "owner_id", ("project_id",))
+
+        ids = dedupe_ids(["WEB-1", "id-2", "id-1", "WEB-1"])
+        point_reads, remaining = plan_lookups(ids, cache.get)
+        assert ids == ["WEB-1", "id-2", "id-1"]
+        assert point_reads == {"WEB-1": ("id-1", "user-1"), "id-1": ("id-1", "user-1")}
+        assert remaining == ["id-2"]
+
+    def test_point_reads_are_capped(self):
+        """Test 2: Past the point read limit, ids share the query even when their location is known"""
+        point_reads, remaining = plan_lookups(["a", "b", "c"], lambda item_id: (item_id, item_id), point_read_limit=2)
+        assert list(point_reads) == ["a", "b"]
+        assert remaining == ["c"]
+
+    def test_cache_is_bounded(self):
+        """Test 3: The least recently used ids are evicted and forgotten ids are dropped"""
+        cache = PartitionKeyCache(max_entries=2)
+        for item_id in ("a", "b"):
+            cache.remember({"id": item_id, "owner_id": "user-1"}, "owner_id")
+        cache.get("a")
+        cache.remember({"id": "c", "owner_id": "user-2"}, "owner_id")
+        assert cache.get("b") is None and cache.get("a") == ("a", "user-1")
+
+        cache.forget("a", None)
+        assert len(cache) == 1
+
+        with pytest.raises(ValueError):
+            check_batch_size(["x"] * 3, limit=2)
+
+    def test_negative_entries_expire(self):
+        """Test 4: Misses are remembered for the TTL, and dropped early by a create"""
+        now = [100.0]
+        cache = NegativeCache(ttl=30, clock=lambda: now[0])
+        cache.add("gone", "WEB-9")
+        assert "gone" in cache and "WEB-9" in cache and cache.hits == 2
+
+        cache.discard("WEB-9")
+        assert "WEB-9" not in cache
+
+        now[0] += 30
+        assert "gone" not in cache
+        assert len(cache) == 0
+
+    def test_miss_racing_a_create_is_not_recorded(self):
+        """Test 5: A lookup that started before a create doesn't cache its stale miss"""
+        cache = NegativeCache(ttl=30)
+        version = cache.version
+        cache.discard("WEB-1")  # created while the lookup was in flight
+        cache.add("WEB-1", version=version)
+        assert "WEB-1" not in cache
+
+        cache.add("WEB-1", version=cache.version)
+        assert "WEB-1" in cache
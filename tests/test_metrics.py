@@ -0,0 +1,125 @@
+# test_metrics.py
+
+import asyncio
+import httpx
+import pytest
+import strawberry
+from fastapi import FastAPI
+from strawberry.fastapi import GraphQLRouter
+
+from app.database.lookups import NegativeCache
+from app.extensions.metrics import MetricsExtension
+from app.extensions.response_cache import ResponseCache
+from app.middleware.metrics import MetricsMiddleware
+from app.utils.metrics import (
+    Histogram, cache_metrics, cosmos_call_duration, cosmos_request_charge, data_function, measure_cosmos_call,
+    record_request_charge, resolver_duration
+)
+
+
+class FakeHttpResponse:
+    def __init__(self, charge):
+        self.headers = {"x-ms-request-charge": charge}
+
+
+class FakePipelineResponse:
+    def __init__(self, charge):
+        self.http_response = FakeHttpResponse(charge)
+
+
+def query_two_pages(query, timeout=None):
+    """Stands in for an SDK query: one HTTP response per page, each reported to the client hook"""
+    record_request_charge(FakePipelineResponse("2.5"))
+    record_request_charge(FakePipelineResponse("1"))
+    return [query]
+
+
+@data_function
+async def get_metered_things():
+    return await asyncio.to_thread(measure_cosmos_call, query_two_pages, "SELECT * FROM c", timeout=1.0)
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def name(self) -> str:
+        return "sync"
+
+    @strawberry.field
+    async def slow_name(self) -> str:
+        await asyncio.sleep(0.01)
+        return "async"
+
+
+def make_app(histogram):
+    app = FastAPI()
+    schema = strawberry.Schema(query=Query, extensions=[MetricsExtension])
+    app.include_router(GraphQLRouter(schema), prefix="/graphql")
+    app.add_middleware(MetricsMiddleware, histogram=histogram, paths=("/graphql",))
+    return app
+
+
+class TestMetrics:
+    """Test suite for the Prometheus metrics"""
+
+    def test_histogram_exposition(self):
+        """Test 1: Buckets are cumulative, labels are escaped and extra series fold into "other\""""
+        histogram = Histogram("demo_seconds", "Demo", ("field",), buckets=(0.1, 1.0), max_series=2)
+        histogram.observe(0.05, 'Query."a"')
+        histogram.observe(0.5, 'Query."a"')
+        histogram.observe(5, 'Query."a"')
+        histogram.observe(0.2, "Query.b")
+        histogram.observe(0.2, "Query.c")
+
+        lines = histogram.render()
+        assert lines[:2] == ["# HELP demo_seconds Demo", "# TYPE demo_seconds histogram"]
+        assert 'demo_seconds_bucket{field="Query.\\"a\\"",le="0.1"} 1' in lines
+        assert 'demo_seconds_bucket{field="Query.\\"a\\"",le="1"} 2' in lines
+        assert 'demo_seconds_bucket{field="Query.\\"a\\"",le="+Inf"} 3' in lines
+        assert 'demo_seconds_sum{field="Query.\\"a\\""} 5.55' in lines
+        assert histogram.snapshot("Query.c") is None
+        assert histogram.snapshot("other").count == 1
+
+    @pytest.mark.asyncio
+    async def test_cosmos_calls_by_function(self):
+        """Test 2: SDK calls are timed and charged per data-layer function, across query pages"""
+        assert await get_metered_things() == ["SELECT * FROM c"]
+
+        charge = cosmos_request_charge.snapshot("get_metered_things")
+        assert charge.count == 1 and charge.total == 3.5
+        assert cosmos_call_duration.snapshot("get_metered_things").count == 1
+
+        # Responses outside a measured call are ignored
+        record_request_charge(FakePipelineResponse("10"))
+        assert cosmos_request_charge.snapshot("get_metered_things").total == 3.5
+
+    @pytest.mark.asyncio
+    async def test_request_latency_by_operation_and_resolver(self):
+        """Test 3: HTTP latency carries the operation name, async resolvers are timed by field"""
+        histogram = Histogram("test_http_seconds", "Test", ("method", "path", "status", "operation"))
+        transport = httpx.ASGITransport(app=make_app(histogram))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/graphql", json={"query": "query Names { name slowName }"})
+            assert response.json() == {"data": {"name": "sync", "slowName": "async"}}
+            await client.get("/unknown")
+
+        assert histogram.snapshot("POST", "/graphql", "200", "Names").count == 1
+        assert histogram.snapshot("GET", "other", "404", "").count == 1
+        assert resolver_duration.snapshot("Query.slowName").total >= 0.01
+        assert resolver_duration.snapshot("Query.name") is None
+
+    def test_cache_hit_ratios(self):
+        """Test 4: Caches count hits and misses, exported with the hit ratio"""
+        cache = ResponseCache()
+        cache.set("key", {"name": "Web"}, ttl=60, tags=["Project"], version=cache.version)
+        cache.get("key")
+        cache.get("key")
+        cache.get("other")
+        missing = NegativeCache()
+        missing.add("gone")
+        assert "gone" in missing and "there" not in missing
+
+        hits, misses, ratio = cache_metrics({"response": cache, "missing": missing})
+        assert hits.samples == [(("response",), 2), (("missing",), 1)]
+        assert misses.samples == [(("response",), 1), (("missing",), 1)]
+        assert ratio.render()[2:] == ['cache_hit_ratio{cache="response"} 0.6666666666666666', 'cache_hit_ratio{cache="missing"} 0.5']
@@ -0,0 +1,112 @@
+# test_ordering.py
+
+from itertools import product
+
+import pytest
+
+from app.database.ordering import (
+    ORDER_FIELDS, ORDER_PAIRS, PRIORITY_RANKS, build_order_clause, build_seek_clause, normalize_order, order_composite_indexes,
+    order_signature, sort_key
+)
+from app.database.replica import ProjectReplica
+from app.utils.pagination import decode_sort_cursor, encode_sort_cursor
+from tests.factories import make_filter, make_items, make_order
+
+
+def expected_ids(items, entries):
+    """Reference ordering: null budgets first, priorities by rank, id breaks ties"""
+    def value(item, field):
+        raw = PRIORITY_RANKS[item["priority"]] if field == "priority_rank" else item.get(field)
+        return (raw is not None, raw if raw is not None else 0)
+
+    ordered = sorted(items, key=lambda item: item["id"], reverse=entries[-1][1] == "DESC")
+    for field, direction in reversed(entries):
+        ordered.sort(key=lambda item: value(item, field), reverse=direction == "DESC")
+    return [item["id"] for item in ordered]
+
+
+class TestProjectOrdering:
+    """Test suite for orderBy sorting and sort-key cursors"""
+
+    def test_seek_clause(self):
+        """Test 1: The seek clause walks past the cursor key in each direction"""
+        order = normalize_order(make_order(("budget", "DESC"), ("name", "ASC")))
+        assert build_order_clause(order) == "c.budget DESC, c.name ASC, c.id ASC"
+
+        clause, parameters = build_seek_clause(order, [500.0, "Apollo", "id-3"])
+        assert clause == (
+            "((c.budget < @after0 OR IS_NULL(c.budget))) OR "
+            "(c.budget = @after0 AND c.name > @after1) OR "
+            "(c.budget = @after0 AND c.name = @after1 AND c.id > @after2)"
+        )
+        assert [parameter["value"] for parameter in parameters] == [500.0, "Apollo", "id-3"]
+
+        # Nothing sorts below null, so a descending seek past it only continues among the nulls
+        clause, parameters = build_seek_clause(order, [None, "Apollo", "id-3"])
+        assert clause.startswith("(false) OR (IS_NULL(c.budget) AND c.name > @after1)")
+        assert build_seek_clause(order, None) == ("", [])
+
+    def test_replica_pages_follow_order(self):
+        """Test 2: Paging the replica by cursor key visits every match once, in order"""
+        items = make_items(90)
+        for i, item in enumerate(items):
+            item["budget"] = None if i % 5 == 0 else float(i % 7 * 1000)
+        replica = ProjectReplica(refresh_interval=0)
+        replica.load(items)
+
+        orders = [
+            [("budget", "ASC")],
+            [("budget", "DESC"), ("name", "ASC")],
+            [("priority_rank", "DESC"), ("created_at", "DESC")],
+            [("updated_at", "ASC")],
+        ]
+        for entries in orders:
+            order = normalize_order(make_order(*entries))
+            for filter in (None, make_filter(owner_id="user-1")):
+                matches = [item for item in items if filter is None or item["owner_id"] == filter.owner_id]
+                seen, after = [], None
+                while True:
+                    page, total = replica.query_ordered(filter, order, after, 7)
+                    seen += [item["id"] for item in page]
+                    if len(page) < 7:
+                        break
+                    after = sort_key(page[-1], order)
+                assert total == len(matches)
+                assert seen == expected_ids(matches, entries)
+
+    def test_composite_indexes_cover_every_order(self):
+        """Test 3: Each accepted order, in any directions, has a matching composite index"""
+        indexes = {
+            tuple((path["path"], path["order"]) for path in index)
+            for index in order_composite_indexes()
+        }
+        flip = {"ascending": "descending", "descending": "ascending"}
+
+        orders = [[field] for field in ORDER_FIELDS] + [list(pair) for pair in ORDER_PAIRS]
+        for fields in orders:
+            for directions in product(("ASC", "DESC"), repeat=len(fields)):
+                order = normalize_order(make_order(*zip(fields, directions)))
+                wanted = tuple((f"/{name}", "descending" if descending else "ascending") for name, descending in order)
+                inverted = tuple((path, flip[direction]) for path, direction in wanted)
+                assert wanted in indexes or inverted in indexes
+        assert len(indexes) == len(order_composite_indexes()) == len(ORDER_FIELDS) + 2 * len(ORDER_PAIRS)
+
+    def test_sort_cursors(self):
+        """Test 4: Cursors carry the key and are rejected under a different order"""
+        order = normalize_order(make_order(("priority_rank", "DESC")))
+        item = {"id": "id-1", "priority": "HIGH"}
+        cursor = encode_sort_cursor(order_signature(order), sort_key(item, order))
+
+        assert decode_sort_cursor(cursor, order_signature(order)) == [2, "id-1"]
+        other = normalize_order(make_order(("priority_rank", "ASC")))
+        assert decode_sort_cursor(cursor, order_signature(other)) is None
+        assert decode_sort_cursor("not a cursor", order_signature(order)) is None
+
+    def test_invalid_orders(self):
+        """Test 5: Repeated fields and orders without a composite index are rejected"""
+        with pytest.raises(ValueError):
+            normalize_order(make_order(("name", "ASC"), ("name", "DESC")))
+        with pytest.raises(ValueError):
+            normalize_order(make_order(("name", "ASC"), ("budget", "ASC")))
+        with pytest.raises(ValueError):
+            normalize_order(make_order(("name", "ASC"), ("budget", "ASC"), ("created_at", "ASC")))
@@ -0,0 +1,94 @@
+# test_owner_summary.py
+
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from strawberry.types.nodes import FragmentSpread, InlineFragment, SelectedField
+
+from app.database.change_feed import LocalChangeSource
+from app.database.owners import OwnerSummaryFanout, make_owner_summary, owner_summary_fits
+from app.models.project import ProjectRecord
+from app.models.user import User, UserRole
+
+
+def owner_field(*names, fragment=None):
+    """Selected `owner` field with the given sub-fields"""
+    selections = [SelectedField(name=name, directives={}, arguments={}, selections=[]) for name in names]
+    if fragment is not None:
+        selections.append(fragment)
+    return [SelectedField(name="owner", directives={}, arguments={}, selections=selections)]
+
+
+class FakeProjects:
+    """Projects container keyed by id, with the owner summary stored on each item"""
+
+    def __init__(self, items):
+        self.items = {item["id"]: item for item in items}
+        self.writes = []
+
+    async def read_owned(self, owner_id):
+        return [item for item in self.items.values() if item["owner_id"] == owner_id]
+
+    async def write_summary(self, item_id, owner_id, summary):
+        self.writes.append(item_id)
+        self.items[item_id]["owner_summary"] = summary
+
+
+class TestOwnerSummary:
+    """Test suite for owner summaries embedded in project documents"""
+
+    def test_summary_from_model_and_item(self):
+        """Test 1: Models and stored items give the same compact summary"""
+        now = datetime.now(timezone.utc)
+        model = User(id="u1", email="ann@example.com", full_name="Ann", role=UserRole.MANAGER, created_at=now, updated_at=now)
+        item = {"id": "u1", "email": "ann@example.com", "full_name": "Ann", "role": "manager", "is_active": True}
+
+        assert make_owner_summary(model) == make_owner_summary(item) == {
+            "full_name": "Ann", "email": "ann@example.com", "role": "manager"
+        }
+
+    def test_selection_fits_summary(self):
+        """Test 2: Only selections within the summary fields, fragments included, are served from it"""
+        assert owner_summary_fits(owner_field("fullName", "email"))
+        assert owner_summary_fits(owner_field("id", fragment=InlineFragment(
+            type_condition="User", directives={}, selections=owner_field("role")[0].selections
+        )))
+        assert not owner_summary_fits(owner_field("fullName", "isActive"))
+        assert not owner_summary_fits(owner_field("email", fragment=FragmentSpread(
+            name="Audit", type_condition="User", directives={}, selections=owner_field("createdAt")[0].selections
+        )))
+
+    def test_record_carries_summary(self):
+        """Test 3: Projects read from Cosmos keep the embedded summary"""
+        summary = {"full_name": "Ann", "email": "ann@example.com", "role": "manager"}
+        record = ProjectRecord({
+            "id": "p1", "project_id": "P-1", "name": "Apollo", "owner_id": "u1", "owner_summary": summary,
+            "created_at": "2024-01-01T00:00:00+00:00", "updated_at": "2024-01-01T00:00:00+00:00"
+        })
+        assert record.owner_summary == summary
+        assert record.to_model().owner_summary == summary
+
+    @pytest.mark.asyncio
+    async def test_fanout_rewrites_stale_copies(self):
+        """Test 4: A user change rewrites only that user's projects whose copy differs"""
+        current = {"full_name": "Ann", "email": "ann@example.com", "role": "manager"}
+        projects = FakeProjects([
+            {"id": "p1", "owner_id": "u1", "owner_summary": dict(current, email="old@example.com")},
+            {"id": "p2", "owner_id": "u1", "owner_summary": dict(current)},
+            {"id": "p3", "owner_id": "u1"},
+            {"id": "p4", "owner_id": "u2"},
+        ])
+        source = LocalChangeSource()
+        updates = []
+        fanout = OwnerSummaryFanout()
+        await fanout.start(source, projects.read_owned, projects.write_summary, lambda user_id, ids: updates.append((user_id, ids)))
+
+        source.publish({"id": "u1", **current, "is_active": True})
+        for _ in range(10):
+            await asyncio.sleep(0)
+        await fanout.stop()
+
+        assert projects.writes == ["p1", "p3"]
+        assert updates == [("u1", ["p1", "p3"])]
+        assert all(projects.items[item_id]["owner_summary"] == current for item_id in ("p1", "p2", "p3"))
+        assert "owner_summary" not in projects.items["p4"]
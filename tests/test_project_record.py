@@ -0,0 +1,67 @@
+# test_project_record.py
+
+from datetime import datetime, timezone
+
+from app.database.converters import convert_item_to_project, convert_item_to_project_record
+from app.models.project import Project, ProjectPriority, ProjectStatus
+
+
+def make_item(**overrides):
+    item = {
+        "id": "cosmos-id-1",
+        "project_id": "ECOM-2024-001",
+        "name": "E-commerce Platform",
+        "description": "Modern e-commerce solution",
+        "status": "active",
+        "priority": "HIGH",
+        "tags": ["web", "ecommerce"],
+        "owner_id": "test-user-123",
+        "budget": 50000.0,
+        "created_at": "2024-01-15T10:30:00.123456Z",
+        "updated_at": "2024-01-16T08:00:00+00:00",
+        "_etag": "\"etag\"",
+    }
+    item.update(overrides)
+    return item
+
+
+class TestProjectRecord:
+    """Test suite for the trusted-read project fast path"""
+
+    def test_record_matches_validated_model(self):
+        """Test 1: The fast path exposes the same values as the Pydantic model"""
+        record = convert_item_to_project_record(make_item())
+        model = convert_item_to_project(make_item())
+
+        for field in Project.model_fields:
+            assert getattr(record, field) == getattr(model, field)
+
+    def test_enums_and_timestamps(self):
+        """Test 2: Enum values are normalised and timestamps parsed lazily"""
+        item = make_item()
+        record = convert_item_to_project_record(item)
+
+        assert record.status is ProjectStatus.ACTIVE
+        assert record.priority is ProjectPriority.HIGH
+        assert record.created_at == datetime(2024, 1, 15, 10, 30, 0, 123456, tzinfo=timezone.utc)
+        # The stored document is not mutated
+        assert item["created_at"] == "2024-01-15T10:30:00.123456Z"
+
+    def test_defaults_for_missing_optional_fields(self):
+        """Test 3: Optional fields fall back to the model defaults"""
+        item = make_item()
+        for field in ("project_id", "description", "status", "priority", "tags", "budget"):
+            del item[field]
+
+        record = convert_item_to_project_record(item)
+
+        assert record.status is ProjectStatus.ACTIVE
+        assert record.priority is ProjectPriority.MEDIUM
+        assert record.tags == []
+        assert record.budget is None
+        assert record.to_model().name == "E-commerce Platform"
+
+    def test_record_has_no_instance_dict(self):
+        """Test 4: Records use slots"""
+        record = convert_item_to_project_record(make_item())
+        assert not hasattr(record, "__dict__")
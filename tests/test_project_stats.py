@@ -0,0 +1,80 @@
+# test_project_stats.py
+
+import math
+import pytest
+
+from app.database import stats
+from app.database.stats import build_stats_query, compute_project_stats
+from tests.factories import make_items
+
+
+def with_budgets(items):
+    for i, item in enumerate(items):
+        item["budget"] = None if i % 5 == 0 else float(1000 * (i % 17) + i)
+    return items
+
+
+def assert_same_stats(left, right):
+    assert [(group.key, group.count, group.budget_count) for group in left] == \
+        [(group.key, group.count, group.budget_count) for group in right]
+    for a, b in zip(left, right):
+        assert a.sum == pytest.approx(b.sum)
+        assert (a.mean, a.min, a.max) == pytest.approx((b.mean, b.min, b.max))
+        assert [value for _, value in a.percentiles] == pytest.approx([value for _, value in b.percentiles])
+
+
+class TestProjectStats:
+    """Test suite for project budget statistics"""
+
+    def test_ungrouped_stats(self):
+        """Test 1: Missing budgets count as projects but not as budget values"""
+        items = [{"budget": 10.0}, {"budget": 20}, {"budget": 40.0}, {"budget": None}, {}]
+        [group] = compute_project_stats(items, [], [0, 50, 75, 100], use_numpy=False)
+        assert group.key == ()
+        assert (group.count, group.budget_count, group.sum) == (5, 3, 70.0)
+        assert group.mean == pytest.approx(70 / 3)
+        assert (group.min, group.max) == (10.0, 40.0)
+        assert group.percentiles == [(0, 10.0), (50, 20.0), (75, 30.0), (100, 40.0)]
+
+    def test_group_by_tag_and_status(self):
+        """Test 2: Projects fall in one group per tag and untagged ones under None"""
+        items = [
+            {"status": "ACTIVE", "tags": ["web", "api"], "budget": 100.0},
+            {"status": "ACTIVE", "tags": ["web"], "budget": 50.0},
+            {"status": "COMPLETED", "tags": [], "budget": 10.0},
+        ]
+        groups = compute_project_stats(items, ["status", "tags"], [], use_numpy=False)
+        assert [(group.key, group.count, group.sum) for group in groups] == [
+            (("ACTIVE", "web"), 2, 150.0),
+            (("ACTIVE", "api"), 1, 100.0),
+            (("COMPLETED", None), 1, 10.0),
+        ]
+
+    @pytest.mark.skipif(stats.np is None, reason="numpy is not installed")
+    def test_numpy_matches_python(self):
+        """Test 3: The vectorized and pure Python paths agree, including numpy.percentile"""
+        items = with_budgets(make_items(300))
+        percentiles = [0, 12.5, 50, 90, 99, 100]
+        for fields in ([], ["status"], ["owner_id", "tags"]):
+            fast = compute_project_stats(items, fields, percentiles, use_numpy=True)
+            slow = compute_project_stats(items, fields, percentiles, use_numpy=False)
+            assert_same_stats(fast, slow)
+
+        values = [item["budget"] for item in items if item["budget"] is not None]
+        [group] = compute_project_stats(items, [], percentiles, use_numpy=False)
+        expected = stats.np.percentile(values, percentiles)
+        assert [value for _, value in group.percentiles] == pytest.approx(list(expected))
+
+    def test_empty_and_invalid_input(self):
+        """Test 4: No projects gives no groups, and percentiles outside 0-100 are rejected"""
+        assert compute_project_stats([], ["status"], use_numpy=False) == []
+        [group] = compute_project_stats([{"budget": None}], [], use_numpy=False)
+        assert group.mean is None and group.percentiles == [] and not math.isnan(group.sum)
+        with pytest.raises(ValueError):
+            compute_project_stats([], [], [101])
+
+    def test_projection_query(self):
+        """Test 5: Only the budget and group-by columns are read from Cosmos"""
+        assert build_stats_query(["status", "tags"], "c.owner_id = @owner_id") == (
+            "SELECT c.budget, c.status, c.tags FROM c WHERE c.owner_id = @owner_id"
+        )
@@ -0,0 +1,134 @@
+# test_query_cost.py
+
+import pytest
+import strawberry
+from typing import List, Optional
+
+from app.extensions.query_cost import QueryCostLimiter
+
+
+@strawberry.type
+class User:
+    id: str
+    full_name: str
+
+
+@strawberry.type
+class Project:
+    id: str
+    name: str
+
+    @strawberry.field
+    def owner(self) -> Optional[User]:
+        return User(id="user-1", full_name="Test User")
+
+
+@strawberry.type
+class ProjectEdge:
+    node: Project
+    cursor: str
+
+
+@strawberry.type
+class ProjectConnection:
+    edges: List[ProjectEdge]
+    total_count: int
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def projects(self, first: Optional[int] = 10) -> ProjectConnection:
+        edges = [
+            ProjectEdge(node=Project(id=str(i), name=f"Project {i}"), cursor=str(i))
+            for i in range(min(first or 0, 3))
+        ]
+        return ProjectConnection(edges=edges, total_count=len(edges))
+
+    @strawberry.field
+    def users(self) -> List[User]:
+        return [User(id="user-1", full_name="Test User")]
+
+    @strawberry.field
+    def projects_by_ids(self, ids: List[str]) -> List[Optional[Project]]:
+        return [Project(id=project_id, name=f"Project {project_id}") for project_id in ids]
+
+
+class SmallBudgetLimiter(QueryCostLimiter):
+    max_cost = 100
+    max_depth = 4
+    max_first = 50
+    enforce = True
+
+
+schema = strawberry.Schema(query=Query, extensions=[SmallBudgetLimiter])
+
+
+class TestQueryCost:
+    """Test suite for query cost analysis"""
+
+    @pytest.mark.asyncio
+    async def test_cost_reported_in_extensions(self):
+        """Test 1: Cost is computed from first and reported"""
+        result = await schema.execute("{ projects(first: 5) { edges { node { id name } } } }")
+        assert result.errors is None
+        # projects (1) + 5 * (edges (1) + node (1))
+        assert result.extensions["cost"]["requestedQueryCost"] == 11
+        assert result.extensions["cost"]["depth"] == 4
+
+    @pytest.mark.asyncio
+    async def test_owner_multiplier_rejects_expensive_query(self):
+        """Test 2: Owner expansion is weighted and rejected over budget"""
+        query = """
+            query Expensive($first: Int) {
+                projects(first: $first) { edges { node { owner { fullName } } } }
+            }
+        """
+        result = await schema.execute(query, variable_values={"first": 20})
+        assert result.data is None
+        cost_errors = [error for error in result.errors if error.extensions["code"] == "MAX_COST_EXCEEDED"]
+        assert len(cost_errors) == 1
+        # projects (1) + 20 * (edges (1) + node (1) + owner (5))
+        assert cost_errors[0].extensions["cost"]["requestedQueryCost"] == 141
+
+    @pytest.mark.asyncio
+    async def test_max_first_enforced(self):
+        """Test 3: Page sizes above the limit are rejected"""
+        result = await schema.execute("{ projects(first: 100000) { totalCount } }")
+        assert result.data is None
+        codes = [error.extensions["code"] for error in result.errors]
+        assert "PAGE_SIZE_EXCEEDED" in codes
+
+    @pytest.mark.asyncio
+    async def test_max_depth_enforced(self):
+        """Test 4: Depth is counted through fragments"""
+        query = """
+            fragment ProjectFields on Project { owner { id } }
+            query { projects(first: 1) { edges { node { ...ProjectFields } } } }
+        """
+        result = await schema.execute(query)
+        codes = [error.extensions["code"] for error in result.errors]
+        assert codes == ["MAX_DEPTH_EXCEEDED"]
+
+    @pytest.mark.asyncio
+    async def test_introspection_is_free(self):
+        """Test 5: Introspection fields do not count towards the budget"""
+        result = await schema.execute("{ __schema { types { name fields { name } } } }")
+        assert result.errors is None
+        assert result.extensions["cost"]["requestedQueryCost"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalid_document_keeps_validation_errors(self):
+        """Test 6: Standard validation still runs"""
+        result = await schema.execute("{ projects { missingField } }")
+        assert result.errors
+        assert "missingField" in result.errors[0].message
+
+    @pytest.mark.asyncio
+    async def test_batch_lookup_sized_by_ids(self):
+        """Test 7: Batch lookups cost one child selection per requested id"""
+        query = "query Lookup($ids: [String!]!) { projectsByIds(ids: $ids) { owner { id } } }"
+        result = await schema.execute(query, variable_values={"ids": ["1", "2", "3"]})
+        assert result.errors is None
+        # projectsByIds (1) + 3 * owner (5)
+        assert result.extensions["cost"]["requestedQueryCost"] == 16
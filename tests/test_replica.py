@@ -0,0 +1,178 @@
+# test_replica.py
+
+import asyncio
+import random
+import pytest
+
+from app.database.filters import project_matches_filter
+from app.database.ordering import normalize_order
+from app.database.replica import ProjectReplica, skip_bits
+from app.models.project import ProjectPriority, ProjectStatus
+from tests.factories import STATUSES, TAGS, make_filter, make_items, make_order
+
+
+def expected_page(items, filter, skip, limit):
+    """What the Cosmos query (ORDER BY c.created_at DESC) would return"""
+    matches = sorted(
+        (item for item in items if project_matches_filter(item, filter)),
+        key=lambda item: (item["created_at"], item["id"]),
+        reverse=True
+    )
+    return [item["id"] for item in matches[skip:skip + limit]], len(matches)
+
+
+def make_replica(items):
+    replica = ProjectReplica(refresh_interval=0)
+    replica.load(items)
+    return replica
+
+
+class TestProjectReplica:
+    """Test suite for the local projects replica"""
+
+    def test_filters_match_cosmos_semantics(self):
+        """Test 1: Bitmap filters and paging agree with the SQL filter"""
+        items = make_items(200)
+        replica = make_replica(items)
+        filters = [
+            None,
+            make_filter(status=ProjectStatus.ACTIVE),
+            make_filter(status=ProjectStatus.ACTIVE, priority=ProjectPriority.HIGH),
+            make_filter(owner_id="user-1", tags=["web", "api"]),
+            make_filter(tags=["missing"]),
+            make_filter(search="PLATFORM", priority=ProjectPriority.LOW),
+        ]
+        for filter in filters:
+            for skip in (0, 5, 37, 500):
+                page, total = replica.query(filter, skip, 11)
+                assert ([item["id"] for item in page], total) == expected_page(items, filter, skip, 11)
+
+    def test_write_through(self):
+        """Test 2: Upserts and removals show up in the next query"""
+        items = make_items(20)
+        replica = make_replica(items)
+        newest = dict(items[0], id="new", created_at="2030-01-01T00:00:00+00:00")
+        replica.upsert(newest)
+        assert replica.query(None, 0, 1)[0][0]["id"] == "new"
+
+        replica.upsert(dict(newest, status="COMPLETED", updated_at="2030-01-02T00:00:00+00:00"))
+        page, total = replica.query(make_filter(status=ProjectStatus.COMPLETED), 0, 100)
+        assert "new" in [item["id"] for item in page]
+
+        replica.remove("new")
+        assert len(replica) == 20
+        assert replica.query(None, 0, 1)[0][0]["id"] != "new"
+
+    def test_stale_events_ignored(self):
+        """Test 3: Older versions and events for deleted items don't win"""
+        item = make_items(1)[0]
+        replica = make_replica([dict(item, updated_at="2024-03-01T00:00:00+00:00", name="Newer")])
+        replica.upsert(dict(item, updated_at="2024-02-01T00:00:00+00:00", name="Older"))
+        assert replica.query(None, 0, 1)[0][0]["name"] == "Newer"
+
+        replica.remove(item["id"])
+        replica.upsert(dict(item, updated_at="2024-03-01T00:00:00+00:00"))
+        assert len(replica) == 0
+
+    @pytest.mark.asyncio
+    async def test_reload_replays_concurrent_writes(self):
+        """Test 4: Writes made while a reload is in flight are not lost"""
+        items = make_items(5)
+        replica = ProjectReplica(refresh_interval=0)
+        release = asyncio.Event()
+
+        async def load_items():
+            await release.wait()
+            return items
+
+        reload = asyncio.ensure_future(replica.reload(load_items))
+        await asyncio.sleep(0)
+        replica.upsert(dict(items[0], id="written-during-reload"))
+        replica.remove(items[1]["id"])
+        release.set()
+        await reload
+
+        ids = {item["id"] for item in replica.query(None, 0, 100)[0]}
+        assert "written-during-reload" in ids
+        assert items[1]["id"] not in ids
+        assert replica.ready
+
+    def test_skip_bits(self):
+        """Test 5: Skipping the highest set bits keeps the lower ones"""
+        assert skip_bits(0b101101, 2) == 0b000101
+        assert skip_bits(0b101101, 0) == 0b101101
+        assert skip_bits(0b101101, 4) == 0
+
+    @pytest.mark.asyncio
+    async def test_follow_survives_feed_and_reload_errors(self):
+        """Test 6: Following restarts after any error, reloading first so missed writes are picked up"""
+        items = make_items(3)
+        loads = []
+
+        async def load_items():
+            loads.append(1)
+            if len(loads) == 2:
+                raise RuntimeError("cosmos unavailable")
+            return list(items)
+
+        class FlakyHub:
+            subscriptions = 0
+
+            async def subscribe(self):
+                self.subscriptions += 1
+                if self.subscriptions == 1:
+                    raise RuntimeError("feed reader crashed")
+                yield dict(items[0], id="followed")
+                await asyncio.Event().wait()
+
+        replica = ProjectReplica(refresh_interval=0, restart_delay=0)
+        await replica.start(load_items, FlakyHub())
+        try:
+            for _ in range(100):
+                if len(replica) == 4:
+                    break
+                await asyncio.sleep(0.01)
+            assert len(replica) == 4
+            assert len(loads) == 3 and replica.ready
+        finally:
+            await replica.stop()
+
+    def test_writes_update_the_index_in_place(self):
+        """Test 7: Writes keep every index equal to a fresh load, without rebuilding it"""
+        rng = random.Random(3)
+        items = {item["id"]: item for item in make_items(60)}
+        replica = make_replica(list(items.values()))
+        order = normalize_order(make_order(("priority_rank", "DESC"), ("created_at", "ASC")))
+        replica.query_ordered(None, order, None, 10)
+        replica._build_index = lambda: pytest.fail("index rebuilt")
+
+        filters = [
+            None,
+            make_filter(status=ProjectStatus.ACTIVE),
+            make_filter(owner_id="user-2", tags=["web"]),
+            make_filter(owner_id="user-1", priority=ProjectPriority.LOW, tags=["api"]),
+        ]
+        for step in range(120):
+            action = rng.random()
+            if action < 0.5:
+                item = dict(rng.choice(list(items.values())), status=rng.choice(STATUSES), tags=rng.sample(TAGS, 2))
+            elif action < 0.85:
+                # Mostly newest, sometimes older than existing projects
+                day = 28 if action < 0.7 else rng.randint(1, 27)
+                item = dict(rng.choice(list(items.values())), id=f"new-{step}", name=f"New {step}",
+                            created_at=f"2024-01-{day:02d}T11:00:{step % 60:02d}+00:00")
+            else:
+                removed = items.pop(rng.choice(list(items)))
+                replica.remove(removed["id"])
+                continue
+            item["updated_at"] = f"2024-03-01T10:{step // 60:02d}:{step % 60:02d}+00:00"
+            items[item["id"]] = item
+            replica.upsert(item)
+
+            if step % 10 == 9:
+                fresh = make_replica(list(items.values()))
+                for filter in filters:
+                    for skip in (0, 7):
+                        assert replica.query(filter, skip, 9) == fresh.query(filter, skip, 9)
+                    assert replica.query_ordered(filter, order, None, 9) == fresh.query_ordered(filter, order, None, 9)
+                    assert replica.facet_counts(filter, ["status", "tags"]) == fresh.facet_counts(filter, ["status", "tags"])
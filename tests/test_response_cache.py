@@ -0,0 +1,158 @@
+# test_response_cache.py
+
+import pytest
+import strawberry
+from typing import List, Optional
+
+from app.extensions.response_cache import (
+    ResponseCache,
+    ResponseCacheExtension,
+    project_tags,
+)
+
+calls = {"projects": 0, "project": 0}
+
+
+@strawberry.type
+class Project:
+    id: str
+    project_id: str
+    name: str
+
+
+PROJECTS = {
+    "1": Project(id="1", project_id="WEB-1", name="Web"),
+    "2": Project(id="2", project_id="APP-2", name="App"),
+}
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def projects(self, first: Optional[int] = 10) -> List[Project]:
+        calls["projects"] += 1
+        return list(PROJECTS.values())[:first]
+
+    @strawberry.field
+    def project(self, id: str) -> Optional[Project]:
+        calls["project"] += 1
+        return PROJECTS.get(id)
+
+    @strawberry.field
+    def uncached(self) -> str:
+        return "not hinted"
+
+
+@strawberry.type
+class Mutation:
+    @strawberry.mutation
+    def rename(self, id: str, name: str) -> Project:
+        PROJECTS[id].name = name
+        return PROJECTS[id]
+
+
+test_cache = ResponseCache(max_entries=10)
+
+
+class ScopedResponseCacheExtension(ResponseCacheExtension):
+    cache = test_cache
+    enabled = True
+
+    async def get_auth_scope(self, private: bool) -> Optional[str]:
+        return self.execution_context.context.get("scope")
+
+
+schema = strawberry.Schema(query=Query, mutation=Mutation, extensions=[ScopedResponseCacheExtension])
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    test_cache.clear()
+    calls.update(projects=0, project=0)
+    yield
+
+
+class TestResponseCache:
+    """Test suite for the response cache"""
+
+    @pytest.mark.asyncio
+    async def test_identical_queries_hit_cache(self):
+        """Test 1: Second identical poll is served from the cache"""
+        query = "query Poll($first: Int) { projects(first: $first) { id name } }"
+        context = {"scope": "tenant-a"}
+
+        first = await schema.execute(query, variable_values={"first": 2}, context_value=context)
+        second = await schema.execute(query, variable_values={"first": 2}, context_value=context)
+
+        assert first.data == second.data
+        assert calls["projects"] == 1
+        assert first.extensions["responseCache"]["hit"] is False
+        assert second.extensions["responseCache"]["hit"] is True
+
+    @pytest.mark.asyncio
+    async def test_key_includes_variables_and_scope(self):
+        """Test 2: Different variables or scopes do not share entries"""
+        query = "query Poll($first: Int) { projects(first: $first) { id } }"
+
+        await schema.execute(query, variable_values={"first": 1}, context_value={"scope": "a"})
+        await schema.execute(query, variable_values={"first": 2}, context_value={"scope": "a"})
+        await schema.execute(query, variable_values={"first": 1}, context_value={"scope": "b"})
+
+        assert calls["projects"] == 3
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates_tagged_entries(self):
+        """Test 3: Invalidating a project's tags drops lists and lookups that touched it"""
+        context = {"scope": "a"}
+        await schema.execute('{ project(id: "1") { name } }', context_value=context)
+        await schema.execute('{ project(id: "2") { name } }', context_value=context)
+        assert len(test_cache) == 2
+
+        test_cache.invalidate({"Project:WEB-1"})
+
+        assert len(test_cache) == 1
+        await schema.execute('{ project(id: "1") { name } }', context_value=context)
+        await schema.execute('{ project(id: "2") { name } }', context_value=context)
+        assert calls["project"] == 3
+
+    @pytest.mark.asyncio
+    async def test_collection_tag_drops_lists(self):
+        """Test 4: A created project invalidates cached lists and cached misses"""
+        context = {"scope": "a"}
+        await schema.execute("{ projects { id } }", context_value=context)
+        await schema.execute('{ project(id: "NEW-1") { id } }', context_value=context)
+
+        removed = test_cache.invalidate(project_tags("3", "NEW-1"))
+
+        assert removed == 2
+        assert len(test_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_unhinted_and_mutations_are_not_cached(self):
+        """Test 5: Fields without hints and mutations bypass the cache"""
+        context = {"scope": "a"}
+        result = await schema.execute("{ uncached }", context_value=context)
+        mutation = await schema.execute(
+            'mutation { rename(id: "2", name: "Renamed") { name } }', context_value=context
+        )
+
+        assert "responseCache" not in (result.extensions or {})
+        assert mutation.data["rename"]["name"] == "Renamed"
+        assert len(test_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_requests_skip_cache(self):
+        """Test 6: Requests without an auth scope always execute"""
+        await schema.execute("{ projects { id } }", context_value={})
+        await schema.execute("{ projects { id } }", context_value={})
+
+        assert calls["projects"] == 2
+        assert len(test_cache) == 0
+
+    def test_stale_write_is_not_stored(self):
+        """Test 7: Results computed before an invalidation are discarded"""
+        version = test_cache.version
+        test_cache.invalidate({"Project:*"})
+
+        assert test_cache.set("key", {"projects": []}, 30, {"Project:*"}, version) is False
+        assert len(test_cache) == 0
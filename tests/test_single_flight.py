@@ -0,0 +1,159 @@
+# test_single_flight.py
+
+import asyncio
+import pytest
+import strawberry
+from typing import List, Optional
+
+from app.extensions.response_cache import ResponseCache, ResponseCacheExtension
+from app.extensions.single_flight import SingleFlightExtension
+from app.utils.single_flight import SingleFlight
+
+calls = {"projects": 0}
+
+
+@strawberry.type
+class Project:
+    id: str
+    name: str
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def project(self, id: str) -> Optional[Project]:
+        await asyncio.sleep(0.05)
+        return Project(id=id, name=f"project-{id}")
+
+    @strawberry.field
+    async def projects(self, first: Optional[int] = 10) -> List[str]:
+        calls["projects"] += 1
+        await asyncio.sleep(0.05)
+        return [f"project-{i}" for i in range(first)]
+
+
+test_flights = SingleFlight()
+
+
+class ScopedSingleFlightExtension(SingleFlightExtension):
+    flights = test_flights
+    enabled = True
+
+    async def get_auth_scope(self, private: bool) -> Optional[str]:
+        return self.execution_context.context.get("scope")
+
+
+schema = strawberry.Schema(query=Query, extensions=[ScopedSingleFlightExtension])
+
+test_cache = ResponseCache()
+
+
+class ScopedResponseCacheExtension(ResponseCacheExtension):
+    cache = test_cache
+    enabled = True
+
+    async def get_auth_scope(self, private: bool) -> Optional[str]:
+        return self.execution_context.context.get("scope")
+
+
+cached_schema = strawberry.Schema(query=Query, extensions=[ScopedResponseCacheExtension, ScopedSingleFlightExtension])
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.update(projects=0)
+    yield
+
+
+class TestSingleFlight:
+    """Test suite for single-flight coalescing"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test 1: Concurrent calls with the same key run once"""
+        group = SingleFlight()
+        executions = 0
+
+        async def fetch():
+            nonlocal executions
+            executions += 1
+            await asyncio.sleep(0.01)
+            return {"id": "project-1"}
+
+        results = await asyncio.gather(*[group.do("project-1", fetch) for _ in range(20)])
+
+        assert executions == 1
+        assert all(result is results[0] for result in results)
+        assert group.coalesced == 19
+        assert group.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared_and_not_cached(self):
+        """Test 2: A failing leader fails its waiters, the next call retries"""
+        group = SingleFlight()
+        attempts = 0
+
+        async def fetch():
+            nonlocal attempts
+            attempts += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("cosmos unavailable")
+
+        results = await asyncio.gather(*[group.do("key", fetch) for _ in range(3)], return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert attempts == 1
+
+        with pytest.raises(RuntimeError):
+            await group.do("key", fetch)
+        assert attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_waiters(self):
+        """Test 3: Waiters take over when the leader is cancelled"""
+        group = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.create_task(group.do("key", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(group.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == "done"
+
+    @pytest.mark.asyncio
+    async def test_identical_operations_are_coalesced(self):
+        """Test 4: Identical concurrent queries share one execution"""
+        query = "query Poll($first: Int) { projects(first: $first) }"
+        results = await asyncio.gather(*[
+            schema.execute(query, variable_values={"first": 3}, context_value={"scope": "a"})
+            for _ in range(10)
+        ])
+
+        assert calls["projects"] == 1
+        assert all(result.data == {"projects": ["project-0", "project-1", "project-2"]} for result in results)
+
+    @pytest.mark.asyncio
+    async def test_different_scopes_or_variables_execute_separately(self):
+        """Test 5: The key includes variables and auth scope"""
+        query = "query Poll($first: Int) { projects(first: $first) }"
+        await asyncio.gather(
+            schema.execute(query, variable_values={"first": 1}, context_value={"scope": "a"}),
+            schema.execute(query, variable_values={"first": 2}, context_value={"scope": "a"}),
+            schema.execute(query, variable_values={"first": 1}, context_value={"scope": "b"}),
+        )
+
+        assert calls["projects"] == 3
+
+    @pytest.mark.asyncio
+    async def test_coalesced_results_keep_the_leaders_cache_tags(self):
+        """Test 6: Waiters don't overwrite the leader's cache entry, so writes still invalidate it"""
+        query = '{ project(id: "1") { id name } }'
+        await asyncio.gather(*[cached_schema.execute(query, context_value={"scope": "a"}) for _ in range(5)])
+
+        assert len(test_cache) == 1
+        assert test_cache.invalidate({"Project:1"}) == 1
+        assert len(test_cache) == 0
@@ -0,0 +1,132 @@
+# test_snapshot.py
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("numpy")
+
+from app.database.filters import project_matches_filter
+from app.database.snapshot import ProjectSnapshot, keep_latest, table_stats, to_record_batch
+from app.database.stats import compute_project_stats
+from app.models.project import ProjectPriority, ProjectStatus
+from tests.factories import make_filter, make_items
+
+
+class FakeContainers:
+    """Projects and tombstones served in (updated_at, id) pages like build_changes_query"""
+
+    def __init__(self, items):
+        self.projects = {item["id"]: dict(item) for item in items}
+        self.tombstones = {}
+        self.reads = 0
+
+    def update(self, item_id, timestamp, **changes):
+        self.projects[item_id] = dict(self.projects[item_id], updated_at=timestamp, **changes)
+
+    def delete(self, item_id, timestamp):
+        del self.projects[item_id]
+        self.tombstones[item_id] = {"id": item_id, "updated_at": timestamp}
+
+    async def read_page(self, after, limit, deleted=False):
+        self.reads += 1
+        source = self.tombstones if deleted else self.projects
+        items = sorted(source.values(), key=lambda item: (item["updated_at"], item["id"]))
+        if after:
+            items = [item for item in items if (item["updated_at"], item["id"]) > tuple(after)]
+        return items[:limit]
+
+
+def with_budgets(items):
+    for i, item in enumerate(items):
+        item["budget"] = None if i % 6 == 0 else (i * 250 if i % 2 else i * 99.5)
+    return items
+
+
+def summary(stats):
+    return [
+        (group.key, group.count, group.budget_count, round(group.sum, 6), group.min, group.max,
+         [round(value, 6) for _, value in group.percentiles])
+        for group in stats
+    ]
+
+
+class TestProjectSnapshot:
+    """Test suite for the columnar projects snapshot"""
+
+    def test_filters_match_cosmos_semantics(self, tmp_path):
+        """Test 1: Arrow filters select the same projects as the SQL filter"""
+        items = make_items(120)
+        snapshot = ProjectSnapshot(path=str(tmp_path / "projects.arrow"))
+        snapshot.table = pa.Table.from_batches([to_record_batch(items)])
+
+        filters = [
+            None,
+            make_filter(status=ProjectStatus.ACTIVE, priority=ProjectPriority.HIGH),
+            make_filter(owner_id="user-2", tags=["web", "api"]),
+            make_filter(search="PLATFORM"),
+            make_filter(tags=["missing"]),
+        ]
+        for filter in filters:
+            expected = {item["id"] for item in items if project_matches_filter(item, filter)}
+            assert set(snapshot.matching(filter)["id"].to_pylist()) == expected
+
+    def test_vectorized_stats_match_python(self):
+        """Test 2: Stats over the table agree with stats over the raw items"""
+        items = with_budgets(make_items(150))
+        items[3]["tags"] = ["web", "web"]
+        table = pa.Table.from_batches([to_record_batch(items)])
+        for fields in ([], ["status"], ["tags"], ["priority", "tags"], ["tags", "owner_id"]):
+            expected = compute_project_stats(items, fields, [25, 50, 99], use_numpy=False)
+            assert summary(table_stats(table, fields, [25, 50, 99])) == summary(expected)
+
+    @pytest.mark.asyncio
+    async def test_incremental_refresh(self, tmp_path):
+        """Test 3: Updates, deletes and repeated updates are applied from the watermarks"""
+        path = str(tmp_path / "snapshots" / "projects.arrow")
+        containers = FakeContainers(with_budgets(make_items(25)))
+        snapshot = ProjectSnapshot(path=path, page_size=4)
+        await snapshot.refresh(containers.read_page)
+        assert snapshot.table.num_rows == 25
+
+        containers.update("id-1", "2024-03-01T00:00:00+00:00", name="Renamed")
+        containers.update("id-2", "2024-03-01T00:00:01+00:00")
+        containers.update("id-1", "2024-03-01T00:00:02+00:00", budget=5)
+        containers.delete("id-3", "2099-01-01T00:00:00+00:00")
+        await snapshot.refresh(containers.read_page)
+
+        rows = {row["id"]: row for row in snapshot.table.to_pylist()}
+        assert len(rows) == 24 and "id-3" not in rows
+        assert rows["id-1"]["name"] == "Renamed" and rows["id-1"]["budget"] == 5.0
+
+        # A new process picks up the file and its watermarks
+        reopened = ProjectSnapshot(path=path, page_size=4)
+        assert reopened.open()
+        assert reopened.table.to_pylist() == snapshot.table.to_pylist()
+        assert reopened.state == snapshot.state
+
+        reads = containers.reads
+        await reopened.refresh(containers.read_page)
+        assert containers.reads - reads == 2  # one empty page each for projects and tombstones
+
+    def test_unusable_files_are_ignored(self, tmp_path):
+        """Test 4: Missing or corrupt files leave the snapshot empty so it gets rebuilt"""
+        path = tmp_path / "projects.arrow"
+        snapshot = ProjectSnapshot(path=str(path))
+        assert not snapshot.open()
+        path.write_bytes(b"not an arrow file")
+        assert not snapshot.open()
+        assert not snapshot.ready
+
+    def test_keep_latest_of_repeated_ids(self):
+        """Test 5: Only the last row of each id is kept, in table order"""
+        a, b = make_items(2)
+
+        def versions(*rows):
+            table = pa.Table.from_batches([to_record_batch([dict(item, name=name) for item, name in rows])])
+            return [(row["id"], row["name"]) for row in keep_latest(table).to_pylist()]
+
+        assert versions((a, "a-old"), (b, "b-old"), (a, "a-new"), (b, "b-new")) == [
+            ("id-0", "a-new"), ("id-1", "b-new")
+        ]
+        assert versions((a, "a-old"), (a, "a-new"), (b, "b")) == [("id-0", "a-new"), ("id-1", "b")]
+        assert versions((a, "a"), (b, "b")) == [("id-0", "a"), ("id-1", "b")]
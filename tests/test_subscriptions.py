@@ -0,0 +1,184 @@
+# test_subscriptions.py
+
+import asyncio
+import os
+import pytest
+import strawberry
+from types import SimpleNamespace
+from typing import AsyncGenerator
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from strawberry.fastapi import GraphQLRouter
+
+for name in ("AZURE_CLIENT_ID", "AZURE_TENANT_ID", "AZURE_AUDIENCE"):
+    os.environ.setdefault(name, "test")
+
+from app.auth import azure_ad
+from app.auth.permissions import IsAuthenticated
+from app.database.change_feed import ChangeFeedHub, LocalChangeSource, SlowConsumerError
+from app.database.filters import project_matches_filter
+from app.models.project import ProjectPriority, ProjectStatus
+
+
+def make_item(**overrides):
+    item = {
+        "id": "project-1",
+        "name": "E-commerce Platform",
+        "description": "Modern e-commerce solution",
+        "status": "ACTIVE",
+        "priority": "HIGH",
+        "tags": ["web", "ecommerce"],
+        "owner_id": "test-user-123",
+    }
+    item.update(overrides)
+    return item
+
+
+def make_filter(**values):
+    fields = dict(status=None, priority=None, owner_id=None, tags=None, search=None)
+    fields.update(values)
+    return SimpleNamespace(**fields)
+
+
+@strawberry.type
+class Query:
+    ping: str = "pong"
+
+
+@strawberry.type
+class Subscription:
+    @strawberry.subscription(permission_classes=[IsAuthenticated])
+    async def ticks(self) -> AsyncGenerator[int, None]:
+        yield 1
+
+
+ws_app = FastAPI()
+ws_app.include_router(GraphQLRouter(strawberry.Schema(query=Query, subscription=Subscription)), prefix="/graphql")
+
+
+async def verify_token(token):
+    if token != "good-token":
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return {"oid": "user-1", "appid": "spa"}
+
+
+def subscribe(payload):
+    """First message answering a `ticks` subscription opened with the given connection_init payload"""
+    with TestClient(ws_app).websocket_connect("/graphql", subprotocols=["graphql-transport-ws"]) as websocket:
+        websocket.send_json({"type": "connection_init", "payload": payload})
+        assert websocket.receive_json()["type"] == "connection_ack"
+        websocket.send_json({"type": "subscribe", "id": "1", "payload": {"query": "subscription { ticks }"}})
+        return websocket.receive_json()
+
+
+async def take(subscription, count: int):
+    return [await asyncio.wait_for(subscription.__anext__(), 1) for _ in range(count)]
+
+
+class TestProjectFilterPredicate:
+    """Test suite for the in-memory project filter"""
+
+    def test_matches_like_build_filter_query(self):
+        """Test 1: Each filter field behaves like its SQL clause"""
+        item = make_item()
+        assert project_matches_filter(item, None)
+        assert project_matches_filter(item, make_filter(status=ProjectStatus.ACTIVE, priority=ProjectPriority.HIGH))
+        assert not project_matches_filter(item, make_filter(status=ProjectStatus.COMPLETED))
+        assert project_matches_filter(item, make_filter(tags=["mobile", "web"]))
+        assert not project_matches_filter(item, make_filter(tags=["mobile"]))
+        assert project_matches_filter(item, make_filter(search="COMMERCE"))
+        assert not project_matches_filter(item, make_filter(owner_id="someone-else"))
+        assert not project_matches_filter(make_item(description=None, name="Intranet"), make_filter(search="shop"))
+
+
+class TestChangeFeedHub:
+    """Test suite for change feed fan-out"""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_with_filters(self):
+        """Test 2: One reader delivers each change to every matching subscriber"""
+        source = LocalChangeSource()
+        hub = ChangeFeedHub(source)
+        everything = hub.subscribe()
+        completed_only = hub.subscribe(lambda item: project_matches_filter(item, make_filter(status=ProjectStatus.COMPLETED)))
+
+        first = asyncio.ensure_future(take(everything, 2))
+        second = asyncio.ensure_future(take(completed_only, 1))
+        await asyncio.sleep(0)
+
+        source.publish(make_item(id="a"))
+        source.publish(make_item(id="b", status="COMPLETED"))
+
+        assert [item["id"] for item in await first] == ["a", "b"]
+        assert [item["id"] for item in await second] == ["b"]
+        await everything.aclose()
+        await completed_only.aclose()
+        assert hub.subscriber_count == 0
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_single_reader(self):
+        """Test 3: Subscribers share the same reader task"""
+        hub = ChangeFeedHub(LocalChangeSource())
+        first, second = hub.subscribe(), hub.subscribe()
+        tasks = [asyncio.ensure_future(first.__anext__()), asyncio.ensure_future(second.__anext__())]
+        await asyncio.sleep(0)
+        reader = hub._reader
+        assert reader is not None and hub.subscriber_count == 2
+
+        hub.source.publish(make_item())
+        await asyncio.gather(*tasks)
+        assert hub._reader is reader
+        await first.aclose()
+        await second.aclose()
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_dropped(self):
+        """Test 4: A subscriber with a full queue is dropped, others keep receiving"""
+        hub = ChangeFeedHub(LocalChangeSource(), queue_size=2)
+        slow, fast = hub.subscribe(), hub.subscribe()
+        fast_items = asyncio.ensure_future(take(fast, 2))
+        slow_start = asyncio.ensure_future(slow.asend(None))
+        await asyncio.sleep(0)
+
+        hub.source.publish(make_item(id="0"))
+        hub.source.publish(make_item(id="1"))
+        assert len(await fast_items) == 2
+        assert (await slow_start)["id"] == "0"
+
+        # The slow subscriber still holds "1", "2" fills its queue and "3" overflows it
+        for i in range(2, 4):
+            hub.source.publish(make_item(id=str(i)))
+        assert [item["id"] for item in await take(fast, 2)] == ["2", "3"]
+
+        with pytest.raises(SlowConsumerError):
+            await slow.__anext__()
+        assert hub.dropped_subscribers == 1
+        assert hub.subscriber_count == 1
+        await fast.aclose()
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_requires_source(self):
+        """Test 5: Subscribing without a configured source fails clearly"""
+        with pytest.raises(RuntimeError):
+            await ChangeFeedHub().subscribe().__anext__()
+
+
+class TestSubscriptionAuth:
+    """Test suite for authenticating subscriptions over websockets"""
+
+    def test_token_from_connection_init(self, monkeypatch):
+        """Test 1: Browser clients authenticate with the token in the connection_init payload"""
+        monkeypatch.setattr(azure_ad.azure_auth, "verify_token", verify_token)
+        message = subscribe({"Authorization": "Bearer good-token"})
+        assert message["type"] == "next" and message["payload"] == {"data": {"ticks": 1}}
+
+    def test_missing_or_invalid_token_is_rejected(self, monkeypatch):
+        """Test 2: Without a valid token the subscription is answered with an error"""
+        monkeypatch.setattr(azure_ad.azure_auth, "verify_token", verify_token)
+        for payload in ({}, {"authorization": "Bearer wrong-token"}):
+            message = subscribe(payload)
+            assert message["type"] == "error"
+            assert message["payload"][0]["message"] == "User is not authenticated"
@@ -0,0 +1,123 @@
+# test_throttling.py
+
+import asyncio
+import pytest
+from azure.cosmos.cosmos_client import _build_connection_policy
+from azure.cosmos.exceptions import CosmosHttpResponseError
+
+from app.database.throttling import (
+    READ, WRITE, AdaptiveLimiter, CosmosThrottle, retry_after_seconds, retry_delay, sdk_connection_policy
+)
+
+
+def throttled(retry_after_ms=None):
+    """A 429 the way the SDK raises it"""
+    error = CosmosHttpResponseError(status_code=429, message="Request rate is large")
+    error.headers = {"x-ms-retry-after-ms": str(retry_after_ms)} if retry_after_ms is not None else {}
+    return error
+
+
+class FlakyCall:
+    """Blocking call that is throttled a number of times before it succeeds"""
+
+    def __init__(self, failures, retry_after_ms=10):
+        self.failures = failures
+        self.retry_after_ms = retry_after_ms
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise throttled(self.retry_after_ms)
+        return "ok"
+
+
+class TestThrottling:
+    """Test suite for 429 handling and the adaptive concurrency limits"""
+
+    def test_delay_honors_retry_after(self):
+        """Test 1: The wait is the server's retry-after plus capped jitter"""
+        assert retry_after_seconds(throttled(250)) == 0.25
+        assert retry_after_seconds(throttled()) == 0.0
+        assert retry_delay(0, 0.25, base_delay=0.1, max_delay=1.0, rng=lambda: 0.0) == 0.25
+        assert retry_delay(2, 0.25, base_delay=0.1, max_delay=1.0, rng=lambda: 1.0) == pytest.approx(0.65)
+        assert retry_delay(10, 0.0, base_delay=0.1, max_delay=1.0, rng=lambda: 1.0) == 1.0
+
+    def test_limiter_shrinks_and_recovers(self):
+        """Test 2: Throttling halves the limit once per burst; successes grow it back"""
+        now = [0.0]
+        limiter = AdaptiveLimiter("read", 16, clock=lambda: now[0])
+
+        limiter.on_throttle()
+        limiter.on_throttle()
+        assert limiter.capacity == 8
+        now[0] = 5.0
+        limiter.on_throttle()
+        assert limiter.capacity == 4
+
+        for _ in range(20):
+            limiter.on_success()
+        assert 4 < limiter.capacity < 16
+        for _ in range(200):
+            limiter.on_success()
+        assert limiter.capacity == 16
+
+    @pytest.mark.asyncio
+    async def test_throttled_call_is_retried(self):
+        """Test 3: 429s are retried within the deadline, other errors and late retries are raised"""
+        throttle = CosmosThrottle(read_limit=4, write_limit=2, deadline=1.0)
+        call = FlakyCall(failures=2)
+        assert await throttle.call(READ, call) == "ok"
+        assert call.calls == 3 and throttle.throttled == 2
+        assert throttle.limiters[READ].capacity < 4
+        assert throttle.limiters[WRITE].capacity == 2
+
+        with pytest.raises(CosmosHttpResponseError) as error:
+            await throttle.call(WRITE, FlakyCall(failures=5, retry_after_ms=5000))
+        assert error.value.status_code == 429
+        assert throttle.rejected == 1
+
+        def missing():
+            raise CosmosHttpResponseError(status_code=404, message="Not found")
+
+        with pytest.raises(CosmosHttpResponseError):
+            await throttle.call(READ, missing)
+        assert throttle.throttled == 3
+
+    @pytest.mark.asyncio
+    async def test_writes_do_not_hold_read_slots(self):
+        """Test 4: A saturated write budget queues writes while reads still run"""
+        throttle = CosmosThrottle(read_limit=2, write_limit=1, deadline=0.2)
+        release = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def slow_write():
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+            return "written"
+
+        first = asyncio.ensure_future(throttle.call(WRITE, slow_write))
+        await asyncio.sleep(0.05)
+        assert throttle.limiters[WRITE].in_flight == 1
+
+        assert await throttle.call(READ, lambda: "read") == "read"
+        with pytest.raises(CosmosHttpResponseError) as error:
+            await throttle.call(WRITE, lambda: "written")
+        assert error.value.status_code == 429
+        assert throttle.limiters[WRITE].queued == 0
+
+        release.set()
+        assert await first == "written"
+        assert throttle.limiters[WRITE].in_flight == 0
+
+    def test_sdk_policy_only_shortens_throttling_retries(self):
+        """Test 5: The client's 429 retries are capped while connection and read retries keep the defaults"""
+        policy = _build_connection_policy({"connection_policy": sdk_connection_policy(), "connection_verify": False})
+        default = _build_connection_policy({})
+
+        assert policy.RetryOptions.MaxRetryAttemptCount == 1
+        assert policy.RetryOptions.MaxWaitTimeInSeconds == 1
+        transport, expected = policy.ConnectionRetryConfiguration, default.ConnectionRetryConfiguration
+        assert (transport.total_retries, transport.connect_retries, transport.read_retries, transport.backoff_max) == (
+            expected.total_retries, expected.connect_retries, expected.read_retries, expected.backoff_max
+        )
+        assert policy.DisableSSLVerification